@@ -0,0 +1,88 @@
+"""
+Storing scraped jobs: the ingest path shared by the API views and scripts.
+"""
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Tuple
+
+from companies.models import Company
+from jobs.models import Job, JobCategory
+from scraper.details import DETAIL_SOURCE
+
+
+def posted_at(job_data: Dict) -> datetime:
+    """The job's publish time when the portal gave an exact one (ISO 8601), else now."""
+    try:
+        posted = datetime.fromisoformat(job_data.get('posted_at') or '')
+    except (TypeError, ValueError):
+        return datetime.now(timezone.utc)
+    return posted if posted.tzinfo else posted.replace(tzinfo=timezone.utc)
+
+
+def store_job(portal_name: str, job_data: Dict) -> Tuple[Job, bool]:
+    """
+    Create or update a job and its company from a scraped job dict.
+    
+    Args:
+        portal_name: Portal key the job was scraped from
+        job_data: Job as yielded by JobScraperService.stream_portals()
+        
+    Returns:
+        Tuple of (job, created)
+    """
+    # Get or create company
+    company, _ = Company.objects.get_or_create(
+        company_id=job_data.get('company_name', 'Unknown'),
+        defaults={
+            'name': job_data.get('company_name', 'Unknown'),
+            'industry': 'Technology',
+        }
+    )
+    
+    # Keep a full description fetched from the detail page by an earlier run over the listing snippet
+    if job_data.get('description_source') != DETAIL_SOURCE:
+        stored = (
+            Job.objects.filter(job_id=job_data.get('job_id'), metadata__description_source=DETAIL_SOURCE)
+            .values_list('description', flat=True).first()
+        )
+        if stored is not None:
+            job_data = dict(job_data, description=stored, description_source=DETAIL_SOURCE)
+    
+    # Create or update job
+    job, created = Job.objects.update_or_create(
+        job_id=job_data.get('job_id'),
+        defaults={
+            'title': job_data.get('title', ''),
+            'description': job_data.get('description', ''),
+            'job_url': job_data.get('url', ''),
+            'source_portal': portal_name,
+            'company': company,
+            'job_posted_at': posted_at(job_data),
+            'is_ai_ml_job': job_data.get('is_ai_ml', True),
+            'ai_ml_score': job_data.get('ai_ml_score', 0),
+            'metadata': job_data,
+        }
+    )
+    if 'categories' in job_data:
+        set_categories(job, job_data['categories'], created)
+    return job, created
+
+
+def set_categories(job: Job, categories: Iterable[str], created: bool = False):
+    """
+    Replace a job's taxonomy category rows with the given categories.
+    
+    Args:
+        job: Stored job
+        categories: Category names, e.g. from JobScraperService.classify_jobs()
+        created: The job is new, so it has no rows to compare with yet
+    """
+    categories = set(categories)
+    if not created:
+        stored = set(JobCategory.objects.filter(job=job).values_list('category', flat=True))
+        if stored == categories:
+            return
+        JobCategory.objects.filter(job=job).exclude(category__in=categories).delete()
+        categories -= stored
+    JobCategory.objects.bulk_create(
+        [JobCategory(job=job, category=category) for category in categories], ignore_conflicts=True
+    )
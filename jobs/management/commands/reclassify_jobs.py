@@ -0,0 +1,162 @@
+"""
+Django management command to re-classify and re-tag stored jobs after the
+AI/ML rule, model or taxonomy changes.
+"""
+import json
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+logger = logging.getLogger(__name__)
+
+# Per-process scraper and model used by _classify_chunk
+_worker_state = {}
+
+
+def _classify_chunk(pairs):
+    """Classify and tag (title, description) pairs with the current keyword rule or model file."""
+    if not _worker_state:
+        from scraper.classifier import get_shared_classifier
+        from scraper.scraper import BaseScraper
+
+        _worker_state['scraper'] = BaseScraper()
+        _worker_state['classifier'] = get_shared_classifier()
+    return _worker_state['scraper'].classify_batch(pairs, _worker_state['classifier'])
+
+
+def _classifier_version() -> str:
+    from scraper.classifier import get_shared_classifier
+    from scraper.scraper import classification_version
+
+    return classification_version(get_shared_classifier())
+
+
+class Command(BaseCommand):
+    help = ('Re-classify and re-tag stored jobs with the current AI/ML keyword rule or model and taxonomy, '
+            'in primary-key chunks, and write back the rows whose result changed')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Jobs read and classified at a time')
+        parser.add_argument('--workers', type=int, default=0,
+                            help='Worker processes classifying chunks; 0 classifies in this process')
+        parser.add_argument('--checkpoint', default='.reclassify_checkpoint.json',
+                            help='File recording the last finished chunk, removed once the run completes')
+        parser.add_argument('--resume', action='store_true', help='Continue after the chunk in --checkpoint')
+        parser.add_argument('--dry-run', action='store_true', help='Count changed rows without writing them')
+
+    def handle(self, *args, **options):
+        from jobs.models import Job
+
+        chunk_size = options['chunk_size']
+        if chunk_size < 1:
+            raise CommandError("--chunk-size must be at least 1")
+        checkpoint = Path(options['checkpoint'])
+        version = _classifier_version()
+
+        queryset = Job.objects.order_by('pk')
+        if options['resume']:
+            state = self._read_checkpoint(checkpoint)
+            if state.get('version') != version:
+                self.stdout.write(self.style.WARNING(
+                    f"Checkpoint was written by classifier {state.get('version')}, now {version}"
+                ))
+            queryset = queryset.filter(pk__gt=state['last_pk'])
+        total = queryset.count()
+        self.stdout.write(f"Re-classifying {total} jobs with {version}...")
+
+        # Rows stream from one cursor, so only the chunks being classified are in memory
+        rows = queryset.values_list('pk', 'title', 'description', 'is_ai_ml_job', 'ai_ml_score')
+        rows = rows.iterator(chunk_size=chunk_size)
+        chunks = iter(lambda: list(islice(rows, chunk_size)), [])
+
+        executor = None
+        if options['workers'] > 0:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+            executor = ProcessPoolExecutor(max_workers=options['workers'], mp_context=context)
+
+        started = time.monotonic()
+        progress = {'done': 0, 'changed': 0, 'total': total, 'started': started}
+        pending = deque()
+        try:
+            for chunk in chunks:
+                pairs = [(title or '', description or '') for _, title, description, _, _ in chunk]
+                if executor is None:
+                    self._write_back(chunk, _classify_chunk(pairs), version, checkpoint, progress,
+                                     options['dry_run'])
+                    continue
+                pending.append((chunk, executor.submit(_classify_chunk, pairs)))
+                # Keep each worker busy with a queued chunk, and write chunks back in pk order
+                while len(pending) > 2 * options['workers']:
+                    chunk, future = pending.popleft()
+                    self._write_back(chunk, future.result(), version, checkpoint, progress, options['dry_run'])
+            while pending:
+                chunk, future = pending.popleft()
+                self._write_back(chunk, future.result(), version, checkpoint, progress, options['dry_run'])
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+        if checkpoint.exists() and not options['dry_run']:
+            checkpoint.unlink()
+        done, elapsed = progress['done'], time.monotonic() - started
+        verb = "would change" if options['dry_run'] else "updated"
+        self.stdout.write(self.style.SUCCESS(
+            f"Re-classified {done} jobs in {elapsed:.1f}s ({done / max(elapsed, 1e-9):.0f} rows/s), "
+            f"{verb} {progress['changed']}"
+        ))
+
+    def _write_back(self, chunk, results, version: str, checkpoint: Path, progress: dict, dry_run: bool):
+        """Save one classified chunk's changed rows and categories, checkpoint it and report progress."""
+        from jobs.models import Job, JobCategory
+
+        stored = {}
+        for job_id, category in JobCategory.objects.filter(job_id__in=[row[0] for row in chunk]).values_list(
+                'job_id', 'category'):
+            stored.setdefault(job_id, set()).add(category)
+
+        updates, retagged = [], {}
+        for (pk, _, _, old_is_ai_ml, old_score), (is_ai_ml, score, categories) in zip(chunk, results):
+            if is_ai_ml != old_is_ai_ml or score != old_score:
+                updates.append(Job(pk=pk, is_ai_ml_job=is_ai_ml, ai_ml_score=score))
+            if set(categories) != stored.get(pk, set()):
+                retagged[pk] = categories
+        if not dry_run:
+            if updates:
+                Job.objects.bulk_update(updates, ['is_ai_ml_job', 'ai_ml_score'], batch_size=500)
+            if retagged:
+                JobCategory.objects.filter(job_id__in=list(retagged)).delete()
+                JobCategory.objects.bulk_create([
+                    JobCategory(job_id=pk, category=category)
+                    for pk, categories in retagged.items() for category in categories
+                ], batch_size=1000)
+        if not dry_run:
+            self._write_checkpoint(checkpoint, {'last_pk': str(chunk[-1][0]), 'version': version})
+
+        progress['done'] += len(chunk)
+        progress['changed'] += len({job.pk for job in updates} | set(retagged))
+        rate = progress['done'] / max(time.monotonic() - progress['started'], 1e-9)
+        self.stdout.write(f"{progress['done']}/{progress['total']} jobs, {progress['changed']} changed, "
+                          f"{rate:.0f} rows/s")
+
+    def _read_checkpoint(self, checkpoint: Path) -> dict:
+        try:
+            state = json.loads(checkpoint.read_text())
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Cannot resume from {checkpoint}: {e}")
+        if not isinstance(state, dict) or 'last_pk' not in state:
+            raise CommandError(f"Cannot resume from {checkpoint}: no last_pk recorded")
+        return state
+
+    def _write_checkpoint(self, checkpoint: Path, state: dict):
+        # Replace the file atomically so an interrupted run never leaves half a checkpoint
+        temporary = checkpoint.with_name(checkpoint.name + '.tmp')
+        temporary.write_text(json.dumps(state))
+        os.replace(temporary, checkpoint)
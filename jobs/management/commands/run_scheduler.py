@@ -16,21 +16,45 @@ logger = logging.getLogger(__name__)
 
 def scrape_jobs_hourly():
     """Execute job scraping task hourly."""
+    from jobs.ingest import store_job
     from jobs.models import ScrapingMetadata
+    from scraper.classifier import DjangoClassificationCache
+    from scraper.health import DjangoPortalHealthRegistry
     from scraper.scraper import JobScraperService
+    from scraper.state import DjangoUrlStateStore, DjangoWatermarkStore
     
     try:
         logger.info("Starting hourly job scraping task...")
-        service = JobScraperService()
+        service = JobScraperService(
+            url_state=DjangoUrlStateStore(),
+            health_registry=DjangoPortalHealthRegistry(),
+            watermarks=DjangoWatermarkStore(),
+            classification_cache=DjangoClassificationCache(),
+        )
         
-        # Perform the scraping with pagination
-        jobs_data = service.scrape_all_portals(
-            include_portals=['weworkremotely'],  # Focus on working portals
+        # Perform the scraping with pagination; unhealthy portals are skipped and re-probed,
+        # and pagination stops at jobs already seen by earlier runs
+        stream = service.stream_portals(
             filter_ai_ml=True,
             max_pages=3
         )
         
-        logger.info(f"Hourly scraping completed: {jobs_data}")
+        # Store jobs in database as they are scraped
+        stored_jobs = 0
+        failed_portals = set()
+        for portal_name, job_data in stream:
+            try:
+                _, created = store_job(portal_name, job_data)
+                stored_jobs += created
+            except Exception as e:
+                logger.error(f"Error storing job {job_data.get('job_id')}: {e}")
+                failed_portals.add(portal_name)
+        
+        # Pages count as unchanged, and jobs as seen, for later runs only once the jobs are stored
+        stream.commit_crawl_state(skip_portals=failed_portals)
+        stream.commit_watermarks(skip_portals=failed_portals)
+        
+        logger.info(f"Hourly scraping completed, {stored_jobs} new jobs stored: {stream.results}")
         
         # Log successful execution
         DjangoJobExecution.objects.create(
@@ -51,6 +75,17 @@ def scrape_jobs_hourly():
             logger.error(f"Failed to log job execution: {log_error}")
 
 
+def prewarm_connections():
+    """Open pooled connections and start parse workers shortly before the hourly run."""
+    from scraper.health import DjangoPortalHealthRegistry
+    from scraper.scraper import JobScraperService
+    
+    try:
+        JobScraperService(health_registry=DjangoPortalHealthRegistry()).prewarm()
+    except Exception as e:
+        logger.warning(f"Connection pre-warm failed: {e}")
+
+
 class Command(BaseCommand):
     help = 'Start APScheduler for hourly job scraping'
 
@@ -82,6 +117,15 @@ class Command(BaseCommand):
             replace_existing=True,
         )
 
+        # Warm the shared connection pool a minute before each run
+        scheduler.add_job(
+            prewarm_connections,
+            trigger=CronTrigger(minute=59),
+            id='prewarm_connections',
+            name='Pre-warm Portal Connections',
+            replace_existing=True,
+        )
+
         logger.info(f"Scheduler started. Job scraping will run every hour.")
         
         try:
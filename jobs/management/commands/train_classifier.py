@@ -0,0 +1,92 @@
+"""
+Django management command to train the batch AI/ML classifier from stored jobs.
+
+Training needs both AI/ML and other jobs. Scrapes with filter_ai_ml=True only
+store AI/ML jobs, so store negatives first with runs that keep every job:
+bulk scraping with "filter_ai_ml": false, or scrape_remoteok.py.
+"""
+import logging
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = ('Train the hashed bag-of-words AI/ML classifier on labelled Job rows and save its weights. '
+            'Needs both AI/ML and other jobs: store the latter with scrapes run with filter_ai_ml=false. '
+            'Requires numpy (pip install numpy).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=None,
+                            help='Weights file (default: scraper/data/ai_ml_classifier.npz or SCRAPER_CLASSIFIER_PATH)')
+        parser.add_argument('--features', type=int, default=2 ** 17, help='Hashed feature count, a power of two')
+        parser.add_argument('--epochs', type=int, default=200, help='Gradient descent epochs (default: 200)')
+        parser.add_argument('--threshold', type=float, default=0.5,
+                            help='Probability at which a job counts as AI/ML; raise it for precision')
+        parser.add_argument('--holdout', type=float, default=0.2,
+                            help='Share of jobs held out to report precision and recall (default: 0.2)')
+        parser.add_argument('--min-score', type=float, default=None,
+                            help='Only train on AI/ML jobs with at least this ai_ml_score, to drop borderline labels')
+        parser.add_argument('--keyword-labels', action='store_true',
+                            help='Label jobs with the current keyword rule instead of their stored is_ai_ml_job')
+
+    def handle(self, *args, **options):
+        from jobs.models import Job
+        from scraper.classifier import LinearJobClassifier, _import_numpy, model_path
+        from scraper.scraper import BaseScraper
+
+        try:
+            _import_numpy()
+        except ImportError as e:
+            raise CommandError(f"{e}; it is an optional extra, listed in requirements.txt")
+
+        rows = Job.objects.values_list('title', 'description', 'is_ai_ml_job', 'ai_ml_score')
+        rows = rows.iterator(chunk_size=2000)
+        if options['keyword_labels']:
+            scraper = BaseScraper()
+            rows = (
+                (title, description, *scraper.is_ai_ml_job(title, description))
+                for title, description, _, _ in rows
+            )
+        examples = [
+            ((title, description), is_ai_ml)
+            for title, description, is_ai_ml, score in rows
+            if not is_ai_ml or options['min_score'] is None or score >= options['min_score']
+        ]
+        positives = sum(label for _, label in examples)
+        if not positives or positives == len(examples):
+            raise CommandError(
+                f"Training needs both AI/ML and other jobs, found {positives} AI/ML and "
+                f"{len(examples) - positives} other. Runs with filter_ai_ml=True only store AI/ML jobs: "
+                f"store other jobs with a bulk scrape with \"filter_ai_ml\": false, or scrape_remoteok.py"
+            )
+
+        random.Random(0).shuffle(examples)
+        split = int(len(examples) * (1 - options['holdout']))
+        train, test = examples[:split], examples[split:]
+        self.stdout.write(f"Training on {len(train)} jobs ({sum(label for _, label in train)} AI/ML), "
+                          f"holding out {len(test)}...")
+
+        started = time.monotonic()
+        try:
+            classifier = LinearJobClassifier.train(
+                [job for job, _ in train], [label for _, label in train], n_features=options['features'],
+                epochs=options['epochs'], threshold=options['threshold'],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        self.stdout.write(f"Trained in {time.monotonic() - started:.1f}s")
+
+        if test:
+            predicted = [is_ai_ml for is_ai_ml, _ in classifier.classify([job for job, _ in test])]
+            true_positives = sum(1 for p, (_, label) in zip(predicted, test) if p and label)
+            precision = true_positives / max(sum(predicted), 1)
+            recall = true_positives / max(sum(label for _, label in test), 1)
+            self.stdout.write(f"Held-out precision {precision:.3f}, recall {recall:.3f}")
+
+        output = options['output'] or model_path()
+        classifier.save(output)
+        self.stdout.write(self.style.SUCCESS(f"Saved classifier {classifier.version} to {output}"))
@@ -0,0 +1,30 @@
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_crawlstate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PortalHealth',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('portal', models.CharField(db_index=True, max_length=50, unique=True)),
+                ('status', models.CharField(choices=[('healthy', 'Healthy'), ('unhealthy', 'Unhealthy')], default='healthy', max_length=20)),
+                ('recent_requests', models.JSONField(blank=True, default=list)),
+                ('recent_runs', models.JSONField(blank=True, default=list)),
+                ('failed_probes', models.IntegerField(default=0)),
+                ('next_probe_at', models.DateTimeField(blank=True, null=True)),
+                ('last_checked_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'portal_health',
+                'ordering': ['portal'],
+            },
+        ),
+    ]
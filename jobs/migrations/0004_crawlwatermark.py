@@ -0,0 +1,27 @@
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_portalhealth'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CrawlWatermark',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('portal', models.CharField(db_index=True, max_length=50, unique=True)),
+                ('recent_job_ids', models.JSONField(blank=True, default=list)),
+                ('newest_job_id', models.CharField(blank=True, max_length=255)),
+                ('advanced_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'crawl_watermark',
+                'ordering': ['portal'],
+            },
+        ),
+    ]
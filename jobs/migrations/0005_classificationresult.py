@@ -0,0 +1,26 @@
+from django.db import migrations, models
+import django.utils.timezone
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_crawlwatermark'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClassificationResult',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('digest', models.CharField(db_index=True, max_length=64, unique=True)),
+                ('is_ai_ml_job', models.BooleanField(default=False)),
+                ('ai_ml_score', models.FloatField(default=0.0)),
+                ('used_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'classification_cache',
+            },
+        ),
+    ]
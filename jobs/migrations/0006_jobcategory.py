@@ -0,0 +1,35 @@
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0005_classificationresult'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='classificationresult',
+            name='categories',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.CreateModel(
+            name='JobCategory',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('category', models.CharField(max_length=50)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='categories', to='jobs.job')),
+            ],
+            options={
+                'db_table': 'job_categories',
+                'ordering': ['category'],
+                'indexes': [models.Index(fields=['category', 'job'], name='job_categories_lookup_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='jobcategory',
+            constraint=models.UniqueConstraint(fields=('job', 'category'), name='unique_job_category'),
+        ),
+    ]
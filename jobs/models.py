@@ -128,3 +128,116 @@ class ScrapingMetadata(models.Model):
 
     def __str__(self):
         return f"Scrape {self.scrape_type} - {self.source_portal} ({self.status})"
+
+
+class CrawlState(models.Model):
+    """
+    Model to remember the last fetch of each listing URL for conditional GETs.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    url = models.CharField(max_length=1000, unique=True, db_index=True)
+    etag = models.CharField(max_length=255, blank=True)
+    last_modified = models.CharField(max_length=100, blank=True)  # Raw Last-Modified header value
+    status_code = models.IntegerField(null=True, blank=True)
+    content_digest = models.CharField(max_length=64, blank=True)  # SHA-256 of the last body
+    fetched_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'crawl_state'
+
+    def __str__(self):
+        return f"{self.url} ({self.status_code})"
+
+
+class PortalHealth(models.Model):
+    """
+    Model to persist rolling health metrics for each scraping portal.
+    """
+    STATUS_CHOICES = [
+        ('healthy', 'Healthy'),
+        ('unhealthy', 'Unhealthy'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    portal = models.CharField(max_length=50, unique=True, db_index=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='healthy')
+    
+    # Rolling samples: [[ok, latency_ms], ...] per request and [[pages, jobs], ...] per run
+    recent_requests = models.JSONField(default=list, blank=True)
+    recent_runs = models.JSONField(default=list, blank=True)
+    
+    # Re-probe schedule while unhealthy
+    failed_probes = models.IntegerField(default=0)
+    next_probe_at = models.DateTimeField(null=True, blank=True)
+    
+    last_checked_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'portal_health'
+        ordering = ['portal']
+
+    def __str__(self):
+        return f"{self.portal} ({self.status})"
+
+
+class CrawlWatermark(models.Model):
+    """
+    Model to remember the most recently seen job IDs of each portal, so
+    incremental crawls stop paginating once they reach known jobs.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    portal = models.CharField(max_length=50, unique=True, db_index=True)
+    recent_job_ids = models.JSONField(default=list, blank=True)  # Newest first, capped
+    newest_job_id = models.CharField(max_length=255, blank=True)
+    advanced_at = models.DateTimeField(null=True, blank=True)  # Last run that found new jobs
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'crawl_watermark'
+        ordering = ['portal']
+
+    def __str__(self):
+        return f"{self.portal} ({self.newest_job_id})"
+
+
+class ClassificationResult(models.Model):
+    """
+    Model to cache AI/ML classification results by content digest, so jobs
+    seen again unchanged are not re-classified.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    digest = models.CharField(max_length=64, unique=True, db_index=True)  # SHA-256 of version and normalized text
+    is_ai_ml_job = models.BooleanField(default=False)
+    ai_ml_score = models.FloatField(default=0.0)
+    categories = models.JSONField(default=list, blank=True)  # Taxonomy category names
+    used_at = models.DateTimeField(default=timezone.now, db_index=True)  # Last lookup, for LRU eviction
+
+    class Meta:
+        db_table = 'classification_cache'
+
+    def __str__(self):
+        return f"{self.digest[:12]} ({self.is_ai_ml_job}, {self.ai_ml_score})"
+
+
+class JobCategory(models.Model):
+    """
+    Model to tag jobs with taxonomy categories (see scraper.taxonomy), one
+    row per job and category, so the list API can filter on any category.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='categories')
+    category = models.CharField(max_length=50)
+
+    class Meta:
+        db_table = 'job_categories'
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'category'], name='unique_job_category'),
+        ]
+        indexes = [
+            models.Index(fields=['category', 'job'], name='job_categories_lookup_idx'),
+        ]
+        ordering = ['category']
+
+    def __str__(self):
+        return f"{self.job_id} ({self.category})"
@@ -7,9 +7,14 @@ from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 from datetime import datetime, timedelta, timezone
-from jobs.models import Job, ScrapingMetadata
+from jobs.models import Job, JobCategory, ScrapingMetadata
 from companies.models import Company
-from scraper.scraper import JobScraperService
+from jobs.ingest import store_job
+from scraper.classifier import DjangoClassificationCache
+from scraper.details import DjangoDetailStore
+from scraper.scraper import BaseScraper, JobScraperService
+from scraper.health import DjangoPortalHealthRegistry
+from scraper.state import DjangoUrlStateStore, DjangoWatermarkStore
 
 logger = logging.getLogger('jobs')
 
@@ -30,7 +35,10 @@ def api_documentation(request):
                 'list': {
                     'method': 'GET',
                     'url': '/api/jobs/list/',
-                    'description': 'Get all jobs from the database'
+                    'description': 'Get all jobs from the database',
+                    'query': {
+                        'category': 'Comma-separated taxonomy categories, e.g. mlops,llm_apps'
+                    }
                 },
                 'bulk_scrape': {
                     'method': 'POST',
@@ -39,8 +47,13 @@ def api_documentation(request):
                     'body': {
                         'company_details': 'Optional filter by company',
                         'max_age_hours': 48,
-                        'include_portals': ['guru', 'truelancer', 'twine', 'remotework', 'weworkremotely'],
-                        'filter_ai_ml': True
+                        'include_portals': ['guru', 'truelancer', 'twine', 'remotework', 'weworkremotely', 'remoteok'],
+                        'filter_ai_ml': True,
+                        'fetch_mode': 'threads | async',
+                        'backfill': False,
+                        'fetch_details': False,
+                        'discovery': 'feed | html',
+                        'targeted': 'Defaults to filter_ai_ml'
                     }
                 },
                 'realtime_scrape': {
@@ -76,7 +89,12 @@ def bulk_scrape_jobs(request):
         "company_details": "Optional filter by company",
         "max_age_hours": 48,
         "include_portals": ["guru", "truelancer", "twine", "remotework"],
-        "filter_ai_ml": true
+        "filter_ai_ml": true,
+        "fetch_mode": "threads" | "async",
+        "backfill": false,
+        "fetch_details": false,
+        "discovery": "feed" | "html",
+        "targeted": true
     }
     
     Response:
@@ -104,9 +122,30 @@ def bulk_scrape_jobs(request):
     # Extract parameters
     max_age_hours = request_data.get('max_age_hours', 48)
     max_pages = request_data.get('max_pages', 3)
-    include_portals = request_data.get('include_portals', 
-                                      ['weworkremotely'])  # Changed default to focus on working portal
+    include_portals = request_data.get('include_portals')  # None: all portals, unhealthy ones are skipped
     filter_ai_ml = request_data.get('filter_ai_ml', True)
+    fetch_mode = request_data.get('fetch_mode', 'threads')
+    backfill = request_data.get('backfill', False)  # Ignore the watermark and crawl all max_pages
+    fetch_details = request_data.get('fetch_details', False)  # Full descriptions from job pages
+    discovery = request_data.get('discovery', 'feed')  # Portal feeds where available, else listing pages
+    targeted = request_data.get('targeted')  # Only AI/ML-relevant categories and searches; None follows filter_ai_ml
+    
+    # Reject bad options up front rather than failing the scrape inside the service
+    invalid = []
+    if fetch_mode not in JobScraperService.FETCH_MODES:
+        invalid.append(f"fetch_mode must be one of {', '.join(JobScraperService.FETCH_MODES)}")
+    if discovery not in BaseScraper.DISCOVERY_MODES:
+        invalid.append(f"discovery must be one of {', '.join(BaseScraper.DISCOVERY_MODES)}")
+    for name, value in (('backfill', backfill), ('fetch_details', fetch_details)):
+        if not isinstance(value, bool):
+            invalid.append(f"{name} must be true or false")
+    if targeted is not None and not isinstance(targeted, bool):
+        invalid.append("targeted must be true, false or null")
+    if invalid:
+        return JsonResponse({
+            'status': 'error',
+            'message': 'Invalid parameters: ' + '; '.join(invalid)
+        }, status=400)
     
     try:
         # Create metadata record for this scraping operation
@@ -120,55 +159,50 @@ def bulk_scrape_jobs(request):
         logger.info(f"Starting bulk scraping operation {metadata.id}")
         
         # Initialize scraper and run
-        scraper_service = JobScraperService(max_workers=4)
-        results = scraper_service.scrape_all_portals(
-            max_age_hours=max_age_hours,
+        scraper_service = JobScraperService(
+            max_workers=4,
+            url_state=DjangoUrlStateStore(),
+            health_registry=DjangoPortalHealthRegistry(),
+            watermarks=DjangoWatermarkStore(),
+            detail_store=DjangoDetailStore(),
+            classification_cache=DjangoClassificationCache(),
+        )
+        stream = scraper_service.stream_portals(
             include_portals=include_portals,
             max_pages=max_pages,
-            filter_ai_ml=filter_ai_ml
+            filter_ai_ml=filter_ai_ml,
+            fetch_mode=fetch_mode,
+            backfill=backfill,
+            fetch_details=fetch_details,
+            discovery=discovery,
+            targeted=targeted
         )
         
-        # Store jobs in database
+        # Store jobs in database as they are scraped
         stored_jobs = 0
         ai_ml_jobs_count = 0
         errors = []
+        failed_portals = set()
         
-        for portal_name, portal_data in results.get('by_portal', {}).items():
-            for job_data in portal_data.get('jobs', []):
-                try:
-                    # Get or create company
-                    company, created = Company.objects.get_or_create(
-                        company_id=job_data.get('company_name', 'Unknown'),
-                        defaults={
-                            'name': job_data.get('company_name', 'Unknown'),
-                            'industry': 'Technology',
-                        }
-                    )
-                    
-                    # Create or update job
-                    job, created = Job.objects.update_or_create(
-                        job_id=job_data.get('job_id'),
-                        defaults={
-                            'title': job_data.get('title', ''),
-                            'description': job_data.get('description', ''),
-                            'job_url': job_data.get('url', ''),
-                            'source_portal': portal_name,
-                            'company': company,
-                            'job_posted_at': datetime.now(timezone.utc),
-                            'is_ai_ml_job': True,  # Already filtered
-                            'ai_ml_score': job_data.get('ai_ml_score', 0),
-                            'metadata': job_data,
-                        }
-                    )
-                    
-                    if created:
-                        stored_jobs += 1
+        for portal_name, job_data in stream:
+            try:
+                job, created = store_job(portal_name, job_data)
+                
+                if created:
+                    stored_jobs += 1
+                    if job.is_ai_ml_job:
                         ai_ml_jobs_count += 1
-                        
-                except Exception as e:
-                    error_msg = f"Error storing job {job_data.get('job_id')}: {str(e)}"
-                    logger.error(error_msg)
-                    errors.append(error_msg)
+                    
+            except Exception as e:
+                error_msg = f"Error storing job {job_data.get('job_id')}: {str(e)}"
+                logger.error(error_msg)
+                errors.append(error_msg)
+                failed_portals.add(portal_name)
+        
+        # Pages count as unchanged, and jobs as seen, for later runs only once the jobs are stored
+        stream.commit_crawl_state(skip_portals=failed_portals)
+        stream.commit_watermarks(skip_portals=failed_portals)
+        results = stream.results
         
         # Update metadata record
         metadata.status = 'completed'
@@ -191,6 +225,10 @@ def bulk_scrape_jobs(request):
                 'ai_ml_jobs': results.get('ai_ml_jobs', 0),
                 'stored_jobs': stored_jobs,
                 'duration_seconds': results.get('duration_seconds', 0),
+                'circuit_breakers': results.get('circuit_breakers', {}),
+                'skipped_portals': results.get('skipped_portals', []),
+                'health': results.get('health', {}),
+                'details': results.get('details'),
                 'errors': errors if errors else None,
             }
         }, status=200)
@@ -351,6 +389,7 @@ def get_jobs(request):
     - ai_ml_only: true|false (default: true)
     - portal: guru|truelancer|twine|remotework
     - company_id: filter by company UUID
+    - category: taxonomy categories, comma-separated (any of them), e.g. mlops,llm_apps
     - limit: number of results (default: 20)
     - offset: pagination offset (default: 0)
     """
@@ -358,6 +397,7 @@ def get_jobs(request):
         ai_ml_only = request.GET.get('ai_ml_only', 'true').lower() == 'true'
         portal = request.GET.get('portal', None)
         company_id = request.GET.get('company_id', None)
+        categories = [c.strip() for c in request.GET.get('category', '').split(',') if c.strip()]
         limit = int(request.GET.get('limit', 20))
         offset = int(request.GET.get('offset', 0))
         
@@ -373,10 +413,15 @@ def get_jobs(request):
         if company_id:
             queryset = queryset.filter(company_id=company_id)
         
+        if categories:
+            queryset = queryset.filter(
+                pk__in=JobCategory.objects.filter(category__in=categories).values('job_id')
+            )
+        
         queryset = queryset.order_by('-job_posted_at')
         
         total_count = queryset.count()
-        jobs = queryset[offset:offset+limit]
+        jobs = queryset.prefetch_related('categories')[offset:offset+limit]
         
         jobs_data = [
             {
@@ -391,6 +436,7 @@ def get_jobs(request):
                     'name': job.company.name,
                 },
                 'ai_ml_score': job.ai_ml_score,
+                'categories': [category.category for category in job.categories.all()],
                 'job_posted_at': job.job_posted_at.isoformat(),
                 'created_at': job.created_at.isoformat(),
             }
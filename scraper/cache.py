@@ -0,0 +1,156 @@
+"""
+On-disk HTTP response cache with record/replay modes.
+
+Bodies are stored content-addressed under bodies/<sha256>, so identical
+pages fetched from different URLs are kept once. Each request key has a
+small JSON entry under entries/ pointing at its body. Entry file mtimes
+track last use for LRU eviction.
+
+Modes:
+    record: read-through cache; fresh entries are served from disk, misses
+            and stale entries go to the network and are stored.
+    replay: strict offline mode; every request must be served from disk and
+            a miss raises CacheMiss instead of touching the network.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from scraper.fetch import FetchResult
+
+logger = logging.getLogger('scraper')
+
+
+class CacheMiss(Exception):
+    """Raised in replay mode when a request has no cached response."""
+
+
+class ResponseCache:
+    """Size-bounded, TTL-aware on-disk cache of listing page responses."""
+
+    MODES = ('record', 'replay')
+
+    def __init__(self, directory, mode: str = 'record', ttl_seconds: int = 3600,
+                 max_bytes: int = 200 * 1024 * 1024):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown cache mode: {mode}")
+        self.directory = Path(directory)
+        self.mode = mode
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        (self.directory / 'entries').mkdir(parents=True, exist_ok=True)
+        (self.directory / 'bodies').mkdir(parents=True, exist_ok=True)
+
+    @classmethod
+    def from_env(cls) -> Optional['ResponseCache']:
+        """
+        Build a cache from SCRAPER_CACHE_MODE / SCRAPER_CACHE_DIR / SCRAPER_CACHE_TTL.
+
+        Returns None unless SCRAPER_CACHE_MODE is set, so caching stays opt-in.
+        """
+        mode = os.environ.get('SCRAPER_CACHE_MODE')
+        if not mode:
+            return None
+        directory = os.environ.get('SCRAPER_CACHE_DIR', '.scraper_cache')
+        ttl = int(os.environ.get('SCRAPER_CACHE_TTL', 3600))
+        return cls(directory, mode=mode, ttl_seconds=ttl)
+
+    @property
+    def replay(self) -> bool:
+        return self.mode == 'replay'
+
+    def _key(self, url: str, headers: Optional[Dict[str, str]] = None) -> str:
+        accept = (headers or {}).get('Accept', '')
+        return hashlib.sha256(f"GET {url}\n{accept}".encode('utf-8')).hexdigest()
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> Optional[FetchResult]:
+        """
+        Return the cached response for a request, or None on a miss.
+
+        Raises:
+            CacheMiss: In replay mode when nothing is cached for the request
+        """
+        entry_path = self.directory / 'entries' / f"{self._key(url, headers)}.json"
+        try:
+            entry = json.loads(entry_path.read_text(encoding='utf-8'))
+            stale = time.time() - entry['stored_at'] > self.ttl_seconds
+            if stale and not self.replay:
+                return None
+            content = (self.directory / 'bodies' / entry['body']).read_bytes()
+        except (OSError, ValueError, KeyError):
+            if self.replay:
+                raise CacheMiss(f"No cached response for {url}")
+            return None
+
+        # Touch the entry so eviction sees it as recently used
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        logger.debug(f"Cache hit: {url}")
+        return FetchResult(entry['url'], entry['status_code'], entry['headers'], content)
+
+    def put(self, url: str, response, headers: Optional[Dict[str, str]] = None):
+        """Store a response (anything with status_code, headers and content)."""
+        if self.replay or response.status_code >= 500 or response.status_code == 304:
+            return
+
+        content = response.content
+        body_digest = hashlib.sha256(content).hexdigest()
+        entry = {
+            'url': url,
+            'status_code': response.status_code,
+            'headers': dict(response.headers),
+            'body': body_digest,
+            'stored_at': time.time(),
+        }
+        with self._lock:
+            try:
+                body_path = self.directory / 'bodies' / body_digest
+                if not body_path.exists():
+                    body_path.write_bytes(content)
+                entry_path = self.directory / 'entries' / f"{self._key(url, headers)}.json"
+                entry_path.write_text(json.dumps(entry), encoding='utf-8')
+                self._evict()
+            except OSError as e:
+                logger.warning(f"Error writing cache entry for {url}: {e}")
+
+    def _evict(self):
+        """Drop least recently used entries until bodies fit in max_bytes."""
+        bodies_dir = self.directory / 'bodies'
+        body_sizes = {p.name: p.stat().st_size for p in bodies_dir.iterdir()}
+        total = sum(body_sizes.values())
+        if total <= self.max_bytes:
+            return
+
+        entries = []
+        refs = {}
+        for path in (self.directory / 'entries').iterdir():
+            try:
+                body = json.loads(path.read_text(encoding='utf-8'))['body']
+            except (OSError, ValueError, KeyError):
+                path.unlink(missing_ok=True)
+                continue
+            entries.append((path.stat().st_mtime, path, body))
+            refs[body] = refs.get(body, 0) + 1
+
+        # Unreferenced bodies go first
+        for body in list(body_sizes):
+            if body not in refs:
+                (bodies_dir / body).unlink(missing_ok=True)
+                total -= body_sizes.pop(body)
+
+        for _, path, body in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            refs[body] -= 1
+            if refs[body] == 0 and body in body_sizes:
+                (bodies_dir / body).unlink(missing_ok=True)
+                total -= body_sizes.pop(body)
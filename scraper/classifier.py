@@ -0,0 +1,381 @@
+"""
+Batch AI/ML classification with a hashed bag-of-words linear model.
+
+LinearJobClassifier scores a whole batch of (title, description) pairs with
+a few NumPy array operations. Each job becomes a sparse vector of hashed
+word counts (title words, title bigrams and description words in separate
+namespaces, log-scaled and L2-normalised). The batch's scores are one
+gather of the weights plus one bincount over the non-zero entries, and only
+tokenizing stays a per-job loop.
+
+The model is trained offline from labelled Job rows with
+`manage.py train_classifier` and saved as a compressed .npz file at
+MODEL_PATH (override with SCRAPER_CLASSIFIER_PATH). While no model file
+exists, classification falls back to BaseScraper.is_ai_ml_job's keyword rule.
+NumPy is only needed once a model file is present (pip install numpy).
+
+Results are cached by content: ClassificationCache maps a digest of a job's
+normalized title and description plus the classifier version to its
+(is_ai_ml, score, categories), so a job seen again unchanged by the next
+run is not classified again. Retraining the model or editing the keyword
+rule or taxonomy changes the version, and old entries simply age out of the LRU.
+"""
+import hashlib
+import logging
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from itertools import chain
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from scraper.keywords import split_words
+
+logger = logging.getLogger('scraper')
+
+MODEL_PATH = Path(__file__).resolve().parent / 'data' / 'ai_ml_classifier.npz'
+
+
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError("The AI/ML classifier model requires numpy (pip install numpy)") from e
+    return numpy
+
+
+class HashedFeatures:
+    """Sparse job-by-feature matrix in coordinate form: NumPy arrays with values[k] at (rows[k], columns[k])."""
+
+    def __init__(self, rows, columns, values, n_rows: int):
+        self.rows = rows
+        self.columns = columns
+        self.values = values
+        self.n_rows = n_rows
+
+
+class HashingVectorizer:
+    """Map jobs to hashed word-count features; nothing but the size needs storing."""
+
+    # Only the start of long descriptions is read
+    MAX_DESCRIPTION_CHARS = 5000
+    # Token hashes are remembered across batches, up to this many tokens per namespace
+    MAX_CACHED_TOKENS = 500000
+    # CRC seeds that keep title and description words apart
+    TITLE, DESCRIPTION = 0x5449544C, 0x44455343
+
+    def __init__(self, n_features: int = 2 ** 17):
+        if n_features & (n_features - 1):
+            raise ValueError("n_features must be a power of two")
+        self.n_features = n_features
+        self._columns = {self.TITLE: {}, self.DESCRIPTION: {}}
+
+    @staticmethod
+    def title_tokens(title: str) -> List[str]:
+        """Title words and word pairs."""
+        words = split_words(title or '')
+        return words + [f'{first} {second}' for first, second in zip(words, words[1:])]
+
+    def description_tokens(self, description: str) -> List[str]:
+        return split_words((description or '')[:self.MAX_DESCRIPTION_CHARS])
+
+    def transform(self, jobs: Sequence[Tuple[str, str]]) -> HashedFeatures:
+        """Vectorize (title, description) pairs."""
+        np = _import_numpy()
+        rows, signed = [], []
+        for namespace, documents in (
+            (self.TITLE, [self.title_tokens(title) for title, _ in jobs]),
+            (self.DESCRIPTION, [self.description_tokens(description) for _, description in jobs]),
+        ):
+            tokens = list(chain.from_iterable(documents))
+            signed.append(self._signed_columns(tokens, namespace))
+            rows.append(np.repeat(np.arange(len(documents)), [len(document) for document in documents]))
+        rows, signed = np.concatenate(rows), np.concatenate(signed)
+
+        # Sum the signed counts of each (row, column) cell
+        keys, cells = np.unique(rows * self.n_features + np.abs(signed) - 1, return_inverse=True)
+        values = np.bincount(cells.ravel(), weights=np.sign(signed), minlength=len(keys))
+        rows, columns = keys // self.n_features, keys % self.n_features
+
+        values = np.sign(values) * np.log1p(np.abs(values))
+        norms = np.sqrt(np.bincount(rows, weights=values * values, minlength=len(jobs)))
+        if len(values):
+            values /= np.maximum(norms[rows], 1e-12)
+        return HashedFeatures(rows, columns, values, len(jobs))
+
+    def _signed_columns(self, tokens: List[str], namespace: int):
+        """Column + 1 of each token, negated for tokens whose hash has the top bit clear."""
+        np = _import_numpy()
+        columns = self._columns[namespace]
+        try:
+            # Once the vocabulary is cached this is a single pass over the tokens
+            return np.fromiter(map(columns.__getitem__, tokens), dtype=np.int64, count=len(tokens))
+        except KeyError:
+            pass
+        if len(columns) > self.MAX_CACHED_TOKENS:
+            columns.clear()
+        mask = self.n_features - 1
+        for token in set(tokens).difference(columns):
+            digest = zlib.crc32(token.encode('utf-8'), namespace)
+            # The top bit signs the feature, so colliding tokens tend to cancel out
+            columns[token] = (digest & mask) + 1 if digest & 0x80000000 else -((digest & mask) + 1)
+        return np.fromiter(map(columns.__getitem__, tokens), dtype=np.int64, count=len(tokens))
+
+
+class LinearJobClassifier:
+    """Logistic regression over HashingVectorizer features."""
+
+    def __init__(self, weights, bias: float = 0.0, threshold: float = 0.5, version: str = ''):
+        """
+        Args:
+            weights: NumPy vector of n_features weights
+            bias: Intercept
+            threshold: Probability at or above which a job counts as AI/ML
+            version: Identifies the trained weights, e.g. for caching results
+        """
+        self.weights = weights
+        self.bias = float(bias)
+        self.threshold = float(threshold)
+        self.vectorizer = HashingVectorizer(len(weights))
+        self.version = version
+
+    def probabilities(self, jobs: Sequence[Tuple[str, str]]):
+        """Return the AI/ML probability of each (title, description) pair as a NumPy vector."""
+        np = _import_numpy()
+        features = self.vectorizer.transform(jobs)
+        logits = np.bincount(features.rows, weights=self.weights[features.columns] * features.values,
+                             minlength=features.n_rows) + self.bias
+        return 1 / (1 + np.exp(-logits))
+
+    def classify(self, jobs: Sequence[Tuple[str, str]]) -> List[Tuple[bool, float]]:
+        """Batch counterpart of BaseScraper.is_ai_ml_job: (is_ai_ml, confidence 0-100) per pair."""
+        if not jobs:
+            return []
+        probabilities = self.probabilities(jobs)
+        return [(bool(p >= self.threshold), round(float(p) * 100, 2)) for p in probabilities]
+
+    @classmethod
+    def train(cls, jobs: Sequence[Tuple[str, str]], labels: Sequence[bool], n_features: int = 2 ** 17,
+              epochs: int = 200, learning_rate: float = 2.0, l2: float = 1e-4,
+              threshold: float = 0.5) -> 'LinearJobClassifier':
+        """
+        Fit the model with full-batch gradient descent on the logistic loss.
+
+        Positive and negative jobs are weighted to contribute equally, as AI/ML
+        jobs are a small minority of the table.
+        """
+        np = _import_numpy()
+        vectorizer = HashingVectorizer(n_features)
+        features = vectorizer.transform(jobs)
+        y = np.asarray(labels, dtype=np.float64)
+        positives = y.sum()
+        if positives == 0 or positives == len(y):
+            raise ValueError("Training needs both AI/ML and other jobs")
+        sample_weights = np.where(y == 1, len(y) / (2 * positives), len(y) / (2 * (len(y) - positives)))
+
+        weights = np.zeros(n_features)
+        bias = 0.0
+        for _ in range(epochs):
+            logits = np.bincount(features.rows, weights=weights[features.columns] * features.values,
+                                 minlength=features.n_rows) + bias
+            errors = (1 / (1 + np.exp(-logits)) - y) * sample_weights / len(y)
+            gradient = np.bincount(features.columns, weights=features.values * errors[features.rows],
+                                   minlength=n_features)
+            weights -= learning_rate * (gradient + l2 * weights)
+            bias -= learning_rate * errors.sum()
+        return cls(weights.astype(np.float32), bias, threshold)
+
+    def save(self, path: Path = MODEL_PATH):
+        np = _import_numpy()
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as f:
+            np.savez_compressed(f, weights=self.weights.astype(np.float32), bias=self.bias,
+                                threshold=self.threshold)
+        self.version = _file_version(path)
+
+    @classmethod
+    def load(cls, path: Path = MODEL_PATH) -> 'LinearJobClassifier':
+        np = _import_numpy()
+        with np.load(path) as data:
+            return cls(data['weights'], float(data['bias']), float(data['threshold']), _file_version(path))
+
+
+def _file_version(path: Path) -> str:
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()[:12]
+
+
+def model_path() -> Path:
+    return Path(os.environ.get('SCRAPER_CLASSIFIER_PATH') or MODEL_PATH)
+
+
+_shared_classifier = None
+_shared_loaded = False
+_shared_lock = threading.Lock()
+
+
+def get_shared_classifier() -> Optional[LinearJobClassifier]:
+    """
+    Return the process-wide classifier loaded from model_path(), or None if there is no usable model.
+
+    A model that cannot be loaded (e.g. numpy is missing) is logged once and
+    the keyword rule stays in use.
+    """
+    global _shared_classifier, _shared_loaded
+    with _shared_lock:
+        if not _shared_loaded:
+            _shared_loaded = True
+            path = model_path()
+            if path.exists():
+                try:
+                    _shared_classifier = LinearJobClassifier.load(path)
+                    logger.info(f"Loaded AI/ML classifier {_shared_classifier.version} from {path}")
+                except (ImportError, OSError, KeyError, ValueError) as e:
+                    logger.error(f"Could not load AI/ML classifier from {path}, using keywords: {e}")
+        return _shared_classifier
+
+
+def classification_key(title: str, description: str, version: str) -> str:
+    """
+    Digest identifying the classification of a job by a given classifier version.
+
+    Both classifiers only see lowercase words, so the text is normalized the
+    same way: changes in case, punctuation or whitespace keep the key.
+    """
+    text = '\n'.join((version, ' '.join(split_words(title or '')), ' '.join(split_words(description or ''))))
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class ClassificationCache:
+    """
+    In-memory LRU cache of (is_ai_ml, score, categories) results keyed by classification_key().
+
+    Subclasses persist the same entries.
+    """
+
+    def __init__(self, max_entries: int = 100000):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Tuple[bool, float, List[str]]]:
+        found = {}
+        with self._lock:
+            for key in keys:
+                result = self._results.get(key)
+                if result is not None:
+                    self._results.move_to_end(key)
+                    found[key] = result
+        return found
+
+    def save_many(self, results: Dict[str, Tuple[bool, float, List[str]]]):
+        with self._lock:
+            for key, result in results.items():
+                self._results[key] = result
+                self._results.move_to_end(key)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+
+    def record(self, hits: int, misses: int):
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+
+class DjangoClassificationCache(ClassificationCache):
+    """
+    ClassificationCache persisted in the classification_cache table (jobs.ClassificationResult).
+
+    A hit refreshes the row's used_at at most once per TOUCH_INTERVAL. Every
+    EVICT_INTERVAL new rows, the least recently used rows beyond max_entries
+    are deleted.
+    """
+
+    TOUCH_INTERVAL = timedelta(hours=1)
+    EVICT_INTERVAL = 1000
+    # Primary keys per DELETE when evicting, within SQLite's query parameter limit
+    EVICT_BATCH = 500
+
+    def __init__(self, max_entries: int = 1000000):
+        super().__init__(max_entries)
+        self._inserted = 0
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Tuple[bool, float, List[str]]]:
+        from jobs.models import ClassificationResult
+
+        now = datetime.now(timezone.utc)
+        found, stale = {}, []
+        rows = ClassificationResult.objects.filter(digest__in=list(keys)).values_list(
+            'digest', 'is_ai_ml_job', 'ai_ml_score', 'categories', 'used_at'
+        )
+        for digest, is_ai_ml, score, categories, used_at in rows:
+            found[digest] = (is_ai_ml, score, categories)
+            if used_at is None or now - used_at >= self.TOUCH_INTERVAL:
+                stale.append(digest)
+        if stale:
+            try:
+                ClassificationResult.objects.filter(digest__in=stale).update(used_at=now)
+            except Exception as e:
+                logger.error(f"Error refreshing classification cache entries: {e}")
+        return found
+
+    def save_many(self, results: Dict[str, Tuple[bool, float, List[str]]]):
+        from jobs.models import ClassificationResult
+
+        if not results:
+            return
+        now = datetime.now(timezone.utc)
+        try:
+            ClassificationResult.objects.bulk_create([
+                ClassificationResult(digest=digest, is_ai_ml_job=is_ai_ml, ai_ml_score=score,
+                                     categories=list(categories), used_at=now)
+                for digest, (is_ai_ml, score, categories) in results.items()
+            ], ignore_conflicts=True)
+        except Exception as e:
+            logger.error(f"Error saving classification cache entries: {e}")
+            return
+
+        with self._lock:
+            self._inserted += len(results)
+            evict = self._inserted >= self.EVICT_INTERVAL
+            if evict:
+                self._inserted = 0
+        if evict:
+            self._evict()
+
+    def _evict(self):
+        from jobs.models import ClassificationResult
+
+        try:
+            excess = ClassificationResult.objects.count() - self.max_entries
+            if excess <= 0:
+                return
+            # Rows written together share used_at; evict exactly the excess by primary key
+            stale = list(ClassificationResult.objects.order_by('used_at', 'pk').values_list('pk', flat=True)[:excess])
+            deleted = 0
+            for start in range(0, len(stale), self.EVICT_BATCH):
+                deleted += ClassificationResult.objects.filter(pk__in=stale[start:start + self.EVICT_BATCH]).delete()[0]
+            logger.info(f"Evicted {deleted} least recently used classification cache entries")
+        except Exception as e:
+            logger.error(f"Error evicting classification cache entries: {e}")
+
+
+_shared_classification_cache = None
+
+
+def get_shared_classification_cache(**kwargs) -> ClassificationCache:
+    """
+    Return the process-wide in-memory ClassificationCache, creating it on first use.
+
+    Keyword arguments are passed to ClassificationCache and only take effect
+    on the call that creates the cache.
+    """
+    global _shared_classification_cache
+    with _shared_lock:
+        if _shared_classification_cache is None:
+            _shared_classification_cache = ClassificationCache(**kwargs)
+        return _shared_classification_cache
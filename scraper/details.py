@@ -0,0 +1,235 @@
+"""
+Optional detail-page stage: replace listing-card snippets with full job descriptions.
+
+Listing cards only carry a truncated snippet. DetailFetcher visits the job's
+own URL, takes the description from the page's ld+json JobPosting if it has
+one (see scraper.embedded) or else the portal's DETAIL_DESCRIPTION field,
+and cleans it up. To keep the extra requests within budget it:
+
+- only considers jobs whose title passes a cheap pre-filter,
+- reuses the full description of jobs already stored with one (DetailStore),
+- skips URLs the host's robots.txt disallows, and honours its Crawl-delay,
+- caps requests per run (max_requests) and in flight, both overall and per host;
+  pages served by the response cache are not requests.
+
+Requests go through the portal scraper (BaseScraper.fetch_detail_page), so
+they share its retries, circuit breaker and health stats: a portal whose
+detail pages keep failing trips its breaker like failing listing pages do.
+
+Jobs flow through enrich() in order; detail requests for the next few jobs
+run on a small thread pool while earlier jobs are handed on.
+"""
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from scraper.cache import CacheMiss
+from scraper.embedded import LD_JSON, iter_job_postings, iter_script_payloads, job_fields_from_posting
+from scraper.fetch import CircuitOpenError, FetchError
+from scraper.parsing import charset_from_headers
+
+logger = logging.getLogger('scraper')
+
+# Marks a job whose description came from its detail page
+DETAIL_SOURCE = 'detail'
+
+
+def clean_description(text: str, max_length: int) -> str:
+    """Collapse whitespace and cap the length."""
+    return ' '.join(text.split())[:max_length]
+
+
+class DetailStore:
+    """In-memory record of the full descriptions fetched so far, by job ID."""
+
+    def __init__(self):
+        self._descriptions = {}
+        self._lock = threading.Lock()
+
+    def full_descriptions(self, job_ids: Iterable[str]) -> Dict[str, str]:
+        """Return the full description of each of job_ids that already has one."""
+        with self._lock:
+            return {job_id: self._descriptions[job_id] for job_id in job_ids if job_id in self._descriptions}
+
+    def mark(self, job_id: str, description: str):
+        with self._lock:
+            self._descriptions[job_id] = description
+
+
+class DjangoDetailStore(DetailStore):
+    """DetailStore backed by the jobs table: stored jobs whose metadata says description_source='detail'."""
+
+    def full_descriptions(self, job_ids: Iterable[str]) -> Dict[str, str]:
+        from jobs.models import Job
+
+        return dict(
+            Job.objects.filter(job_id__in=list(job_ids), metadata__description_source=DETAIL_SOURCE)
+            .values_list('job_id', 'description')
+        )
+
+    def mark(self, job_id: str, description: str):
+        # Persisted with the job itself, via its description_source
+        pass
+
+
+class DetailFetcher:
+    """Bounded-concurrency detail page fetching for one scrape run."""
+
+    BATCH_SIZE = 20
+    MAX_PAGE_BYTES = 2 * 1024 * 1024
+    MAX_DESCRIPTION_CHARS = 20000
+
+    def __init__(self, prefilter: Callable[[Dict], bool], store: DetailStore = None, max_requests: int = 200,
+                 max_concurrency: int = 8, per_host_limit: int = 2, timeout: int = 10):
+        """
+        Args:
+            prefilter: Decides from the listing data (title) whether a job is worth a request
+            store: Knows which jobs already have a full description
+            max_requests: Detail requests sent to the network in this run
+            max_concurrency: Detail requests in flight across all portals
+            per_host_limit: Detail requests in flight per host
+            timeout: Request timeout in seconds
+        """
+        self.prefilter = prefilter
+        self.store = store or DetailStore()
+        self.max_requests = max_requests
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.stats = {'fetched': 0, 'cached': 0, 'failed': 0, 'already_stored': 0, 'over_budget': 0,
+                      'disallowed': 0, 'circuit_open': 0}
+        self._requests = 0
+        self._lock = threading.Lock()
+        self._host_slots = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='detail')
+
+    def _take_request(self) -> bool:
+        with self._lock:
+            if self._requests >= self.max_requests:
+                self.stats['over_budget'] += 1
+                return False
+            # Count the request up front so concurrent callers cannot overshoot
+            self._requests += 1
+            return True
+
+    def _count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self._host_slots[host]
+
+    def enrich(self, scraper, jobs: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        Yield jobs in order, with full descriptions where the detail page could be fetched.
+
+        Jobs already stored with a full description get that description back
+        instead of a request, so they are classified and stored on the full text.
+
+        Args:
+            scraper: Portal scraper providing the session, parser backend and DETAIL_DESCRIPTION
+            jobs: Jobs as parsed from listing pages
+        """
+        if scraper.DETAIL_DESCRIPTION is None:
+            yield from jobs
+            return
+
+        jobs = iter(jobs)
+        pending = deque()
+        while True:
+            batch = list(islice(jobs, self.BATCH_SIZE))
+            if not batch:
+                break
+            candidates = {job['job_id'] for job in batch
+                          if job.get('url') and self.prefilter(job) and self._allowed(scraper, job['url'])}
+            stored = self.store.full_descriptions(candidates) if candidates else {}
+            with self._lock:
+                self.stats['already_stored'] += len(stored)
+            for job in batch:
+                future = None
+                if job['job_id'] in stored:
+                    job['description'] = stored[job['job_id']]
+                    job['description_source'] = DETAIL_SOURCE
+                elif job['job_id'] in candidates:
+                    future = self._executor.submit(self._fetch_description, scraper, job['url'])
+                pending.append((job, future))
+                while len(pending) > self.max_concurrency:
+                    yield self._finish(*pending.popleft())
+        while pending:
+            yield self._finish(*pending.popleft())
+
+    def _allowed(self, scraper, url: str) -> bool:
+        if scraper.robots_allowed(url):
+            return True
+        self._count('disallowed')
+        return False
+
+    def _finish(self, job: Dict, future) -> Dict:
+        if future is None:
+            return job
+        description = future.result()
+        if description:
+            job['description'] = description
+            job['description_source'] = DETAIL_SOURCE
+            self.store.mark(job['job_id'], description)
+        return job
+
+    def _fetch_description(self, scraper, url: str) -> Optional[str]:
+        """Fetch one detail page and return its cleaned description, or None on failure or over budget."""
+        try:
+            response = scraper.cache.get(url) if scraper.cache is not None else None
+            if response is not None:
+                source = 'cached'
+            elif not self._take_request():
+                return None
+            else:
+                try:
+                    with self._host_slot(url):
+                        response = scraper.fetch_detail_page(url, self.MAX_PAGE_BYTES, self.timeout)
+                except CircuitOpenError as e:
+                    # Nothing was sent, so the request goes back into the budget
+                    with self._lock:
+                        self._requests -= 1
+                        self.stats['circuit_open'] += 1
+                    logger.debug(f"Skipping detail page {url}: {e}")
+                    return None
+                source = 'fetched'
+            response.raise_for_status()
+            self._count(source)
+
+            encoding = charset_from_headers(response.headers)
+            description = self._embedded_description(scraper, response.content, encoding)
+            if not description:
+                backend = scraper.backend
+                root = backend.document(response.content, encoding)
+                description = backend.extract(root, scraper.DETAIL_DESCRIPTION) if root is not None else ''
+                description = clean_description(description, self.MAX_DESCRIPTION_CHARS)
+            if not description:
+                logger.debug(f"No description found on detail page {url}")
+            return description or None
+        except (requests.RequestException, FetchError, CacheMiss, OSError, ValueError) as e:
+            self._count('failed')
+            logger.warning(f"Error fetching detail page {url}: {e}")
+            return None
+
+    @staticmethod
+    def _embedded_description(scraper, content: bytes, encoding: Optional[str]) -> str:
+        """Description from the page's ld+json JobPosting, when it has exactly one."""
+        postings = [posting for kind, data in iter_script_payloads(content, encoding) if kind == LD_JSON
+                    for posting in iter_job_postings(data)]
+        if len(postings) != 1:
+            return ''
+        return scraper.description_text(job_fields_from_posting(postings[0])['description'])
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
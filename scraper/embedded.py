@@ -0,0 +1,229 @@
+"""
+Job listings embedded as JSON in a page's script tags.
+
+Script-rendered portals ship their listings as data: Next.js pages carry
+the page props in <script id="__NEXT_DATA__">, and many job pages describe
+their postings as schema.org JobPosting in <script type="application/ld+json">.
+Such payloads are found with a regex over the raw bytes and read with one
+json.loads each, so no DOM is built. They often hold fields the rendered
+cards leave out, such as the exact posting date and salary.
+
+The job_fields_from_* functions map a payload record to the standard job
+fields, with the record's own ID or URL slug as 'key'; BaseScraper turns
+those into a job dict.
+"""
+import json
+import logging
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from scraper.feeds import parse_feed_date
+
+logger = logging.getLogger('scraper')
+
+NEXT_DATA = 'next_data'
+LD_JSON = 'ld_json'
+
+_SCRIPT = re.compile(rb'<script\b([^>]*)>(.*?)</script\s*>', re.IGNORECASE | re.DOTALL)
+_NEXT_DATA_ATTR = re.compile(rb'\bid\s*=\s*["\']__NEXT_DATA__["\']', re.IGNORECASE)
+_LD_JSON_ATTR = re.compile(rb'\btype\s*=\s*["\']application/ld\+json["\']', re.IGNORECASE)
+
+# Keys tried in order when mapping a __NEXT_DATA__ job record
+ID_KEYS = ('id', 'jobId', 'job_id', 'uuid', 'slug')
+TITLE_KEYS = ('title', 'jobTitle', 'job_title')
+DESCRIPTION_KEYS = ('description', 'summary', 'snippet', 'descriptionHtml')
+URL_KEYS = ('url', 'link', 'href', 'jobUrl', 'applyUrl')
+COMPANY_KEYS = ('company', 'companyName', 'company_name', 'employer', 'client', 'hiringOrganization')
+POSTED_KEYS = ('datePosted', 'postedAt', 'posted_at', 'publishedAt', 'published_at', 'createdAt', 'created_at')
+SALARY_KEYS = ('salary', 'baseSalary', 'budget', 'compensation')
+
+
+def iter_script_payloads(content: bytes, encoding: Optional[str] = None) -> Iterator[Tuple[str, Any]]:
+    """
+    Yield (kind, data) for each __NEXT_DATA__ or ld+json script in a page.
+
+    Scripts whose body is not valid JSON are skipped.
+    """
+    if b'__NEXT_DATA__' not in content and b'ld+json' not in content:
+        return
+    for match in _SCRIPT.finditer(content):
+        attrs = match.group(1)
+        if _NEXT_DATA_ATTR.search(attrs):
+            kind = NEXT_DATA
+        elif _LD_JSON_ATTR.search(attrs):
+            kind = LD_JSON
+        else:
+            continue
+        try:
+            yield kind, json.loads(match.group(2).decode(encoding or 'utf-8', errors='replace'))
+        except ValueError as e:
+            logger.debug(f"Skipping unparseable {kind} script: {e}")
+
+
+def _is_type(node: Dict, type_name: str) -> bool:
+    node_type = node.get('@type')
+    return node_type == type_name or (isinstance(node_type, list) and type_name in node_type)
+
+
+def iter_job_postings(data: Any) -> Iterator[Dict]:
+    """Yield the schema.org JobPosting objects in an ld+json payload, including @graph and ItemList members."""
+    if isinstance(data, list):
+        for node in data:
+            yield from iter_job_postings(node)
+    elif isinstance(data, dict):
+        if _is_type(data, 'JobPosting'):
+            yield data
+        elif '@graph' in data:
+            yield from iter_job_postings(data['@graph'])
+        elif _is_type(data, 'ItemList') or _is_type(data, 'ListItem'):
+            yield from iter_job_postings(data.get('itemListElement') or data.get('item') or [])
+
+
+def _first(record: Dict, keys: Tuple[str, ...]) -> Any:
+    for key in keys:
+        value = record.get(key)
+        if value not in (None, '', [], {}):
+            return value
+    return None
+
+
+def _text(value: Any) -> str:
+    """Plain value, or the name/value of a schema.org-style object; lists are joined."""
+    if isinstance(value, list):
+        return ', '.join(text for text in (_text(item) for item in value) if text)
+    if isinstance(value, dict):
+        value = value.get('name') or value.get('value') or ''
+    return str(value).strip() if value is not None else ''
+
+
+def _posted_at(value: Any) -> str:
+    """ISO timestamp from an ISO/RFC 822 string or a Unix timestamp in seconds or milliseconds."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        seconds = value / 1000 if value > 1e11 else value
+        try:
+            return datetime.fromtimestamp(seconds, tz=timezone.utc).isoformat()
+        except (OverflowError, OSError, ValueError):
+            return ''
+    posted = parse_feed_date(str(value)) if value else None
+    return posted.isoformat() if posted else ''
+
+
+def _salary(value: Any) -> Any:
+    """Flatten a schema.org MonetaryAmount; other salary values are kept as published."""
+    if not isinstance(value, dict) or not _is_type(value, 'MonetaryAmount'):
+        return value if value not in (None, '') else None
+    amount = value.get('value')
+    salary = {'currency': value.get('currency', '')}
+    if isinstance(amount, dict):
+        salary.update(min=amount.get('minValue'), max=amount.get('maxValue'), amount=amount.get('value'),
+                      unit=amount.get('unitText', ''))
+    else:
+        salary['amount'] = amount
+    return {key: item for key, item in salary.items() if item not in (None, '')}
+
+
+def _identifier(value: Any) -> str:
+    """
+    ID from a plain value or a schema.org PropertyValue.
+
+    A PropertyValue's name is the issuer (e.g. the employer), not the ID, so only its value counts.
+    """
+    if isinstance(value, list):
+        return next((key for key in (_identifier(item) for item in value) if key), '')
+    if isinstance(value, dict):
+        value = value.get('value')
+        if isinstance(value, (dict, list)):
+            return ''
+    return str(value).strip() if value is not None else ''
+
+
+def _key_from_url(url: str) -> str:
+    return url.rstrip('/').split('/')[-1] if url else ''
+
+
+def _location(value: Any) -> str:
+    """Locality (or region, or country) of a schema.org Place or list of Places."""
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, dict):
+        address = value.get('address', value)
+        if isinstance(address, dict):
+            return _text(address.get('addressLocality') or address.get('addressRegion')
+                         or address.get('addressCountry'))
+        return _text(address)
+    return _text(value)
+
+
+def job_fields_from_posting(posting: Dict) -> Dict:
+    """Map a schema.org JobPosting to job fields."""
+    url = _text(posting.get('url'))
+    return {
+        'key': _identifier(posting.get('identifier')) or _key_from_url(url),
+        'title': _text(posting.get('title')),
+        'description': _text(posting.get('description')),
+        'url': url,
+        'company_name': _text(posting.get('hiringOrganization')),
+        'posted_at': _posted_at(posting.get('datePosted')),
+        'salary': _salary(posting.get('baseSalary')),
+        'employment_type': _text(posting.get('employmentType')),
+        'location': _location(posting.get('jobLocation')) or _text(posting.get('jobLocationType')),
+    }
+
+
+def job_fields_from_record(record: Dict) -> Dict:
+    """Map a job record from a __NEXT_DATA__ payload to job fields, by common key names."""
+    if _is_type(record, 'JobPosting'):
+        return job_fields_from_posting(record)
+    url = _text(_first(record, URL_KEYS))
+    return {
+        'key': _identifier(_first(record, ID_KEYS)) or _key_from_url(url),
+        'title': _text(_first(record, TITLE_KEYS)),
+        'description': _text(_first(record, DESCRIPTION_KEYS)),
+        'url': url,
+        'company_name': _text(_first(record, COMPANY_KEYS)),
+        'posted_at': _posted_at(_first(record, POSTED_KEYS)),
+        'salary': _salary(_first(record, SALARY_KEYS)),
+    }
+
+
+def _looks_like_job(node: Any) -> bool:
+    """A title, an ID or URL, and at least one job detail; rules out menus and tag lists."""
+    if not isinstance(node, dict) or _is_type(node, 'JobPosting'):
+        return isinstance(node, dict)
+    return (_first(node, TITLE_KEYS) is not None
+            and (_first(node, ID_KEYS) is not None or _first(node, URL_KEYS) is not None)
+            and any(_first(node, keys) is not None for keys in (DESCRIPTION_KEYS, COMPANY_KEYS, POSTED_KEYS)))
+
+
+def find_job_records(data: Any, path: Optional[Tuple[str, ...]] = None) -> List[Dict]:
+    """
+    Return the job records in a __NEXT_DATA__ payload.
+
+    Args:
+        data: Parsed payload
+        path: Keys leading to the job list, e.g. ('props', 'pageProps', 'jobs').
+            If None, the longest list of job-like objects anywhere in the
+            payload is used.
+    """
+    if path is not None:
+        for key in path:
+            if not isinstance(data, dict):
+                return []
+            data = data.get(key)
+        return [record for record in data or [] if isinstance(record, dict)] if isinstance(data, list) else []
+
+    best = []
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            # Lists that do not start with a job are not job lists; skip scanning them
+            if node and len(node) > len(best) and _looks_like_job(node[0]):
+                jobs = [item for item in node if _looks_like_job(item)]
+                if len(jobs) * 2 >= len(node):
+                    best = jobs
+            stack.extend(item for item in node if isinstance(item, (dict, list)))
+    return best
@@ -0,0 +1,246 @@
+"""
+Declarative field extraction with pluggable HTML parser backends.
+
+Each portal declares its job fields once as a FieldSet. A Field is an ordered
+list of CSS selectors: the first selector matching an element inside the job
+container wins, and the field's value is that element's text or one of its
+attributes. A Field with no selectors reads the container itself.
+
+Selectors are compiled when they are declared, i.e. at import time: to an
+lxml XPath for the lxml backend and a soupsieve matcher for the bs4 backend.
+selectolax compiles CSS natively.
+
+Backends:
+    lxml:       default; containers are lxml elements straight from the pull parser
+    bs4:        containers are BeautifulSoup Tags
+    selectolax: Lexbor tree, requires the optional selectolax package
+"""
+import logging
+import threading
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import soupsieve
+from bs4 import BeautifulSoup
+from cssselect import HTMLTranslator
+from lxml import etree
+
+from scraper.parsing import ContainerSpec, decode_content, find_containers, iter_containers
+
+logger = logging.getLogger('scraper')
+
+DEFAULT_BACKEND = 'lxml'
+
+_translator = HTMLTranslator()
+
+
+class Selector:
+    """A CSS selector compiled once for every backend."""
+
+    def __init__(self, css: str):
+        self.css = css
+        self.xpath = etree.XPath(_translator.css_to_xpath(css, prefix='descendant::'))
+        self.soup = soupsieve.compile(css)
+
+    def __repr__(self):
+        return f"Selector({self.css!r})"
+
+
+@lru_cache(maxsize=None)
+def compile_selector(css: str) -> Selector:
+    """Compile a selector, reusing earlier compilations of the same CSS."""
+    return Selector(css)
+
+
+class Field:
+    """
+    One job field: ordered selector fallbacks plus how to read the match.
+
+    Args:
+        *selectors: CSS selectors tried in order; none means the container itself
+        attr: Read this attribute instead of the element text
+        max_length: Truncate the value to this many characters
+        separator: Joins text nodes when reading element text
+    """
+
+    def __init__(self, *selectors: str, attr: Optional[str] = None, max_length: Optional[int] = None,
+                 separator: str = ''):
+        self.selectors = [compile_selector(css) for css in selectors]
+        self.attr = attr
+        self.max_length = max_length
+        self.separator = separator
+
+
+class FieldSet:
+    """A portal's named Fields, e.g. FieldSet(title=Field('h2.job-title', 'h3'), ...)."""
+
+    def __init__(self, **fields: Field):
+        self.fields = fields
+
+    def extract(self, node, backend: 'ParserBackend') -> Dict[str, str]:
+        """Extract every field from a job container; missing fields are ''."""
+        return {name: backend.extract(node, field) for name, field in self.fields.items()}
+
+
+class ParserBackend:
+    """Tree operations the extraction code needs, implemented per parser."""
+
+    name = ''
+
+    def iter_containers(self, content: bytes, specs: Dict[str, ContainerSpec],
+                        encoding: Optional[str] = None) -> Iterator[Tuple[str, object]]:
+        raise NotImplementedError
+
+    def find_containers(self, content: bytes, spec: ContainerSpec, encoding: Optional[str] = None) -> List:
+        raise NotImplementedError
+
+    def document(self, content: bytes, encoding: Optional[str] = None):
+        """Parse a whole page and return its root node, or None if it is empty."""
+        raise NotImplementedError
+
+    def select(self, node, selector: Selector) -> List:
+        raise NotImplementedError
+
+    def select_first(self, node, selector: Selector):
+        matches = self.select(node, selector)
+        return matches[0] if matches else None
+
+    def text(self, node, separator: str = '') -> str:
+        """Text content with each text node stripped, like BeautifulSoup's get_text(strip=True)."""
+        raise NotImplementedError
+
+    def attr(self, node, name: str) -> str:
+        raise NotImplementedError
+
+    def extract(self, node, field: Field) -> str:
+        match = node if not field.selectors else None
+        for selector in field.selectors:
+            match = self.select_first(node, selector)
+            if match is not None:
+                break
+        if match is None:
+            return ''
+        value = self.attr(match, field.attr) if field.attr else self.text(match, field.separator)
+        return value[:field.max_length] if field.max_length else value
+
+
+class LxmlBackend(ParserBackend):
+    """Compiled XPath over lxml elements; no BeautifulSoup objects are built."""
+
+    name = 'lxml'
+    _text_nodes = etree.XPath('.//text()')
+
+    def iter_containers(self, content, specs, encoding=None):
+        return iter_containers(content, specs, encoding, to_soup=False)
+
+    def find_containers(self, content, spec, encoding=None):
+        root = self.document(content, encoding)
+        if root is None:
+            return []
+        return compile_selector(spec.css()).xpath(root)
+
+    def document(self, content, encoding=None):
+        return etree.fromstring(content, etree.HTMLParser(encoding=encoding)) if content else None
+
+    def select(self, node, selector):
+        return selector.xpath(node)
+
+    def text(self, node, separator=''):
+        return separator.join(s for s in (t.strip() for t in self._text_nodes(node)) if s)
+
+    def attr(self, node, name):
+        return node.get(name) or ''
+
+
+class SoupBackend(ParserBackend):
+    """BeautifulSoup Tags matched with precompiled soupsieve selectors."""
+
+    name = 'bs4'
+
+    def iter_containers(self, content, specs, encoding=None):
+        return iter_containers(content, specs, encoding, to_soup=True)
+
+    def find_containers(self, content, spec, encoding=None):
+        return find_containers(content, spec, encoding)
+
+    def document(self, content, encoding=None):
+        return BeautifulSoup(content, 'lxml', from_encoding=encoding) if content else None
+
+    def select(self, node, selector):
+        return selector.soup.select(node)
+
+    def select_first(self, node, selector):
+        return selector.soup.select_one(node)
+
+    def text(self, node, separator=''):
+        return node.get_text(separator=separator, strip=True)
+
+    def attr(self, node, name):
+        value = node.get(name) or ''
+        # Multi-valued attributes such as class come back as lists
+        return ' '.join(value) if isinstance(value, list) else value
+
+
+def _import_lexbor():
+    try:
+        from selectolax.lexbor import LexborHTMLParser
+    except ImportError as e:
+        raise ImportError("parser_backend='selectolax' requires selectolax (pip install selectolax)") from e
+    return LexborHTMLParser
+
+
+class SelectolaxBackend(ParserBackend):
+    """Lexbor (selectolax) tree; CSS is compiled and matched in C."""
+
+    name = 'selectolax'
+
+    def __init__(self):
+        self._parser_class = _import_lexbor()
+
+    def _tree(self, content: bytes, encoding: Optional[str]):
+        return self._parser_class(decode_content(content, encoding))
+
+    def iter_containers(self, content, specs, encoding=None):
+        tree = self._tree(content, encoding)
+        for name, spec in specs.items():
+            for node in tree.css(spec.css()):
+                yield name, node
+
+    def find_containers(self, content, spec, encoding=None):
+        return self._tree(content, encoding).css(spec.css())
+
+    def document(self, content, encoding=None):
+        return self._tree(content, encoding).root if content else None
+
+    def select(self, node, selector):
+        return node.css(selector.css)
+
+    def select_first(self, node, selector):
+        return node.css_first(selector.css)
+
+    def text(self, node, separator=''):
+        return node.text(deep=True, separator=separator, strip=True)
+
+    def attr(self, node, name):
+        return node.attributes.get(name) or ''
+
+
+BACKENDS = {
+    'lxml': LxmlBackend,
+    'bs4': SoupBackend,
+    'selectolax': SelectolaxBackend,
+}
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def get_backend(name: Optional[str] = None) -> ParserBackend:
+    """Return the shared instance of a parser backend (default: DEFAULT_BACKEND)."""
+    name = name or DEFAULT_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown parser backend: {name}")
+    with _backends_lock:
+        if name not in _backends:
+            _backends[name] = BACKENDS[name]()
+        return _backends[name]
@@ -0,0 +1,166 @@
+"""
+Streaming RSS, Atom and sitemap parsing for feed discovery.
+
+Portals that publish a feed (BaseScraper.FEED_PATHS) can be read from it
+instead of their listing pages: a feed is a fraction of the bytes, and its
+entries carry a stable GUID and an exact publish date. Documents are parsed
+with lxml's pull parser as chunks arrive and finished entries are cleared,
+so memory stays around one entry rather than one document.
+
+Sitemap <url> entries only carry a location and a lastmod date, so their
+title is derived from the URL slug.
+"""
+import logging
+import re
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Iterable, Iterator, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+
+from lxml import etree
+
+logger = logging.getLogger('scraper')
+
+# (parent, element) local names of an entry in each format
+ENTRY_ELEMENTS = {
+    ('channel', 'item'): 'rss',
+    ('RDF', 'item'): 'rss',
+    ('feed', 'entry'): 'atom',
+    ('urlset', 'url'): 'sitemap',
+}
+
+_SLUG_SEPARATORS = re.compile(r'[-_+]+')
+
+
+class FeedEntry(NamedTuple):
+    """One RSS item, Atom entry or sitemap URL."""
+    guid: str
+    title: str
+    link: str
+    published: Optional[datetime]
+    summary: str = ''                   # HTML as published
+    author: str = ''
+    categories: Tuple[str, ...] = ()
+
+
+def parse_feed_date(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO 8601 (Atom, sitemap) or RFC 822 (RSS) date; naive dates are taken as UTC."""
+    value = (value or '').strip()
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            logger.debug(f"Unparseable feed date: {value}")
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def title_from_url(url: str) -> str:
+    """'/remote-jobs/senior-ml-engineer-1234' -> 'Senior Ml Engineer'."""
+    slug = urlsplit(url).path.rstrip('/').rsplit('/', 1)[-1].split('.')[0]
+    words = [word for word in _SLUG_SEPARATORS.split(slug) if word and not word.isdigit()]
+    return ' '.join(words).title()
+
+
+def _localname(elem) -> str:
+    tag = elem.tag
+    return tag.rsplit('}', 1)[-1] if isinstance(tag, str) else ''
+
+
+def _children(elem, *names: str) -> Iterator:
+    for child in elem:
+        if _localname(child) in names:
+            yield child
+
+
+def _child_text(elem, *names: str) -> str:
+    """Text of the first child with one of the local names, in order of preference."""
+    for name in names:
+        for child in _children(elem, name):
+            text = ''.join(child.itertext()).strip()
+            if text:
+                return text
+    return ''
+
+
+def _atom_link(elem) -> str:
+    links = list(_children(elem, 'link'))
+    for link in links:
+        if link.get('rel', 'alternate') == 'alternate' and link.get('href'):
+            return link.get('href')
+    return links[0].get('href', '') if links else ''
+
+
+def _entry(kind: str, elem) -> FeedEntry:
+    if kind == 'rss':
+        link = _child_text(elem, 'link')
+        return FeedEntry(
+            guid=_child_text(elem, 'guid') or link,
+            title=_child_text(elem, 'title'),
+            link=link,
+            published=parse_feed_date(_child_text(elem, 'pubDate', 'date')),
+            summary=_child_text(elem, 'encoded', 'description'),
+            author=_child_text(elem, 'creator', 'author'),
+            categories=tuple(''.join(c.itertext()).strip() for c in _children(elem, 'category')),
+        )
+    if kind == 'atom':
+        author = next(_children(elem, 'author'), None)
+        link = _atom_link(elem)
+        return FeedEntry(
+            guid=_child_text(elem, 'id') or link,
+            title=_child_text(elem, 'title'),
+            link=link,
+            published=parse_feed_date(_child_text(elem, 'published', 'updated')),
+            summary=_child_text(elem, 'content', 'summary'),
+            author=_child_text(author, 'name') if author is not None else '',
+            categories=tuple(c.get('term', '') for c in _children(elem, 'category')),
+        )
+    link = _child_text(elem, 'loc')
+    return FeedEntry(
+        guid=link,
+        title=title_from_url(link),
+        link=link,
+        published=parse_feed_date(_child_text(elem, 'lastmod')),
+    )
+
+
+def iter_feed_entries(chunks: Iterable[bytes], encoding: Optional[str] = None) -> Iterator[FeedEntry]:
+    """
+    Incrementally yield the entries of an RSS, Atom or sitemap document.
+
+    Args:
+        chunks: Body chunks, e.g. FetchStream.iter_content()
+        encoding: Charset from the response headers; overrides the XML declaration
+
+    Raises:
+        lxml.etree.XMLSyntaxError: If the document is not well-formed XML
+    """
+    parser = etree.XMLPullParser(events=('end',), encoding=encoding, resolve_entities=False, no_network=True)
+
+    def drain():
+        for _, elem in parser.read_events():
+            parent = elem.getparent()
+            if parent is None:
+                continue
+            kind = ENTRY_ELEMENTS.get((_localname(parent), _localname(elem)))
+            if kind is None:
+                continue
+            entry = _entry(kind, elem)
+            # Free the finished entry and the siblings before it
+            elem.clear(keep_tail=True)
+            while elem.getprevious() is not None:
+                del parent[0]
+            if entry.link or entry.guid:
+                yield entry
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from drain()
+    parser.close()
+    yield from drain()
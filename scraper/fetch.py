@@ -0,0 +1,641 @@
+"""
+HTTP fetch layer shared by the portal scrapers.
+"""
+import asyncio
+import hashlib
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, Iterator, Optional
+from urllib.parse import urlsplit
+
+import zlib
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+logger = logging.getLogger('scraper')
+
+# urllib3 advertises br/zstd only when brotli/zstandard are installed and it can decode them
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Encoding': ACCEPT_ENCODING,
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Referer': 'https://www.google.com/',
+}
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+class ConnectionPool:
+    """
+    Long-lived keep-alive connection pool shared by every scraper in the process.
+    
+    Wraps one requests.Session whose adapters keep up to `pool_maxsize` open
+    connections per host, so DNS lookups and TCP/TLS handshakes are paid once
+    per host instead of once per scrape run. Scrapers borrow the session and
+    must not close it.
+    """
+
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 10, timeout: int = 10):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def prewarm(self, urls: Iterable[str]) -> Dict[str, bool]:
+        """
+        Open a connection to each URL's host ahead of a run.
+        
+        Returns:
+            Dictionary mapping host to whether the warm-up request succeeded
+        """
+        warmed = {}
+        for url in urls:
+            parts = urlsplit(url)
+            host = parts.netloc
+            if not host or host in warmed:
+                continue
+            try:
+                self.session.head(f"{parts.scheme}://{host}/", timeout=self.timeout, allow_redirects=False)
+                warmed[host] = True
+            except requests.RequestException as e:
+                logger.warning(f"Pre-warm failed for {host}: {e}")
+                warmed[host] = False
+        logger.info(f"Pre-warmed connections to {sum(warmed.values())}/{len(warmed)} hosts")
+        return warmed
+
+    def close(self):
+        """Close all pooled connections."""
+        self.session.close()
+
+
+_shared_pool = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_pool(**kwargs) -> ConnectionPool:
+    """
+    Return the process-wide ConnectionPool, creating it on first use.
+    
+    Keyword arguments are passed to ConnectionPool and only take effect on
+    the call that creates the pool.
+    """
+    global _shared_pool
+    with _shared_lock:
+        if _shared_pool is None:
+            _shared_pool = ConnectionPool(**kwargs)
+        return _shared_pool
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket for one host.
+    
+    Callers reserve a token and get back how long to wait before sending,
+    so the same bucket serves both blocking threads and coroutines.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return the delay in seconds before it may be used."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(delay, self._blocked_until - now)
+
+    def set_rate(self, rate: float, burst: int):
+        """Change the refill rate and bucket size; tokens already earned are kept up to the new size."""
+        with self._lock:
+            if (rate, burst) == (self.rate, self.burst):
+                return
+            now = time.monotonic()
+            self._tokens = min(burst, self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self.rate = rate
+            self.burst = burst
+
+    def block_for(self, seconds: float):
+        """Hold every request for this host for the given number of seconds."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RateLimiter:
+    """
+    Per-host token-bucket rate limiter shared by all scrapers.
+    
+    Requests to different hosts never wait on each other; requests to one
+    host are spaced to that host's rate, with up to `burst` sent back to back.
+    CrawlFrontier prefetches no more pages of a host than its burst, so the
+    default burst covers the frontier's default concurrency; the average rate
+    is unchanged.
+    """
+
+    RETRY_STATUSES = (429, 503)
+
+    def __init__(self, default_rate: float = 1.0, default_burst: int = 3,
+                 host_limits: Optional[Dict[str, tuple]] = None):
+        """
+        Args:
+            default_rate: Requests per second for hosts without an explicit limit
+            default_burst: Bucket size for hosts without an explicit limit
+            host_limits: Mapping of host to (rate, burst)
+        """
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self.host_limits = dict(host_limits or {})
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url: str) -> TokenBucket:
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._buckets:
+                rate, burst = self.host_limits.get(host, (self.default_rate, self.default_burst))
+                self._buckets[host] = TokenBucket(rate, burst)
+            return self._buckets[host]
+
+    def apply_crawl_delay(self, url: str, seconds: Optional[float]):
+        """
+        Space requests to url's host at least `seconds` apart, as its robots.txt asks.
+
+        The configured rate still applies when it is slower; None restores it.
+        """
+        host = urlsplit(url).netloc
+        rate, burst = self.host_limits.get(host, (self.default_rate, self.default_burst))
+        if seconds and seconds > 0 and 1 / seconds < rate:
+            rate, burst = 1 / seconds, 1
+        self.bucket(url).set_rate(rate, burst)
+
+    def wait(self, url: str):
+        """Block the calling thread until a request to url's host is allowed."""
+        delay = self.bucket(url).reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def wait_async(self, url: str):
+        """Suspend the calling coroutine until a request to url's host is allowed."""
+        delay = self.bucket(url).reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def observe(self, url: str, status_code: int, headers):
+        """Honour Retry-After on 429/503 responses by pausing the host."""
+        if status_code not in self.RETRY_STATUSES:
+            return
+        seconds = parse_retry_after(headers.get('Retry-After'))
+        if seconds:
+            logger.warning(f"{urlsplit(url).netloc} asked to retry after {seconds:.0f}s")
+            self.bucket(url).block_for(seconds)
+
+
+_shared_rate_limiter = None
+
+
+def get_shared_rate_limiter(**kwargs) -> RateLimiter:
+    """
+    Return the process-wide RateLimiter, creating it on first use.
+    
+    Keyword arguments are passed to RateLimiter and only take effect on
+    the call that creates the limiter.
+    """
+    global _shared_rate_limiter
+    with _shared_lock:
+        if _shared_rate_limiter is None:
+            _shared_rate_limiter = RateLimiter(**kwargs)
+        return _shared_rate_limiter
+
+
+class RetryPolicy:
+    """
+    Jittered exponential backoff for transient failures.
+    
+    Attempt n (0-based) waits a random time between 0 and
+    min(backoff_max, backoff_base * 2 ** n) seconds ("full jitter").
+    """
+
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(self, max_attempts: int = 3, backoff_base: float = 0.5, backoff_max: float = 8.0,
+                 retry_statuses: Iterable[int] = RETRY_STATUSES):
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = tuple(retry_statuses)
+
+    def should_retry(self, attempt: int, status_code: Optional[int] = None) -> bool:
+        """Whether a failed attempt (exception if status_code is None) gets another try."""
+        if attempt + 1 >= self.max_attempts:
+            return False
+        return status_code is None or status_code in self.retry_statuses
+
+    def delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of fetching while a portal's circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Per-portal circuit breaker.
+    
+    closed: requests flow; consecutive failures are counted.
+    open: after `failure_threshold` consecutive failures, requests are refused
+          for `cooldown_seconds`.
+    half_open: after the cool-down one trial request is let through; success
+          closes the breaker, failure opens it again.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, failure_threshold: int = 3, cooldown_seconds: float = 900):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.cooldown_seconds:
+                self._state = self.HALF_OPEN
+                self._trial_in_flight = False
+            return self._state
+
+    def allow(self) -> bool:
+        """Return True if a request may be sent now."""
+        state = self.state
+        with self._lock:
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning(f"Circuit breaker for {self.name} opened after {self._failures} failures")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+    def snapshot(self) -> Dict:
+        """State summary for run results."""
+        state = self.state
+        with self._lock:
+            retry_in = 0.0
+            if state == self.OPEN:
+                retry_in = max(0.0, self.cooldown_seconds - (time.monotonic() - self._opened_at))
+            return {
+                'state': state,
+                'consecutive_failures': self._failures,
+                'retry_in_seconds': round(retry_in, 1),
+            }
+
+
+_circuit_breakers = {}
+
+
+def get_circuit_breaker(name: str, **kwargs) -> CircuitBreaker:
+    """
+    Return the process-wide CircuitBreaker for a portal, creating it on first use.
+    
+    Keyword arguments are passed to CircuitBreaker and only take effect on
+    the call that creates the breaker.
+    """
+    with _shared_lock:
+        if name not in _circuit_breakers:
+            _circuit_breakers[name] = CircuitBreaker(name, **kwargs)
+        return _circuit_breakers[name]
+
+
+class FetchError(Exception):
+    """Raised when a fetched page has an error status."""
+
+
+class FetchResult:
+    """
+    Minimal response object returned by the fetch layer.
+    
+    wire_bytes is the size as transferred (before content decoding) when
+    known; truncated is set when the body was cut at the byte limit.
+    """
+
+    def __init__(self, url: str, status_code: int, headers: Dict[str, str], content: bytes,
+                 wire_bytes: Optional[int] = None, truncated: bool = False):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.wire_bytes = wire_bytes
+        self.truncated = truncated
+
+    @property
+    def decoded_bytes(self) -> int:
+        return len(self.content)
+
+    def iter_content(self, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> Iterator[bytes]:
+        """Yield the already downloaded body in chunks, like FetchStream.iter_content()."""
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    @property
+    def compression_ratio(self) -> Optional[float]:
+        """Decoded size divided by transferred size."""
+        if not self.wire_bytes:
+            return None
+        return round(len(self.content) / self.wire_bytes, 2)
+
+    def raise_for_status(self):
+        """Raise FetchError for 4xx/5xx responses, like requests does."""
+        if self.status_code >= 400:
+            raise FetchError(f"{self.status_code} Error for url: {self.url}")
+
+
+class FetchStream:
+    """
+    A response whose body has not been read yet, from open_download().
+    
+    iter_content() yields decoded chunks and stops at max_bytes. The connection
+    is released when the body has been read or on close(), after which
+    wire_bytes, decoded_bytes, truncated and digest are final.
+    """
+
+    def __init__(self, response: requests.Response, max_bytes: int):
+        self._response = response
+        self.url = response.url
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.max_bytes = max_bytes
+        self.wire_bytes = None
+        self.decoded_bytes = 0
+        self.truncated = False
+        self._hash = hashlib.sha256()
+
+    @property
+    def digest(self) -> str:
+        """SHA-256 hex digest of the body read so far (see scraper.state.content_digest)."""
+        return self._hash.hexdigest()
+
+    @property
+    def compression_ratio(self) -> Optional[float]:
+        if not self.wire_bytes:
+            return None
+        return round(self.decoded_bytes / self.wire_bytes, 2)
+
+    def iter_content(self, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> Iterator[bytes]:
+        try:
+            for chunk in self._response.iter_content(chunk_size=chunk_size):
+                # Only a body longer than max_bytes is truncated; one of exactly max_bytes is complete
+                if self.decoded_bytes + len(chunk) > self.max_bytes:
+                    chunk = chunk[:self.max_bytes - self.decoded_bytes]
+                    self.truncated = True
+                if chunk:
+                    self.decoded_bytes += len(chunk)
+                    self._hash.update(chunk)
+                    yield chunk
+                if self.truncated:
+                    logger.warning(f"Stopped download of {self.url} at the {self.max_bytes} byte limit")
+                    break
+        finally:
+            self.close()
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            self.close()
+            raise FetchError(f"{self.status_code} Error for url: {self.url}")
+
+    def close(self):
+        """Release the connection; the body counts as read up to here."""
+        if self.wire_bytes is None:
+            self.wire_bytes = self._response.raw.tell()
+        self._response.close()
+
+
+def open_download(session: requests.Session, url: str, max_bytes: int, **kwargs) -> FetchStream:
+    """
+    Send a GET and return once the headers have arrived, leaving the body to be streamed.
+    
+    Keyword arguments are passed to session.get (headers, timeout, ...).
+    """
+    return FetchStream(session.get(url, stream=True, **kwargs), max_bytes)
+
+
+def download(session: requests.Session, url: str, max_bytes: int, **kwargs) -> FetchResult:
+    """
+    Stream a GET response, decoding as it arrives and stopping at max_bytes.
+    
+    Keyword arguments are passed to session.get (headers, timeout, ...).
+    """
+    stream = open_download(session, url, max_bytes, **kwargs)
+    content = b''.join(stream.iter_content())
+    return FetchResult(stream.url, stream.status_code, stream.headers, content,
+                       wire_bytes=stream.wire_bytes, truncated=stream.truncated)
+
+
+class StreamDecoder:
+    """Incremental Content-Encoding decoder for the async fetch path."""
+
+    def __init__(self, encoding: Optional[str]):
+        encoding = (encoding or '').strip().lower()
+        self._decoder = None
+        if encoding in ('gzip', 'x-gzip'):
+            self._decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif encoding == 'deflate':
+            self._decoder = zlib.decompressobj()
+        elif encoding == 'br':
+            try:
+                import brotli
+            except ImportError:
+                import brotlicffi as brotli
+            self._decoder = brotli.Decompressor()
+        elif encoding == 'zstd':
+            import zstandard
+            self._decoder = zstandard.ZstdDecompressor().decompressobj()
+        elif encoding not in ('', 'identity'):
+            raise FetchError(f"Unsupported Content-Encoding: {encoding}")
+
+    def decode(self, chunk: bytes) -> bytes:
+        if self._decoder is None:
+            return chunk
+        if hasattr(self._decoder, 'decompress'):
+            return self._decoder.decompress(chunk)
+        return self._decoder.process(chunk)
+
+
+def _import_aiohttp():
+    try:
+        import aiohttp
+    except ImportError as e:
+        raise ImportError("fetch_mode='async' requires aiohttp (pip install aiohttp)") from e
+    return aiohttp
+
+
+class AsyncFetcher:
+    """
+    Runs page requests as coroutines on one event loop.
+
+    A global semaphore caps the number of requests in flight and a
+    semaphore per host keeps any single portal from being flooded.
+    Use as an async context manager:
+
+        async with AsyncFetcher(max_concurrency=32, per_host_limit=4) as fetcher:
+            result = await fetcher.get(url)
+    """
+
+    def __init__(self, max_concurrency: int = 32, per_host_limit: int = 4, timeout: int = 10,
+                 headers: Optional[Dict[str, str]] = None, cache=None,
+                 rate_limiter: Optional[RateLimiter] = None, retry_policy: Optional[RetryPolicy] = None):
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.headers = dict(headers or DEFAULT_HEADERS)
+        self._session = None
+        self._semaphore = None
+        self._host_semaphores = {}
+
+    async def __aenter__(self):
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._host_semaphores = {}
+        if self.cache is not None and self.cache.replay:
+            # Strict replay never opens a network session
+            return self
+        aiohttp = _import_aiohttp()
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency, limit_per_host=self.per_host_limit)
+        # Decode bodies ourselves so transferred bytes can be measured and capped
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            headers=self.headers,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            auto_decompress=False,
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """Close the underlying client session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_semaphores[host]
+
+    async def _read(self, url: str, response, max_bytes: int) -> FetchResult:
+        decoder = StreamDecoder(response.headers.get('Content-Encoding'))
+        chunks, size, wire_bytes, truncated = [], 0, 0, False
+        async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+            wire_bytes += len(chunk)
+            decoded = decoder.decode(chunk)
+            chunks.append(decoded)
+            size += len(decoded)
+            if size > max_bytes:
+                truncated = True
+                break
+
+        content = b''.join(chunks)
+        if truncated:
+            logger.warning(f"Stopped download of {url} at the {max_bytes} byte limit")
+            content = content[:max_bytes]
+        return FetchResult(str(response.url), response.status, dict(response.headers), content,
+                           wire_bytes=wire_bytes, truncated=truncated)
+
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None,
+                  max_bytes: int = 5 * 1024 * 1024) -> FetchResult:
+        """Fetch a URL, waiting for both the global and the per-host slot."""
+        if self.cache is not None:
+            cached = await asyncio.to_thread(self.cache.get, url, headers)
+            if cached is not None:
+                return cached
+
+        attempt = 0
+        while True:
+            # Wait for the host's token before taking a slot, so a slow host never holds global slots
+            if self.rate_limiter is not None:
+                await self.rate_limiter.wait_async(url)
+
+            try:
+                async with self._semaphore, self._host_semaphore(url):
+                    logger.debug(f"Async fetch: {url}")
+                    async with self._session.get(url, headers=headers) as response:
+                        result = await self._read(url, response, max_bytes)
+            except (OSError, asyncio.TimeoutError, _import_aiohttp().ClientError) as e:
+                if not self.retry_policy.should_retry(attempt):
+                    raise
+                logger.warning(f"Retrying {url} after error: {e}")
+            else:
+                if self.rate_limiter is not None:
+                    self.rate_limiter.observe(url, result.status_code, result.headers)
+                if not self.retry_policy.should_retry(attempt, result.status_code):
+                    break
+                logger.warning(f"Retrying {url} after HTTP {result.status_code}")
+
+            await asyncio.sleep(self.retry_policy.delay(attempt))
+            attempt += 1
+
+        if self.cache is not None:
+            await asyncio.to_thread(self.cache.put, url, result, headers)
+        return result
@@ -0,0 +1,178 @@
+"""
+Portal health registry used to skip broken sources automatically.
+"""
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+logger = logging.getLogger('scraper')
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of a list, or None if it is empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+class PortalHealthRegistry:
+    """
+    In-memory health record per portal.
+
+    Each record keeps the last REQUEST_WINDOW request samples ([ok, latency_ms])
+    and the last RUN_WINDOW run samples ([pages_fetched, jobs_parsed]).
+    A portal turns unhealthy when its HTTP success rate drops below
+    MIN_SUCCESS_RATE, or when recent runs fetched pages but parsed no jobs
+    (selector drift). Unhealthy portals are re-probed on an exponential
+    schedule starting at PROBE_BACKOFF and capped at PROBE_BACKOFF_MAX.
+    """
+
+    REQUEST_WINDOW = 50
+    RUN_WINDOW = 10
+    MIN_REQUESTS = 5
+    MIN_SUCCESS_RATE = 0.5
+    ZERO_YIELD_RUNS = 3
+    PROBE_BACKOFF = timedelta(hours=1)
+    PROBE_BACKOFF_MAX = timedelta(hours=24)
+
+    def __init__(self):
+        self._records = {}
+        self._lock = threading.Lock()
+
+    # Persistence hooks, overridden by DjangoPortalHealthRegistry
+
+    def load(self, portal: str) -> Dict:
+        with self._lock:
+            return dict(self._records.get(portal) or self._new_record())
+
+    def save(self, portal: str, record: Dict):
+        with self._lock:
+            self._records[portal] = record
+
+    @staticmethod
+    def _new_record() -> Dict:
+        return {
+            'status': 'healthy',
+            'recent_requests': [],
+            'recent_runs': [],
+            'failed_probes': 0,
+            'next_probe_at': None,
+            'last_checked_at': None,
+        }
+
+    # Metrics
+
+    def summary(self, portal: str, record: Optional[Dict] = None) -> Dict:
+        """Success rate, latency percentiles and parse yield for a portal."""
+        record = record or self.load(portal)
+        requests = record['recent_requests']
+        runs = record['recent_runs']
+        latencies = [latency for ok, latency in requests if ok]
+        pages = sum(p for p, _ in runs)
+        jobs = sum(j for _, j in runs)
+        next_probe_at = record.get('next_probe_at')
+        return {
+            'status': record['status'],
+            'success_rate': round(sum(1 for ok, _ in requests if ok) / len(requests), 3) if requests else None,
+            'latency_p50_ms': percentile(latencies, 50),
+            'latency_p95_ms': percentile(latencies, 95),
+            'parse_yield': round(jobs / pages, 2) if pages else None,
+            'next_probe_at': next_probe_at.isoformat() if next_probe_at else None,
+        }
+
+    def _is_unhealthy(self, record: Dict) -> bool:
+        requests = record['recent_requests']
+        if len(requests) >= self.MIN_REQUESTS:
+            success_rate = sum(1 for ok, _ in requests if ok) / len(requests)
+            if success_rate < self.MIN_SUCCESS_RATE:
+                return True
+        recent_runs = record['recent_runs'][-self.ZERO_YIELD_RUNS:]
+        if len(recent_runs) == self.ZERO_YIELD_RUNS and all(pages > 0 and jobs == 0 for pages, jobs in recent_runs):
+            return True
+        return False
+
+    def _schedule_probe(self, record: Dict, now: datetime):
+        backoff = min(self.PROBE_BACKOFF * (2 ** record['failed_probes']), self.PROBE_BACKOFF_MAX)
+        record['next_probe_at'] = now + backoff
+
+    def record_run(self, portal: str, stats: Dict) -> Dict:
+        """
+        Fold one scrape run's stats into the portal's record.
+
+        Args:
+            portal: Portal name
+            stats: Scraper stats with 'requests' ([ok, latency_ms] samples),
+                'pages' and 'jobs'
+
+        Returns:
+            Updated health summary
+        """
+        now = datetime.now(timezone.utc)
+        record = self.load(portal)
+        record['recent_requests'] = (record['recent_requests'] + stats.get('requests', []))[-self.REQUEST_WINDOW:]
+        if stats.get('requests'):
+            record['recent_runs'] = (record['recent_runs'] + [[stats.get('pages', 0), stats.get('jobs', 0)]])[-self.RUN_WINDOW:]
+        record['last_checked_at'] = now
+
+        if self._is_unhealthy(record):
+            if record['status'] != 'unhealthy':
+                record['status'] = 'unhealthy'
+                record['failed_probes'] = 0
+                self._schedule_probe(record, now)
+                logger.warning(f"Portal {portal} marked unhealthy: {self.summary(portal, record)}")
+        else:
+            record['status'] = 'healthy'
+            record['failed_probes'] = 0
+            record['next_probe_at'] = None
+
+        self.save(portal, record)
+        return self.summary(portal, record)
+
+    def is_healthy(self, portal: str) -> bool:
+        return self.load(portal)['status'] == 'healthy'
+
+    def probe_due(self, portal: str) -> bool:
+        """Whether an unhealthy portal is due for a re-probe."""
+        record = self.load(portal)
+        next_probe_at = record.get('next_probe_at')
+        return next_probe_at is None or next_probe_at <= datetime.now(timezone.utc)
+
+    def record_probe(self, portal: str, ok: bool):
+        """Mark a portal healthy after a successful probe, or push its next probe back."""
+        now = datetime.now(timezone.utc)
+        record = self.load(portal)
+        record['last_checked_at'] = now
+        if ok:
+            logger.info(f"Portal {portal} passed its health probe")
+            record.update(status='healthy', failed_probes=0, next_probe_at=None,
+                          recent_requests=[], recent_runs=[])
+        else:
+            record['failed_probes'] += 1
+            self._schedule_probe(record, now)
+        self.save(portal, record)
+
+
+class DjangoPortalHealthRegistry(PortalHealthRegistry):
+    """PortalHealthRegistry persisted in the portal_health table (jobs.PortalHealth)."""
+
+    FIELDS = ('status', 'recent_requests', 'recent_runs', 'failed_probes', 'next_probe_at', 'last_checked_at')
+
+    def load(self, portal: str) -> Dict:
+        from jobs.models import PortalHealth
+
+        row = PortalHealth.objects.filter(portal=portal).values(*self.FIELDS).first()
+        return row or self._new_record()
+
+    def save(self, portal: str, record: Dict):
+        from jobs.models import PortalHealth
+
+        try:
+            PortalHealth.objects.update_or_create(
+                portal=portal,
+                defaults={field: record[field] for field in self.FIELDS}
+            )
+        except Exception as e:
+            logger.error(f"Error saving health record for {portal}: {e}")
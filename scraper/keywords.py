@@ -0,0 +1,93 @@
+"""
+Whole-word keyword matching in one pass over the text.
+
+KeywordMatcher compiles a keyword list once into a trie of word tokens. The
+text is split into lowercase words with one translate() and split(), and
+each word starts at most one short walk down the trie (as deep as the
+longest keyword phrase). Matching therefore costs the same whatever the
+number of keywords, and keywords only match whole words: 'ai' does not
+match inside "said" or "email". A trailing plural 's' on a word is
+ignored, so 'neural network' matches "neural networks".
+
+Keywords are tokenized like the text: 'scikit-learn' matches "scikit-learn"
+and "scikit learn".
+"""
+import re
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+# ASCII punctuation and common Unicode dashes, quotes and bullets separate words
+_SEPARATORS = {code: ' ' for code in range(128) if not chr(code).isalnum()}
+_SEPARATORS.update((ord(char), ' ') for char in '\u2010\u2011\u2012\u2013\u2014\u2015'  # dashes
+                                                '\u2018\u2019\u201c\u201d\u2022\u2026')
+_WORD = re.compile(r'\S+')
+
+# Trie node key holding the keyword that ends at the node
+_END = ''
+
+
+def split_words(text: str) -> List[str]:
+    """Lowercase words of a text; 'Scikit-Learn, LLMs' -> ['scikit', 'learn', 'llms']."""
+    return text.lower().translate(_SEPARATORS).split()
+
+
+class KeywordMatcher:
+    """Compiled set of keywords and phrases, matched on word boundaries."""
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = []
+        self._trie = {}
+        for keyword in keywords:
+            words = split_words(keyword)
+            if not words or keyword in self.keywords:
+                continue
+            self.keywords.append(keyword)
+            # The plural of the last word is added as its own path, so matching is one lookup per word
+            last = words[-1]
+            for variant in {last, f'{last}s'} if len(last) > 2 and not last.endswith('s') else {last}:
+                node = self._trie
+                for word in words[:-1] + [variant]:
+                    node = node.setdefault(word, {})
+                node.setdefault(_END, keyword)
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def _walk(self, words: List[str]) -> Iterator[Tuple[str, int]]:
+        """Yield (keyword, index of its first word) for every occurrence in a word list."""
+        trie = self._trie
+        # Only words that start a keyword begin a walk
+        for index in [index for index, word in enumerate(words) if word in trie]:
+            node = trie[words[index]]
+            offset = index + 1
+            while node is not None:
+                if _END in node:
+                    yield node[_END], index
+                if offset == len(words):
+                    break
+                node = node.get(words[offset])
+                offset += 1
+
+    def iter_hits(self, text: str) -> Iterator[Tuple[str, int]]:
+        """Yield (keyword, character offset) for every keyword occurrence, in text order."""
+        separated = text.lower().translate(_SEPARATORS)
+        starts = None
+        for keyword, index in self._walk(separated.split()):
+            if starts is None:
+                # Offsets are only worked out for texts with a hit
+                starts = [match.start() for match in _WORD.finditer(separated)]
+            yield keyword, starts[index]
+
+    def find(self, text: str) -> Dict[str, List[int]]:
+        """Return the character offsets of each matching keyword's occurrences."""
+        hits = {}
+        for keyword, start in self.iter_hits(text):
+            hits.setdefault(keyword, []).append(start)
+        return hits
+
+    def matched(self, text: str) -> Set[str]:
+        """Return the keywords that occur in the text; cheaper than find() when offsets are not needed."""
+        return {keyword for keyword, _ in self._walk(split_words(text))}
+
+    def search(self, text: str) -> bool:
+        """Whether any keyword occurs in the text."""
+        return next(self._walk(split_words(text)), None) is not None
@@ -0,0 +1,154 @@
+"""
+Process pool for parsing listing pages off the fetch threads.
+
+Parsing is pure-Python CPU work, so fetch threads that also parse serialize
+on the GIL. With a ParsePool, a fetch thread hands the raw page bytes to a
+worker process and blocks without holding the GIL until the parsed jobs come
+back. Workers keep one scraper instance per portal and parser backend, and
+the pool is process-wide, so workers stay warm across scrape runs.
+
+Jobs travel back as compact records: a tuple of JOB_FIELDS values plus a dict
+of any other keys, which pickles smaller than one dict per job.
+"""
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger('scraper')
+
+JOB_FIELDS = ('job_id', 'title', 'description', 'url', 'company_name', 'posted_at', 'source')
+
+
+def pack_job(job: Dict) -> Tuple:
+    """Turn a job dict into a compact (values, extras) record."""
+    extras = {key: value for key, value in job.items() if key not in JOB_FIELDS}
+    return tuple(job.get(field) for field in JOB_FIELDS), extras or None
+
+
+def unpack_job(record: Tuple) -> Dict:
+    """Inverse of pack_job."""
+    values, extras = record
+    job = {field: value for field, value in zip(JOB_FIELDS, values) if value is not None}
+    if extras:
+        job.update(extras)
+    return job
+
+
+# Per-worker-process scraper instances, keyed by (scraper class, parser backend)
+_worker_scrapers = {}
+
+
+def _parse_in_worker(scraper_class, parser_backend: str, content: bytes, encoding: Optional[str],
+                     want_next: bool) -> Tuple[List[Tuple], List[str]]:
+    key = (scraper_class, parser_backend)
+    scraper = _worker_scrapers.get(key)
+    if scraper is None:
+        scraper = _worker_scrapers[key] = scraper_class(parser_backend=parser_backend)
+    next_links = [] if want_next else None
+    records = [pack_job(job) for job in scraper.iter_jobs(content, next_links, encoding)]
+    return records, next_links or []
+
+
+def _warm_worker() -> int:
+    # Pay the import cost now, and linger briefly so each worker gets one of the warm-up tasks
+    import scraper.scraper  # noqa: F401
+    time.sleep(0.1)
+    return os.getpid()
+
+
+class ParsePool:
+    """
+    Worker processes that parse listing pages for any BaseScraper subclass.
+
+    Workers are started with forkserver (or spawn), never fork, because the
+    parent process is full of fetch threads holding locks.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+            return self._executor
+
+    def prewarm(self) -> int:
+        """Start and import-warm the worker processes now rather than on the first page."""
+        futures = [self.executor.submit(_warm_worker) for _ in range(self.max_workers)]
+        pids = {future.result() for future in futures}
+        logger.info(f"Parse pool ready with {len(pids)} worker processes")
+        return len(pids)
+
+    def submit(self, scraper, content: bytes, encoding: Optional[str] = None,
+               want_next: bool = False) -> Future:
+        """
+        Queue a page for parsing with scraper's class, selectors and parser backend.
+
+        The future resolves to (packed_job_records, next_links).
+        """
+        return self.executor.submit(_parse_in_worker, type(scraper), scraper.backend.name,
+                                    content, encoding, want_next)
+
+    def parse(self, scraper, content: bytes, encoding: Optional[str] = None,
+              next_links: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Parse a page in a worker process and wait for the jobs.
+
+        Args:
+            scraper: Scraper whose class and backend do the parsing
+            content: Raw page bytes
+            encoding: Charset from the Content-Type header, if any
+            next_links: If given, next-page hrefs are appended to it
+
+        Raises:
+            BrokenProcessPool: If a worker died; the pool is rebuilt on next use
+        """
+        try:
+            records, links = self.submit(scraper, content, encoding, next_links is not None).result()
+        except BrokenProcessPool:
+            self._reset()
+            raise
+        if next_links is not None:
+            next_links.extend(links)
+        return [unpack_job(record) for record in records]
+
+    def _reset(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def close(self):
+        """Shut the worker processes down."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+_shared_parse_pool = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_parse_pool(max_workers: Optional[int] = None) -> ParsePool:
+    """
+    Return the process-wide ParsePool, creating it on first use.
+
+    max_workers only takes effect on the call that creates the pool.
+    """
+    global _shared_parse_pool
+    with _shared_lock:
+        if _shared_parse_pool is None:
+            _shared_parse_pool = ParsePool(max_workers)
+        return _shared_parse_pool
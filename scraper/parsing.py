@@ -0,0 +1,204 @@
+"""
+Container-scoped HTML parsing for listing pages.
+
+Listing pages are large but only the job containers are ever used. Rather
+than building a BeautifulSoup tree of the whole page, iter_containers()
+runs lxml's pull parser over the raw bytes and hands out each matching
+container, as an lxml element or a small BeautifulSoup fragment, as soon as
+its end tag has been seen. Finished containers and the siblings before them are dropped from the
+lxml tree, so peak memory stays around one container rather than one page.
+
+Pages are decoded with the charset from the Content-Type header when there is
+one, so neither lxml nor BeautifulSoup has to sniff the encoding.
+
+JSON APIs that return one large array get the same treatment from
+iter_json_array(), which yields each element as soon as its text has arrived.
+"""
+import codecs
+import json
+import logging
+import re
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree
+
+logger = logging.getLogger('scraper')
+
+FEED_CHUNK_SIZE = 16 * 1024
+
+_JSON_SPACE = re.compile(r'[\s\ufeff]*')
+
+
+class ContainerSpec(NamedTuple):
+    """Selector for a listing container: a tag plus an optional class or attribute."""
+    tag: str
+    css_class: Optional[str] = None
+    attr: Optional[str] = None         # Attribute that must be present
+    attr_value: Optional[str] = None   # ...and contain this whitespace-separated value
+
+    def matches(self, elem) -> bool:
+        """Match an lxml element."""
+        if self.css_class and self.css_class not in (elem.get('class') or '').split():
+            return False
+        if self.attr:
+            value = elem.get(self.attr)
+            if value is None:
+                return False
+            if self.attr_value and self.attr_value not in value.split():
+                return False
+        return True
+
+    def soup_attrs(self) -> Dict:
+        """Equivalent BeautifulSoup attribute filter."""
+        attrs = {}
+        if self.css_class:
+            attrs['class'] = self.css_class
+        if self.attr:
+            attrs[self.attr] = self.attr_value or True
+        return attrs
+
+    def css(self) -> str:
+        """Equivalent CSS selector."""
+        css = self.tag
+        if self.css_class:
+            css += f".{self.css_class}"
+        if self.attr:
+            css += f'[{self.attr}~="{self.attr_value}"]' if self.attr_value else f"[{self.attr}]"
+        return css
+
+
+def charset_from_headers(headers) -> Optional[str]:
+    """Return the charset declared in a Content-Type header, or None if missing or unknown."""
+    content_type = ''
+    for key, value in (headers or {}).items():
+        if key.lower() == 'content-type':
+            content_type = value
+            break
+    for param in content_type.split(';')[1:]:
+        key, _, value = param.partition('=')
+        if key.strip().lower() == 'charset':
+            charset = value.strip().strip('"\'').lower()
+            try:
+                codecs.lookup(charset)
+            except LookupError:
+                return None
+            return charset
+    return None
+
+
+def decode_content(content: bytes, encoding: Optional[str] = None) -> str:
+    """Decode a page body with the header charset, falling back to UTF-8."""
+    return content.decode(encoding or 'utf-8', errors='replace')
+
+
+def _to_soup(elem):
+    """Turn a finished lxml element into a BeautifulSoup Tag for the _parse_* methods."""
+    fragment = etree.tostring(elem, encoding='unicode', method='html', with_tail=False)
+    return BeautifulSoup(fragment, 'lxml').find(elem.tag)
+
+
+def iter_containers(content: bytes, specs: Dict[str, ContainerSpec], encoding: Optional[str] = None,
+                    to_soup: bool = True) -> Iterator[Tuple[str, object]]:
+    """
+    Incrementally yield (name, element) for every element matching one of the specs.
+
+    Args:
+        content: Raw page bytes
+        specs: Mapping of name to ContainerSpec, e.g. {'job': ..., 'next': ...}
+        encoding: Charset from the response headers, if known
+        to_soup: Yield BeautifulSoup Tags. If False, the lxml element itself is
+            yielded; it is cleared once the consumer asks for the next one.
+    """
+    tags = sorted({spec.tag for spec in specs.values()})
+    parser = etree.HTMLPullParser(events=('end',), tag=tags, encoding=encoding)
+
+    def drain():
+        for _, elem in parser.read_events():
+            for name, spec in specs.items():
+                if spec.matches(elem):
+                    yield name, _to_soup(elem) if to_soup else elem
+                    break
+            else:
+                continue
+            # Free the finished container unless an enclosing container still needs it
+            if not any(spec.matches(ancestor) for ancestor in elem.iterancestors(*tags)
+                       for spec in specs.values()):
+                elem.clear(keep_tail=True)
+                parent = elem.getparent()
+                while parent is not None and elem.getprevious() is not None:
+                    del parent[0]
+
+    for start in range(0, len(content), FEED_CHUNK_SIZE):
+        parser.feed(content[start:start + FEED_CHUNK_SIZE])
+        yield from drain()
+    parser.close()
+    yield from drain()
+
+
+def find_containers(content: bytes, spec: ContainerSpec, encoding: Optional[str] = None) -> List:
+    """Parse only the subtrees matching spec with a SoupStrainer."""
+    soup = BeautifulSoup(content, 'lxml', parse_only=SoupStrainer(spec.tag, attrs=spec.soup_attrs()),
+                         from_encoding=encoding)
+    return soup.find_all(spec.tag, attrs=spec.soup_attrs())
+
+
+def iter_json_array(chunks: Iterable[bytes], encoding: Optional[str] = None) -> Iterator[Any]:
+    """
+    Incrementally yield the elements of a top-level JSON array from a byte stream.
+    
+    Only the text of elements not yet decoded is buffered, so memory stays
+    around one element rather than the whole document.
+    
+    Args:
+        chunks: Body chunks, e.g. FetchStream.iter_content()
+        encoding: Charset from the response headers, if known (default UTF-8)
+    
+    Raises:
+        ValueError: If the body is not a JSON array or ends before the closing bracket
+    """
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder(encoding or 'utf-8')(errors='replace')
+    buffer, opened = '', False
+    
+    chunks = iter(chunks)
+    while True:
+        chunk = next(chunks, None)
+        final = chunk is None
+        buffer += text.decode(chunk or b'', final=final)
+        
+        pos = 0
+        while True:
+            pos = _JSON_SPACE.match(buffer, pos).end()
+            if pos == len(buffer):
+                break
+            if not opened:
+                if buffer[pos] != '[':
+                    raise ValueError("Expected a JSON array")
+                opened = True
+                pos += 1
+                continue
+            if buffer[pos] == ']':
+                return
+            if buffer[pos] == ',':
+                pos += 1
+                continue
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise
+                # The element is still arriving
+                break
+            after = _JSON_SPACE.match(buffer, end).end()
+            if after == len(buffer) or buffer[after] not in ',]':
+                # A number cut short by the chunk boundary decodes too early ("12" of "12.5")
+                if final:
+                    raise ValueError("Malformed or truncated JSON array")
+                break
+            pos = after
+            yield item
+        buffer = buffer[pos:]
+        
+        if final:
+            raise ValueError("Malformed or truncated JSON array")
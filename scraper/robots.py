@@ -0,0 +1,205 @@
+"""
+robots.txt rules and Crawl-delay per host, cached for the whole process.
+
+Before a URL is scheduled, BaseScraper looks up its host's RobotsPolicy:
+disallowed URLs are dropped before any request is made, and a Crawl-delay
+(or Request-rate) slows the host's RateLimiter bucket down to it. Hosts
+without a delay keep the configured rate.
+
+Each host's robots.txt is fetched once and refreshed after `ttl_seconds`.
+As in RFC 9309, a missing robots.txt (4xx) allows everything, while a server
+error or an unreachable host disallows everything until the next attempt,
+ERROR_TTL seconds later; a previously fetched copy is kept meanwhile.
+"""
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+import requests
+
+from scraper.cache import CacheMiss
+from scraper.fetch import FetchError, FetchResult
+
+logger = logging.getLogger('scraper')
+
+
+class DisallowedByRobots(FetchError):
+    """Raised instead of fetching a URL the host's robots.txt disallows."""
+
+
+def parse_crawl_delays(lines: Iterable[str]) -> Dict[str, Optional[float]]:
+    """
+    Map each lowercased user agent of a robots.txt to its Crawl-delay in seconds.
+
+    Agents whose groups set no Crawl-delay map to None. RobotFileParser only
+    reads whole-second delays; '0.5' is common too.
+    """
+    delays, agents, in_rules = {}, [], False
+    for line in lines:
+        field, _, value = line.split('#', 1)[0].partition(':')
+        field, value = field.strip().lower(), value.strip()
+        if field == 'user-agent':
+            if in_rules:
+                agents, in_rules = [], False
+            agents.append(value.lower())
+            delays.setdefault(value.lower(), None)
+        elif field:
+            in_rules = True
+            if field == 'crawl-delay':
+                try:
+                    delay = float(value)
+                except ValueError:
+                    continue
+                for agent in agents:
+                    if delays[agent] is None:
+                        delays[agent] = delay
+    return delays
+
+
+class RobotsPolicy:
+    """Parsed robots.txt of one host."""
+
+    def __init__(self, parser: RobotFileParser, user_agent: str, expires_at: float,
+                 crawl_delays: Optional[Dict[str, Optional[float]]] = None):
+        self.parser = parser
+        self.user_agent = user_agent
+        self.expires_at = expires_at
+        self.crawl_delays = crawl_delays or {}
+
+    @classmethod
+    def allow_all(cls, user_agent: str, expires_at: float) -> 'RobotsPolicy':
+        parser = RobotFileParser()
+        parser.allow_all = True
+        return cls(parser, user_agent, expires_at)
+
+    @classmethod
+    def disallow_all(cls, user_agent: str, expires_at: float) -> 'RobotsPolicy':
+        parser = RobotFileParser()
+        parser.disallow_all = True
+        return cls(parser, user_agent, expires_at)
+
+    @classmethod
+    def parse(cls, text: str, user_agent: str, expires_at: float) -> 'RobotsPolicy':
+        lines = text.splitlines()
+        parser = RobotFileParser()
+        parser.parse(lines)
+        return cls(parser, user_agent, expires_at, parse_crawl_delays(lines))
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def allowed(self, url: str) -> bool:
+        return self.parser.can_fetch(self.user_agent, url)
+
+    @property
+    def crawl_delay(self) -> Optional[float]:
+        """
+        Seconds between requests from Crawl-delay, or else Request-rate; None if neither is set.
+
+        Only the group matching the user agent applies: the '*' group is used
+        when no group names the agent, not when the agent's group has no delay.
+        """
+        # Agents match by substring of the user agent's product token, as in RobotFileParser
+        token = self.user_agent.split('/')[0].lower()
+        matched = [delay for agent, delay in self.crawl_delays.items() if agent != '*' and agent in token]
+        delay = matched[0] if matched else self.crawl_delays.get('*')
+        if delay is not None:
+            return delay
+        try:
+            rate = self.parser.request_rate(self.user_agent)
+        except (TypeError, ValueError):
+            return None
+        if rate is not None and rate.requests > 0:
+            return rate.seconds / rate.requests
+        return None
+
+
+class RobotsCache:
+    """
+    Per-host RobotsPolicy cache shared by all scrapers.
+
+    Policies are fetched lazily through the caller's fetch function; concurrent
+    lookups for the same host wait for a single robots.txt request.
+    """
+
+    MAX_BYTES = 512 * 1024
+    ERROR_TTL = 300
+
+    def __init__(self, ttl_seconds: float = 24 * 3600):
+        self.ttl_seconds = ttl_seconds
+        self._policies = {}
+        self._host_locks = {}
+        self._lock = threading.Lock()
+
+    def _host_lock(self, host: str) -> threading.Lock:
+        with self._lock:
+            if host not in self._host_locks:
+                self._host_locks[host] = threading.Lock()
+            return self._host_locks[host]
+
+    def policy(self, url: str, fetch: Callable[[str], FetchResult], user_agent: str = '*') -> RobotsPolicy:
+        """
+        Return the robots.txt policy of url's host, fetching it if missing or expired.
+
+        Args:
+            url: Any URL on the host
+            fetch: Fetches the robots.txt URL, e.g. through a scraper's session and rate limiter
+            user_agent: User agent whose rules apply
+        """
+        parts = urlsplit(url)
+        host = parts.netloc
+        policy = self._policies.get(host)
+        if policy is not None and not policy.expired:
+            return policy
+
+        with self._host_lock(host):
+            policy = self._policies.get(host)
+            if policy is None or policy.expired:
+                policy = self._load(f"{parts.scheme}://{host}/robots.txt", fetch, user_agent, policy)
+                with self._lock:
+                    self._policies[host] = policy
+            return policy
+
+    def _load(self, robots_url: str, fetch: Callable[[str], FetchResult], user_agent: str,
+              previous: Optional[RobotsPolicy]) -> RobotsPolicy:
+        now = time.monotonic()
+        try:
+            response = fetch(robots_url)
+        except (requests.RequestException, FetchError, CacheMiss) as e:
+            logger.warning(f"Could not fetch {robots_url}: {e}")
+        else:
+            status = response.status_code
+            if status < 400:
+                text = response.content.decode(errors='replace')
+                logger.info(f"Loaded {robots_url}")
+                return RobotsPolicy.parse(text, user_agent, now + self.ttl_seconds)
+            if status < 500:
+                return RobotsPolicy.allow_all(user_agent, now + self.ttl_seconds)
+            logger.warning(f"{robots_url} returned HTTP {status}")
+
+        if previous is not None:
+            previous.expires_at = now + self.ERROR_TTL
+            return previous
+        return RobotsPolicy.disallow_all(user_agent, now + self.ERROR_TTL)
+
+
+_shared_robots_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_robots_cache(**kwargs) -> RobotsCache:
+    """
+    Return the process-wide RobotsCache, creating it on first use.
+
+    Keyword arguments are passed to RobotsCache and only take effect on
+    the call that creates the cache.
+    """
+    global _shared_robots_cache
+    with _shared_lock:
+        if _shared_robots_cache is None:
+            _shared_robots_cache = RobotsCache(**kwargs)
+        return _shared_robots_cache
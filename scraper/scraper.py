@@ -1,40 +1,1043 @@
 """
 Web scraper module for fetching jobs from various portals.
 """
+import asyncio
+import html
 import logging
+import os
+import queue
+import threading
 import requests
-from bs4 import BeautifulSoup
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from lxml import etree
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta
 import json
-from typing import List, Dict, Tuple
+from collections import deque
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Dict, NamedTuple, Optional, Sequence, Set, Tuple, Union
+from urllib.parse import parse_qsl, quote_plus, urlencode, urljoin, urlsplit, urlunsplit
 import time
 
+from scraper.cache import CacheMiss, ResponseCache
+from scraper.details import DetailFetcher, DetailStore, clean_description
+from scraper.embedded import (
+    LD_JSON, find_job_records, iter_job_postings, iter_script_payloads, job_fields_from_posting,
+    job_fields_from_record
+)
+from scraper.extract import Field, FieldSet, compile_selector, get_backend
+from scraper.feeds import FeedEntry, iter_feed_entries
+from scraper.fetch import (
+    AsyncFetcher, CircuitBreaker, CircuitOpenError, ConnectionPool, DEFAULT_HEADERS, FetchError, FetchResult,
+    FetchStream, RateLimiter, RetryPolicy, download, get_circuit_breaker, get_shared_pool,
+    get_shared_rate_limiter, open_download
+)
+from scraper.classifier import (
+    ClassificationCache, LinearJobClassifier, classification_key, get_shared_classification_cache,
+    get_shared_classifier
+)
+from scraper.health import PortalHealthRegistry
+from scraper.parse_pool import ParsePool, get_shared_parse_pool
+from scraper.parsing import ContainerSpec, charset_from_headers, iter_json_array
+from scraper.robots import DisallowedByRobots, RobotsCache, get_shared_robots_cache
+from scraper.state import UrlStateStore, WatermarkStore, content_digest
+from scraper.taxonomy import AI_ML, TaxonomyMatcher, load_taxonomy
+
 logger = logging.getLogger('scraper')
 
-# AI/ML Keywords for filtering
-AI_ML_KEYWORDS = [
-    'machine learning', 'deep learning', 'neural network', 'nlp', 'natural language',
-    'computer vision', 'ai', 'artificial intelligence', 'tensorflow', 'pytorch',
-    'scikit-learn', 'data science', 'data scientist', 'ml engineer', 'ai engineer',
-    'predictive modeling', 'classification', 'regression', 'clustering',
-    'llm', 'gpt', 'generative', 'transformer', 'bert', 'model training',
-    'data analysis', 'analytics', 'algorithm', 'optimization', 'reinforcement learning'
-]
+# One matcher for every job category's keywords, compiled once (see scraper.taxonomy)
+TAXONOMY_MATCHER = TaxonomyMatcher(load_taxonomy())
+
+# AI/ML Keywords for filtering: the taxonomy's 'ai_ml' category
+AI_ML_KEYWORDS = TAXONOMY_MATCHER.categories[AI_ML].keywords
+
+# Classifier version of the keyword rule, for the classification cache; bump the prefix when is_ai_ml_job changes
+KEYWORD_RULE_VERSION = 'keywords-2-' + TAXONOMY_MATCHER.version
+
+
+def classification_version(classifier: Optional[LinearJobClassifier]) -> str:
+    """
+    Version of the results classify_batch gives with a classifier (None: the keyword rule).
+    
+    Empty for a model trained in-process and never saved.
+    """
+    if classifier is None:
+        return KEYWORD_RULE_VERSION
+    return f"{classifier.version}-{TAXONOMY_MATCHER.version}" if classifier.version else ''
+
+
+# Queries for targeted crawls of portal search pages (see BaseScraper.crawl_plan()), from AI_ML_KEYWORDS
+AI_ML_SEARCH_TERMS = ['machine learning', 'ai', 'data science', 'llm', 'nlp', 'computer vision']
+
+
+class ListingPage(NamedTuple):
+    """Outcome of fetching and parsing one listing page."""
+    url: str
+    jobs: List[Dict]
+    next_url: Optional[str]
+    digest: Optional[str]
+    unchanged: bool = False
+
+
+class CrawlPlan(NamedTuple):
+    """Seed URLs of a targeted crawl: category feeds, and category or search listing pages."""
+    feeds: List[str]
+    pages: List[str]
 
 
 class BaseScraper:
     """Base scraper class with common functionality."""
     
-    def __init__(self, timeout=10):
+    # Portal key, as in JobScraperService.SCRAPER_CLASSES
+    PORTAL = ""
+    BASE_URL = ""
+    LISTING_PATH = ""
+    # Extra headers sent with listing page requests (merged over the session defaults)
+    REQUEST_HEADERS = None
+    # Downloads stop once this many decoded bytes have arrived
+    MAX_PAGE_BYTES = 5 * 1024 * 1024
+    # Job container selectors in fallback order; the first one is parsed incrementally
+    JOB_CONTAINERS: List[ContainerSpec] = []
+    # "Next page" link selector for paginated portals
+    NEXT_LINK: Optional[ContainerSpec] = None
+    # Job fields extracted from each container (see scraper.extract)
+    FIELDS: Optional[FieldSet] = None
+    # Full description on a job's own page, for the optional detail stage (see scraper.details)
+    DETAIL_DESCRIPTION: Optional[Field] = Field('[itemprop="description"]', 'article', 'main', separator=' ')
+    # RSS/Atom feeds or sitemaps read instead of listing pages in feed discovery mode (see scraper.feeds)
+    FEED_PATHS: List[str] = []
+    DISCOVERY_MODES = ('feed', 'html')
+    # Read listings from JSON embedded in the page (__NEXT_DATA__, ld+json JobPosting) before walking the DOM
+    EMBEDDED_JSON = True
+    # Keys leading to the job list inside __NEXT_DATA__; None searches the payload for it
+    NEXT_DATA_JOBS: Optional[Tuple[str, ...]] = None
+    # Whether the listing parser's job IDs carry a "<PORTAL>_" prefix (see job_id())
+    PREFIXED_JOB_IDS = True
+    # Targeted crawls (see crawl_plan()): listings of the relevant categories, their feeds, and a
+    # search listing with a {query} placeholder
+    CATEGORY_PATHS: List[str] = []
+    CATEGORY_FEED_PATHS: List[str] = []
+    SEARCH_PATH: Optional[str] = None
+    
+    def __init__(self, timeout=10, session: requests.Session = None, url_state: UrlStateStore = None,
+                 cache: ResponseCache = None, rate_limiter: RateLimiter = None,
+                 retry_policy: RetryPolicy = None, circuit_breaker: CircuitBreaker = None,
+                 parser_backend: str = None, parse_pool: ParsePool = None,
+                 watermark: WatermarkStore = None, backfill: bool = False, discovery: str = 'feed',
+                 search_terms: List[str] = None, robots: RobotsCache = None, crawl_scope: str = ''):
+        """
+        Args:
+            timeout: Request timeout in seconds
+            session: Borrowed session (e.g. from a ConnectionPool). If None, the
+                scraper creates and owns its own session.
+            url_state: Crawl state store. When set, listing pages are fetched with
+                conditional GETs and unchanged pages are not parsed. The state of
+                the pages fetched is only saved once their jobs have been stored,
+                see take_crawl_state().
+            cache: On-disk response cache. In replay mode the network is never used.
+                Defaults to ResponseCache.from_env(), i.e. off unless SCRAPER_CACHE_MODE is set.
+            rate_limiter: Per-host limiter every request waits on. Defaults to the
+                process-wide limiter.
+            retry_policy: Backoff policy for connection errors and retryable statuses
+            circuit_breaker: Portal breaker; while open, fetch() raises CircuitOpenError
+            parser_backend: 'lxml' (default), 'bs4' or 'selectolax'
+            parse_pool: Worker processes that parse listing pages. If None, pages
+                are parsed in the fetching thread.
+            watermark: Per-portal store of recently seen job IDs. When set,
+                pagination stops at the first page made up only of known jobs.
+                The jobs a crawl saw are only added once they have been stored,
+                see take_seen_job_ids().
+            backfill: Ignore the watermark and crawl up to max_pages; the jobs
+                seen are still recorded
+            discovery: 'feed' reads FEED_PATHS where the portal has any and falls
+                back to listing pages if none can be read; 'html' always scrapes
+                listing pages
+            search_terms: Crawl only the portal's relevant slices: its category
+                listings and a search per term (see crawl_plan()). None crawls
+                the whole board.
+            robots: robots.txt cache consulted before every request. Defaults to
+                the process-wide cache.
+            crawl_scope: What decides which of the jobs will be kept, e.g. the
+                classifier version when non-AI/ML jobs are dropped; '' keeps all.
+                See UrlStateStore.check().
+        """
+        if discovery not in self.DISCOVERY_MODES:
+            raise ValueError(f"Unknown discovery mode: {discovery}")
         self.timeout = timeout
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Referer': 'https://www.google.com/',
-        })
+        self.discovery = discovery
+        self.search_terms = search_terms
+        self.backend = get_backend(parser_backend)
+        self.parse_pool = parse_pool
+        self.watermark = watermark
+        self.backfill = backfill
+        # Per-run health stats: [ok, latency_ms] per request, pages parsed and jobs parsed
+        self.stats = {'requests': [], 'pages': 0, 'jobs': 0, 'bytes_wire': 0, 'bytes_decoded': 0, 'truncated': 0}
+        self._stats_lock = threading.Lock()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker
+        self.url_state = url_state
+        self.crawl_scope = crawl_scope
+        # URL -> crawl state to save once the page's jobs are stored
+        self._pending_states = {}
+        # Job IDs seen by completed crawls, for the watermark once the jobs are stored
+        self._seen_job_ids = []
+        self.cache = cache if cache is not None else ResponseCache.from_env()
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter()
+        self.robots = robots or get_shared_robots_cache()
+        self._owns_session = session is None
+        if session is None:
+            session = requests.Session()
+            session.headers.update(DEFAULT_HEADERS)
+        self.session = session
+    
+    def get_page_urls(self, max_pages: int = 1) -> List[str]:
+        """Return the listing page URLs to fetch for this portal."""
+        return [f"{self.BASE_URL}{self.LISTING_PATH}"]
+    
+    def fetch(self, url: str, **kwargs) -> FetchResult:
+        """
+        Fetch a page through the scraper's session, conditionally if crawl state is known.
+        
+        The body is streamed, decoded as it arrives and capped at MAX_PAGE_BYTES.
+        """
+        headers = dict(kwargs.pop('headers', None) or self.REQUEST_HEADERS or {})
+        if self.cache is not None:
+            cached = self.cache.get(url, headers)
+            if cached is not None:
+                return cached
+        
+        response = self._send(url, download, headers, **kwargs)
+        if self.cache is not None:
+            self.cache.put(url, response, headers)
+        return response
+    
+    def fetch_stream(self, url: str, **kwargs) -> Union[FetchStream, FetchResult]:
+        """
+        Like fetch(), but return as soon as the headers arrive; read the body with iter_content().
+        
+        The response cache stores whole bodies, so with a cache configured this
+        falls back to fetch() and the body is buffered.
+        """
+        if self.cache is not None:
+            return self.fetch(url, **kwargs)
+        headers = dict(kwargs.pop('headers', None) or self.REQUEST_HEADERS or {})
+        return self._send(url, open_download, headers, **kwargs)
+    
+    def fetch_detail_page(self, url: str, max_bytes: int, timeout: Optional[int] = None) -> FetchResult:
+        """
+        Fetch a job's detail page with the robots.txt check, retries, breaker and stats of fetch().
+        
+        Detail pages have no crawl state, so the request is never conditional.
+        The response cache is not consulted, only filled: callers look there
+        first so that cache hits stay out of their request budget.
+        
+        Raises:
+            CircuitOpenError: While the portal's circuit breaker is open
+        """
+        headers = dict(self.REQUEST_HEADERS or {})
+        response = self._send(url, download, headers, max_bytes=max_bytes, conditional=False,
+                              timeout=timeout or self.timeout)
+        if self.cache is not None:
+            self.cache.put(url, response)
+        return response
+    
+    def _send(self, url: str, opener, headers: Dict[str, str], max_bytes: Optional[int] = None,
+              conditional: bool = True, **kwargs):
+        """
+        Request url with opener (download or open_download), with robots.txt, rate limiting, retries and the breaker.
+        
+        The body is capped at max_bytes (default MAX_PAGE_BYTES); conditional
+        adds the validators of the URL's crawl state.
+        """
+        self.check_robots(url)
+        self.check_circuit()
+        if conditional and self.url_state is not None:
+            headers.update(self.url_state.conditional_headers(url))
+        kwargs.setdefault('timeout', self.timeout)
+        
+        attempt = 0
+        while True:
+            self.rate_limiter.wait(url)
+            started = time.monotonic()
+            try:
+                response = opener(self.session, url, max_bytes or self.MAX_PAGE_BYTES, headers=headers or None,
+                                  **kwargs)
+                self._record_request(response.status_code < 400, (time.monotonic() - started) * 1000)
+                if isinstance(response, FetchResult):
+                    self._record_transfer(response)
+            except requests.RequestException as e:
+                self._record_request(False, None)
+                if not self.retry_policy.should_retry(attempt):
+                    self.record_outcome(False)
+                    raise
+                logger.warning(f"Retrying {url} after error: {e}")
+            else:
+                self.rate_limiter.observe(url, response.status_code, response.headers)
+                if not self.retry_policy.should_retry(attempt, response.status_code):
+                    break
+                logger.warning(f"Retrying {url} after HTTP {response.status_code}")
+                if isinstance(response, FetchStream):
+                    response.close()
+            
+            time.sleep(self.retry_policy.delay(attempt))
+            attempt += 1
+        
+        self.record_outcome(response.status_code < 400)
+        return response
+    
+    def _record_request(self, ok: bool, latency_ms: Optional[float]):
+        with self._stats_lock:
+            self.stats['requests'].append([ok, round(latency_ms, 1) if latency_ms is not None else None])
+    
+    def _record_transfer(self, response: Union[FetchResult, FetchStream]):
+        if response.wire_bytes is not None:
+            logger.debug(f"Downloaded {response.url}: {response.wire_bytes} bytes transferred, "
+                         f"{response.decoded_bytes} decoded (ratio {response.compression_ratio})")
+        with self._stats_lock:
+            self.stats['bytes_wire'] += response.wire_bytes or 0
+            self.stats['bytes_decoded'] += response.decoded_bytes
+            self.stats['truncated'] += int(response.truncated)
+    
+    def _record_page(self, job_count: int):
+        with self._stats_lock:
+            self.stats['pages'] += 1
+            self.stats['jobs'] += job_count
+    
+    def check_robots(self, url: str):
+        """
+        Apply the host's robots.txt Crawl-delay to the rate limiter and refuse disallowed URLs.
+        
+        Replayed runs never reach the network and skip the check.
+        
+        Raises:
+            DisallowedByRobots: If robots.txt disallows url for the session's user agent
+        """
+        if self.cache is not None and self.cache.replay:
+            return
+        policy = self.robots.policy(url, self._fetch_robots, self.session.headers.get('User-Agent', '*'))
+        self.rate_limiter.apply_crawl_delay(url, policy.crawl_delay)
+        if not policy.allowed(url):
+            raise DisallowedByRobots(f"Disallowed by robots.txt: {url}")
+    
+    def robots_allowed(self, url: str) -> bool:
+        """Whether robots.txt allows url; see check_robots()."""
+        try:
+            self.check_robots(url)
+        except DisallowedByRobots as e:
+            logger.info(str(e))
+            return False
+        return True
+    
+    def _fetch_robots(self, robots_url: str) -> FetchResult:
+        """Fetch a robots.txt through the session, rate limiter and response cache."""
+        if self.cache is not None:
+            cached = self.cache.get(robots_url)
+            if cached is not None:
+                return cached
+        self.rate_limiter.wait(robots_url)
+        response = download(self.session, robots_url, RobotsCache.MAX_BYTES, timeout=self.timeout)
+        if self.cache is not None:
+            self.cache.put(robots_url, response)
+        return response
+    
+    def check_circuit(self):
+        """Raise CircuitOpenError if the portal's breaker refuses requests."""
+        if self.circuit_breaker is not None and not self.circuit_breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {self.circuit_breaker.name}, skipping request")
+    
+    def record_outcome(self, success: bool):
+        """Report a request's final outcome to the portal's breaker."""
+        if self.circuit_breaker is None:
+            return
+        if success:
+            self.circuit_breaker.record_success()
+        else:
+            self.circuit_breaker.record_failure()
+    
+    def page_unchanged(self, url: str, response) -> bool:
+        """
+        Check the fetch against the crawl state and report whether the page can be skipped.
+        
+        A page is unchanged when the server answered 304 Not Modified or the
+        body digest matches the previous fetch.
+        """
+        return self.check_page(url, response.status_code, response.headers, response.content)
+    
+    def check_page(self, url: str, status_code: int, headers, content: Optional[bytes],
+                   state: Optional[Dict] = None, digest: Optional[str] = None) -> bool:
+        """
+        Compare a fetch with the crawl state and keep its new state for take_crawl_state().
+        
+        Nothing is saved here: a page recorded before its jobs are stored
+        would be skipped by later runs even if the jobs never made it to the
+        database. See UrlStateStore.check() for the arguments.
+        """
+        if self.url_state is None:
+            return False
+        unchanged, new_state = self.url_state.check(url, status_code, headers, content, state, digest,
+                                                    scope=self.crawl_scope)
+        if new_state is not None:
+            with self._stats_lock:
+                self._pending_states[url] = new_state
+        if unchanged:
+            logger.info(f"Page unchanged since last fetch, skipping parse: {url}")
+        return unchanged
+    
+    def take_crawl_state(self) -> Dict[str, Dict]:
+        """
+        Return and forget the crawl state of the pages fetched so far, by URL.
+        
+        The caller saves it to url_state once the pages' jobs have been stored.
+        """
+        with self._stats_lock:
+            states, self._pending_states = self._pending_states, {}
+        return states
+    
+    def parse_page(self, content: bytes, encoding: Optional[str] = None) -> List[Dict]:
+        """Parse one listing page into job dicts."""
+        jobs = self.parse_listing(content, encoding)
+        self._record_page(len(jobs))
+        return jobs
+    
+    def stream_page(self, content: bytes, encoding: Optional[str] = None) -> Iterator[Dict]:
+        """Yield a listing page's jobs as they are parsed, counting the page once it is done."""
+        if self.parse_pool is not None:
+            jobs = self.parse_listing(content, encoding)
+        else:
+            jobs = self.iter_jobs(content, encoding=encoding)
+        count = 0
+        for job in jobs:
+            count += 1
+            yield job
+        self._record_page(count)
+    
+    def stream_jobs(self, max_pages: int = 1, seed_urls: List[str] = None) -> Iterator[Dict]:
+        """
+        Yield jobs as listing pages are fetched and parsed.
+        
+        The default fetches the first listing page only; paginated portals
+        override this.
+        
+        Args:
+            max_pages: Maximum pages per listing, for paginated portals
+            seed_urls: Category or search listings of a targeted crawl (see
+                crawl_plan()). The first page of each is read and jobs are
+                deduplicated by job ID; a listing that cannot be fetched is skipped.
+        
+        Raises:
+            FetchError: If none of the seed URLs could be fetched
+        """
+        urls = seed_urls or self.get_page_urls(max_pages)[:1]
+        seen, failures = set(), 0
+        for url in urls:
+            try:
+                response = self.fetch(url)
+                if self.page_unchanged(url, response):
+                    continue
+                response.raise_for_status()
+            except (requests.RequestException, FetchError, CacheMiss) as e:
+                if not seed_urls:
+                    raise
+                logger.warning(f"Error fetching listing {url}: {e}")
+                failures += 1
+                continue
+            for job in self.stream_page(response.content, charset_from_headers(response.headers)):
+                if job['job_id'] not in seen:
+                    seen.add(job['job_id'])
+                    yield job
+        if failures == len(urls):
+            raise FetchError("No listing of the crawl plan could be fetched")
+    
+    def stream_document(self, url: str, parse: Callable[[Iterator[bytes], Optional[str]], Iterator[Dict]]
+                        ) -> Iterator[Dict]:
+        """
+        Fetch url with fetch_stream() and yield the jobs parse() makes of its body chunks.
+        
+        Unchanged documents are skipped; transfer, page and crawl state are
+        recorded once the body has been read.
+        
+        Args:
+            url: Document URL
+            parse: Called with (body chunks, header charset), yields job dicts
+        """
+        response = self.fetch_stream(url)
+        try:
+            if isinstance(response, FetchResult):
+                if self.page_unchanged(url, response):
+                    return
+            elif response.status_code == 304 and self.check_page(url, 304, response.headers, None):
+                return
+            response.raise_for_status()
+            
+            count = 0
+            for job in parse(response.iter_content(), charset_from_headers(response.headers)):
+                count += 1
+                yield job
+            self._record_page(count)
+            
+            if isinstance(response, FetchStream):
+                response.close()
+                self._record_transfer(response)
+                # Keep the validators for the next conditional GET
+                self.check_page(url, response.status_code, response.headers, None, digest=response.digest)
+        finally:
+            if isinstance(response, FetchStream):
+                response.close()
+    
+    def discover(self, max_pages: int = 1) -> Iterator[Dict]:
+        """
+        Yield the portal's jobs from its targeted crawl plan, else its feeds in feed discovery mode,
+        else its listing pages.
+        
+        Listing pages are the fallback when the portal has no FEED_PATHS, or
+        when nothing of the crawl plan or none of the feeds can be read.
+        """
+        plan = self.crawl_plan()
+        if plan is not None:
+            jobs, source = self.stream_plan(plan, max_pages=max_pages), 'Targeted crawl'
+        elif self.discovery == 'feed' and self.FEED_PATHS:
+            jobs, source = self.stream_feeds(), 'Feed discovery'
+        else:
+            yield from self.stream_jobs(max_pages=max_pages)
+            return
+        
+        yielded = False
+        try:
+            for job in jobs:
+                yielded = True
+                yield job
+            return
+        except FetchError as e:
+            if yielded:
+                raise
+            logger.warning(f"{source} failed for {self.PORTAL}, scraping listing pages: {e}")
+        yield from self.stream_jobs(max_pages=max_pages)
+    
+    def crawl_plan(self) -> Optional[CrawlPlan]:
+        """
+        Return the targeted crawl for the scraper's search terms, or None to crawl the whole board.
+        
+        The plan holds the portal's CATEGORY_PATHS and a SEARCH_PATH listing per
+        search term. In feed discovery mode, categories are read from their
+        CATEGORY_FEED_PATHS where the portal has them.
+        """
+        if self.search_terms is None or not (self.CATEGORY_PATHS or self.SEARCH_PATH):
+            return None
+        feeds, pages = [], []
+        if self.discovery == 'feed' and self.CATEGORY_FEED_PATHS:
+            feeds = [urljoin(self.BASE_URL, path) for path in self.CATEGORY_FEED_PATHS]
+        else:
+            pages = [urljoin(self.BASE_URL, path) for path in self.CATEGORY_PATHS]
+        if self.SEARCH_PATH:
+            pages.extend(urljoin(self.BASE_URL, self.SEARCH_PATH.format(query=quote_plus(term)))
+                         for term in self.search_terms)
+        return CrawlPlan(feeds, pages)
+    
+    def stream_plan(self, plan: CrawlPlan, max_pages: int = 1) -> Iterator[Dict]:
+        """
+        Yield the jobs of a targeted crawl, deduplicated by job ID across its feeds and listings.
+        
+        If none of the category feeds can be read, the category listings are
+        scraped instead.
+        
+        Raises:
+            FetchError: If none of the plan's feeds or listings could be read
+        """
+        seen, pages = set(), plan.pages
+        if plan.feeds:
+            try:
+                for job in self.stream_feeds(plan.feeds):
+                    seen.add(job['job_id'])
+                    yield job
+            except FetchError as e:
+                logger.warning(f"No category feed of {self.PORTAL} could be read, scraping category listings: {e}")
+                pages = [urljoin(self.BASE_URL, path) for path in self.CATEGORY_PATHS] + pages
+                if not pages:
+                    raise
+        if pages:
+            try:
+                for job in self.stream_jobs(max_pages=max_pages, seed_urls=pages):
+                    if job['job_id'] not in seen:
+                        seen.add(job['job_id'])
+                        yield job
+            except FetchError:
+                # Jobs from the category feeds make the crawl a success
+                if not seen:
+                    raise
+        logger.info(f"Targeted crawl of {self.PORTAL}: {len(seen)} jobs from "
+                    f"{len(plan.feeds)} feeds and {len(pages)} listings")
+    
+    def feed_urls(self) -> List[str]:
+        return [urljoin(self.BASE_URL, path) for path in self.FEED_PATHS]
+    
+    def stream_feeds(self, urls: List[str] = None) -> Iterator[Dict]:
+        """
+        Yield jobs from every feed in urls (default: FEED_PATHS), deduplicated by job ID.
+        
+        Raises:
+            FetchError: If no feed could be read
+        """
+        urls = urls or self.feed_urls()
+        seen, failures = set(), []
+        for url in urls:
+            try:
+                for job in self.stream_document(url, self.iter_feed_jobs):
+                    if job['job_id'] not in seen:
+                        seen.add(job['job_id'])
+                        yield job
+            except (requests.RequestException, FetchError, CacheMiss, etree.XMLSyntaxError) as e:
+                logger.warning(f"Error reading feed {url}: {e}")
+                failures.append(e)
+        if len(failures) == len(urls):
+            raise FetchError(f"No feed could be read: {failures[-1]}")
+    
+    def iter_feed_jobs(self, chunks: Iterable[bytes], encoding: Optional[str] = None) -> Iterator[Dict]:
+        """Yield jobs from a feed document's body chunks as each entry is parsed."""
+        for entry in iter_feed_entries(chunks, encoding):
+            try:
+                job = self._parse_feed_entry(entry)
+            except Exception as e:
+                logger.error(f"Error parsing {self.__class__.__name__} feed entry: {e}")
+                continue
+            if job:
+                yield job
+    
+    def parse_feed(self, content: bytes, encoding: Optional[str] = None) -> List[Dict]:
+        """Parse a whole feed document into job dicts."""
+        jobs = list(self.iter_feed_jobs([content], encoding))
+        self._record_page(len(jobs))
+        return jobs
+    
+    def _parse_feed_entry(self, entry: FeedEntry) -> Optional[Dict]:
+        """
+        Turn a feed entry into a job dict.
+        
+        The job ID is built from the last path segment of the entry's link, as
+        the listing page parsers do, so both discovery modes yield the same IDs.
+        """
+        if not entry.title:
+            return None
+        key = (entry.link or entry.guid).rstrip('/').split('/')[-1]
+        job = {
+            'job_id': self.job_id(key),
+            'title': entry.title,
+            'description': self.description_text(entry.summary),
+            'url': entry.link,
+            'company_name': entry.author or 'Unknown',
+            'posted_at': entry.published.isoformat() if entry.published else '',
+            'source': self.PORTAL
+        }
+        if entry.categories:
+            job['tags'] = list(entry.categories)
+        return job
+    
+    def job_id(self, key: str) -> str:
+        """Job ID for a portal-side key (ID or URL slug) found in a feed or embedded JSON."""
+        return f"{self.PORTAL}_{key}" if self.PREFIXED_JOB_IDS else key
+    
+    def description_text(self, description: str) -> str:
+        """Reduce an HTML description to clean text with the scraper's parser backend."""
+        if '<' not in description and '&lt;' in description:
+            # HTML published entity-encoded, as JSON payloads often do
+            description = html.unescape(description)
+        if '<' in description:
+            root = self.backend.document(description.encode('utf-8'), 'utf-8')
+            description = self.backend.text(root, separator=' ') if root is not None else ''
+        return clean_description(description, DetailFetcher.MAX_DESCRIPTION_CHARS)
+    
+    def parse_listing(self, content: bytes, encoding: Optional[str] = None,
+                      next_links: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Parse a listing page in the parse pool, or in this thread if there is none.
+        
+        Args:
+            content: Raw page bytes
+            encoding: Charset from the Content-Type header, if any
+            next_links: If given, hrefs matching NEXT_LINK are appended to it
+        """
+        if self.parse_pool is not None:
+            try:
+                return self.parse_pool.parse(self, content, encoding, next_links)
+            except BrokenProcessPool as e:
+                logger.warning(f"Parse pool unavailable, parsing in-thread: {e}")
+        return list(self.iter_jobs(content, next_links, encoding))
+    
+    def iter_jobs(self, content: bytes, next_links: Optional[List[str]] = None,
+                  encoding: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Yield jobs from a listing page as soon as each container has been parsed.
+        
+        Jobs embedded as JSON are used when the page has any (see
+        embedded_jobs()); otherwise only the job container subtrees are built
+        (see scraper.parsing). If the primary selector matches nothing, the
+        fallback selectors are tried.
+        
+        Args:
+            content: Raw page bytes
+            next_links: If given, hrefs matching NEXT_LINK are appended to it
+            encoding: Charset from the Content-Type header, if any
+        """
+        # Embedded payloads carry no next-page link, so paginated crawls keep to the DOM
+        if self.EMBEDDED_JSON and (next_links is None or self.NEXT_LINK is None):
+            jobs = self.embedded_jobs(content, encoding)
+            if jobs:
+                yield from jobs
+                return
+        
+        if not self.JOB_CONTAINERS:
+            return
+        
+        specs = {'job': self.JOB_CONTAINERS[0]}
+        if self.NEXT_LINK is not None and next_links is not None:
+            specs['next'] = self.NEXT_LINK
+        
+        found = 0
+        for name, element in self.backend.iter_containers(content, specs, encoding):
+            if name == 'next':
+                next_links.append(self.backend.attr(element, 'href'))
+                continue
+            found += 1
+            job = self._parse_container(element)
+            if job:
+                yield job
+        
+        if found:
+            return
+        
+        # Try alternative selectors
+        for spec in self.JOB_CONTAINERS[1:]:
+            elements = self.backend.find_containers(content, spec, encoding)
+            if elements:
+                for element in elements:
+                    job = self._parse_container(element)
+                    if job:
+                        yield job
+                return
+    
+    def embedded_jobs(self, content: bytes, encoding: Optional[str] = None) -> List[Dict]:
+        """
+        Jobs from __NEXT_DATA__ and ld+json JobPosting scripts, or [] if the page has none.
+        
+        A job found in both payloads is merged, the first one seen taking precedence.
+        """
+        jobs = {}
+        for kind, data in iter_script_payloads(content, encoding):
+            if kind == LD_JSON:
+                records = [job_fields_from_posting(posting) for posting in iter_job_postings(data)]
+            else:
+                records = [job_fields_from_record(record) for record in find_job_records(data, self.NEXT_DATA_JOBS)]
+            for fields in records:
+                job = self._parse_embedded_job(fields)
+                if not job:
+                    continue
+                existing = jobs.setdefault(job['job_id'], job)
+                for key, value in job.items():
+                    if value and not existing.get(key):
+                        existing[key] = value
+        return list(jobs.values())
+    
+    def _parse_embedded_job(self, fields: Dict) -> Optional[Dict]:
+        """Turn fields from scraper.embedded into a job dict, keyed like the feed parser."""
+        if not fields['title'] or not (fields['key'] or fields['url']):
+            return None
+        url = fields['url']
+        if url and not url.startswith('http'):
+            url = self.BASE_URL + url if url.startswith('/') else urljoin(self.BASE_URL, url)
+        job = {
+            'job_id': self.job_id(fields['key'] or url.rstrip('/').split('/')[-1]),
+            'title': fields['title'],
+            'description': self.description_text(fields['description']),
+            'url': url,
+            'company_name': fields['company_name'] or 'Unknown',
+            'posted_at': fields['posted_at'],
+            'source': self.PORTAL
+        }
+        for key in ('salary', 'employment_type', 'location'):
+            if fields.get(key):
+                job[key] = fields[key]
+        return job
+    
+    def _parse_container(self, element) -> Optional[Dict]:
+        try:
+            return self._parse_job(element)
+        except Exception as e:
+            logger.error(f"Error parsing {self.__class__.__name__} job: {e}")
+            return None
+    
+    def _parse_job(self, element) -> Optional[Dict]:
+        """
+        Parse one job container into a job dict. Implemented per portal.
+        
+        element is a node of self.backend; read it with self.FIELDS.extract()
+        or the backend's select/text/attr methods.
+        """
+        raise NotImplementedError
+    
+    def guess_next_page_url(self, url: str, page: int) -> Optional[str]:
+        """
+        Guess the URL of listing page `page` before the previous page is parsed.
+        
+        Used by CrawlFrontier to prefetch speculatively. None disables prefetching.
+        """
+        return None
+    
+    def fetch_listing_page(self, url: str) -> ListingPage:
+        """Fetch and parse one listing page, including its next-page link."""
+        response = self.fetch(url)
+        if self.page_unchanged(url, response):
+            return ListingPage(url, [], None, None, unchanged=True)
+        response.raise_for_status()
+        
+        next_links = []
+        jobs = self.parse_listing(response.content, charset_from_headers(response.headers), next_links)
+        self._record_page(len(jobs))
+        next_url = urljoin(url, next_links[0]) if next_links and next_links[0] else None
+        return ListingPage(url, jobs, next_url, content_digest(response.content))
+    
+    def crawl(self, seed_urls: List[str], max_pages: int = 3, concurrency: int = 3) -> List[Dict]:
+        """Crawl paginated listings from seed URLs with a CrawlFrontier."""
+        return CrawlFrontier(self, max_pages=max_pages, concurrency=concurrency).crawl(seed_urls)
+    
+    def stream_crawl(self, seed_urls: List[str], max_pages: int = 3, concurrency: int = 3) -> Iterator[Dict]:
+        """Like crawl(), but yield each page's new jobs as soon as the page is accepted."""
+        return CrawlFrontier(self, max_pages=max_pages, concurrency=concurrency).stream(seed_urls)
+    
+    def known_job_ids(self) -> Set[str]:
+        """Job IDs seen by earlier runs, or an empty set when backfilling or without a watermark."""
+        if self.watermark is None or self.backfill:
+            return set()
+        return self.watermark.known_job_ids(self.PORTAL)
+    
+    def add_seen_job_ids(self, job_ids: List[str]):
+        """Keep the job IDs a completed crawl saw, newest first, for take_seen_job_ids()."""
+        if self.watermark is not None:
+            with self._stats_lock:
+                self._seen_job_ids.extend(job_ids)
+    
+    def take_seen_job_ids(self) -> List[str]:
+        """
+        Return and forget the job IDs seen by the crawls so far, newest first.
+        
+        The caller advances the watermark with them once the jobs are stored;
+        advancing it earlier would stop later runs at jobs that never made it
+        to the database.
+        """
+        with self._stats_lock:
+            job_ids, self._seen_job_ids = self._seen_job_ids, []
+        return job_ids
+    
+    async def scrape_jobs_async(self, fetcher: AsyncFetcher, max_pages: int = 1) -> List[Dict]:
+        """
+        Scrape jobs with the portal's pages requested concurrently on the event loop.
+        
+        With a targeted crawl plan its feeds and listings are requested instead;
+        in feed discovery mode, the portal's feeds. The listing pages are the
+        fallback, as in discover(). Paginated portals (those with a NEXT_LINK)
+        follow each listing's next-page links up to max_pages and stop at the
+        watermark like CrawlFrontier; other portals read the first page only,
+        as stream_jobs() does.
+        
+        Unlike stream_jobs(), nothing is returned until every page of the
+        portal has been fetched and parsed, so the portal's jobs are held in
+        memory at once and reach the JobStream consumer in one go.
+        
+        Args:
+            fetcher: Open AsyncFetcher shared by all portals in the run
+            max_pages: Maximum number of pages to request per listing
+        """
+        plan = self.crawl_plan()
+        if plan is not None:
+            (feed_jobs, feed_failures), (page_jobs, page_failures) = await asyncio.gather(
+                self._scrape_urls_async(fetcher, plan.feeds, self.parse_feed),
+                self._scrape_listings_async(fetcher, plan.pages, max_pages),
+            )
+            pages = plan.pages
+            if plan.feeds and feed_failures == len(plan.feeds) and self.CATEGORY_PATHS:
+                logger.warning(f"No category feed of {self.PORTAL} could be read, scraping category listings")
+                pages = [urljoin(self.BASE_URL, path) for path in self.CATEGORY_PATHS]
+                category_jobs, category_failures = await self._scrape_listings_async(fetcher, pages, max_pages)
+                page_jobs += category_jobs
+                page_failures += category_failures
+                pages = pages + plan.pages
+            if feed_failures + page_failures < len(plan.feeds) + len(pages):
+                # Listings overlap each other and the feeds; keep the first copy of each job
+                merged = {}
+                for job in feed_jobs + page_jobs:
+                    merged.setdefault(job['job_id'], job)
+                return list(merged.values())
+            logger.warning(f"Targeted crawl failed for {self.PORTAL}, scraping listing pages")
+        elif self.discovery == 'feed' and self.FEED_PATHS:
+            urls = self.feed_urls()
+            jobs, failures = await self._scrape_urls_async(fetcher, urls, self.parse_feed)
+            if failures < len(urls):
+                # Feeds may overlap
+                return list({job['job_id']: job for job in jobs}.values())
+            logger.warning(f"Feed discovery failed for {self.PORTAL}, scraping listing pages")
+        
+        jobs, _ = await self._scrape_listings_async(fetcher, self.get_page_urls(max_pages)[:1], max_pages)
+        return jobs
+    
+    async def _scrape_listings_async(self, fetcher: AsyncFetcher, urls: List[str],
+                                     max_pages: int) -> Tuple[List[Dict], int]:
+        """Scrape listings, following pagination on portals with a NEXT_LINK; returns (jobs, failures)."""
+        if self.NEXT_LINK is not None:
+            return await self._crawl_async(fetcher, urls, max_pages)
+        return await self._scrape_urls_async(fetcher, urls, self.parse_page)
+    
+    async def _scrape_urls_async(self, fetcher: AsyncFetcher, urls: List[str],
+                                 parse: Callable[[bytes, Optional[str]], List[Dict]]) -> Tuple[List[Dict], int]:
+        """
+        Request urls concurrently and parse each body; returns (jobs, number of failed URLs).
+        
+        URLs disallowed by robots.txt are dropped and counted as failed.
+        """
+        allowed = await asyncio.to_thread(lambda: [url for url in urls if self.robots_allowed(url)])
+        failures = len(urls) - len(allowed)
+        urls = allowed
+        if not urls:
+            return [], failures
+        logger.info(f"Starting async scraping of {self.BASE_URL} ({len(urls)} pages)...")
+        
+        # Crawl state lives in the database; keep ORM calls off the event loop
+        states = {}
+        if self.url_state is not None:
+            states = await asyncio.to_thread(self.url_state.get_many, urls)
+        
+        responses = await asyncio.gather(
+            *(self._get_async(fetcher, url, states.get(url)) for url in urls), return_exceptions=True
+        )
+        
+        jobs = []
+        for url, response in zip(urls, responses):
+            if isinstance(response, Exception):
+                logger.warning(f"Error fetching {url}: {response}")
+                failures += 1
+                continue
+            try:
+                if self.url_state is not None:
+                    unchanged = await asyncio.to_thread(
+                        self.check_page, url, response.status_code,
+                        response.headers, response.content, states.get(url)
+                    )
+                    if unchanged:
+                        continue
+                response.raise_for_status()
+                encoding = charset_from_headers(response.headers)
+                # Parse, or wait for the parse pool's worker process, off the event loop
+                jobs.extend(await asyncio.to_thread(parse, response.content, encoding))
+            except Exception as e:
+                logger.warning(f"Error scraping {url}: {e}")
+                failures += 1
+        
+        logger.info(f"Scraped {len(jobs)} jobs from {self.BASE_URL}")
+        return jobs, failures
+    
+    async def _get_async(self, fetcher: AsyncFetcher, url: str, state=None):
+        """Request url with the conditional headers of its crawl state, recording the outcome."""
+        self.check_circuit()
+        headers = dict(self.REQUEST_HEADERS or {})
+        if self.url_state is not None:
+            headers.update(self.url_state.conditional_headers(url, state))
+        started = time.monotonic()
+        try:
+            response = await fetcher.get(url, headers=headers or None, max_bytes=self.MAX_PAGE_BYTES)
+        except Exception:
+            self._record_request(False, None)
+            self.record_outcome(False)
+            raise
+        self._record_request(response.status_code < 400, (time.monotonic() - started) * 1000)
+        self._record_transfer(response)
+        self.record_outcome(response.status_code < 400)
+        return response
+    
+    async def _fetch_listing_page_async(self, fetcher: AsyncFetcher, url: str) -> ListingPage:
+        """Async counterpart of fetch_listing_page()."""
+        await asyncio.to_thread(self.check_robots, url)
+        state = None
+        if self.url_state is not None:
+            state = (await asyncio.to_thread(self.url_state.get_many, [url])).get(url)
+        response = await self._get_async(fetcher, url, state)
+        if self.url_state is not None:
+            unchanged = await asyncio.to_thread(
+                self.check_page, url, response.status_code, response.headers, response.content, state
+            )
+            if unchanged:
+                return ListingPage(url, [], None, None, unchanged=True)
+        response.raise_for_status()
+        
+        next_links = []
+        encoding = charset_from_headers(response.headers)
+        # Parsing in this thread would hold up every request in flight on the event loop
+        jobs = await asyncio.to_thread(self.parse_listing, response.content, encoding, next_links)
+        self._record_page(len(jobs))
+        next_url = urljoin(url, next_links[0]) if next_links and next_links[0] else None
+        return ListingPage(url, jobs, next_url, content_digest(response.content))
+    
+    async def _crawl_async(self, fetcher: AsyncFetcher, seed_urls: List[str],
+                           max_pages: int) -> Tuple[List[Dict], int]:
+        """
+        Follow the next-page links of each seed listing on the event loop.
+        
+        Seed chains run concurrently, the pages of a chain one after another,
+        and a chain stops where CrawlFrontier's would: on an empty or repeated
+        page, a page of jobs known from earlier runs, a page unchanged since
+        the last run (with a watermark) or a page without a next-page link.
+        Jobs are deduplicated across chains, and the job IDs seen are kept for
+        the watermark once every chain is done. Returns (jobs, number of seeds whose first page failed).
+        """
+        known_job_ids = await asyncio.to_thread(self.known_job_ids)
+        seen_urls, seen_digests, seen_job_ids = set(), set(), set()
+        
+        async def chain(seed_url):
+            jobs, accepted = [], []
+            url, page = seed_url, 1
+            while url and page <= max_pages and url not in seen_urls:
+                seen_urls.add(url)
+                try:
+                    result = await self._fetch_listing_page_async(fetcher, url)
+                except Exception as e:
+                    logger.warning(f"Error scraping page {page} ({url}): {e}")
+                    if page == 1:
+                        raise
+                    break
+                
+                if result.unchanged:
+                    if known_job_ids:
+                        logger.info(f"Page {page} unchanged since the last run, stopping pagination")
+                        break
+                    # Unchanged pages are not parsed, so only a guess can continue the chain
+                    url, page = self.guess_next_page_url(url, page + 1), page + 1
+                    continue
+                new_jobs = [job for job in result.jobs if job.get('job_id') not in seen_job_ids]
+                if not result.jobs:
+                    logger.info(f"Page {page} is empty, stopping pagination")
+                    break
+                if result.digest in seen_digests or not new_jobs:
+                    logger.info(f"Page {page} repeats an earlier page, stopping pagination")
+                    break
+                if all(job.get('job_id') in known_job_ids for job in result.jobs):
+                    logger.info(f"Page {page} only has jobs seen by earlier runs, stopping pagination")
+                    accepted.extend(job.get('job_id') for job in new_jobs)
+                    break
+                
+                seen_digests.add(result.digest)
+                seen_job_ids.update(job.get('job_id') for job in new_jobs)
+                accepted.extend(job.get('job_id') for job in new_jobs)
+                jobs.extend(new_jobs)
+                logger.info(f"Page {page}: Scraped {len(new_jobs)} new jobs from {url}")
+                url, page = result.next_url, page + 1
+            return jobs, accepted
+        
+        outcomes = await asyncio.gather(*(chain(url) for url in dict.fromkeys(seed_urls)), return_exceptions=True)
+        jobs, accepted, failures = [], [], 0
+        for outcome in outcomes:
+            if isinstance(outcome, Exception):
+                failures += 1
+                continue
+            jobs.extend(outcome[0])
+            accepted.extend(outcome[1])
+        self.add_seen_job_ids(accepted)
+        return jobs, failures
     
     def is_ai_ml_job(self, title: str, description: str) -> Tuple[bool, float]:
         """
@@ -47,32 +1050,239 @@ class BaseScraper:
         Returns:
             Tuple of (is_ai_ml, confidence_score)
         """
-        combined_text = f"{title} {description}".lower()
-        matches = sum(1 for keyword in AI_ML_KEYWORDS if keyword in combined_text)
+        return self._ai_ml_rule(TAXONOMY_MATCHER.category_matches(f"{title} {description}"))
+    
+    @staticmethod
+    def _ai_ml_rule(category_matches: Dict[str, Set[str]]) -> Tuple[bool, float]:
+        """Keyword rule of is_ai_ml_job, from a job's TaxonomyMatcher.category_matches()."""
+        matches = len(category_matches.get(AI_ML, ()))
         
         total_keywords = len(AI_ML_KEYWORDS)
         confidence = (matches / total_keywords) * 100 if total_keywords > 0 else 0
         
-        # Threshold: at least 2 keywords or 20% confidence
-        is_ai_ml = matches >= 2 or confidence >= 20
+        # Threshold: the AI/ML category's min_matches (default 2) or 20% confidence
+        is_ai_ml = matches >= TAXONOMY_MATCHER.categories[AI_ML].min_matches or confidence >= 20
         
         return is_ai_ml, confidence
     
+    def classify_batch(self, jobs: Sequence[Tuple[str, str]],
+                       classifier: LinearJobClassifier = None) -> List[Tuple[bool, float, List[str]]]:
+        """
+        Classify and tag many (title, description) pairs at once; see is_ai_ml_job
+        and scraper.taxonomy.
+        
+        The keyword rule and every category tag come from one pass over each
+        job's text. The 'ai_ml' tag follows the AI/ML flag, so the two always agree.
+        
+        Args:
+            jobs: (title, description) pairs
+            classifier: Trained model scoring the whole batch with array operations.
+                If None, the keyword rule decides the AI/ML flag.
+        
+        Returns:
+            List of (is_ai_ml, confidence_score, categories), in the order of jobs
+        """
+        matches = [TAXONOMY_MATCHER.category_matches(f"{title} {description}") for title, description in jobs]
+        if classifier is not None:
+            flags = classifier.classify(jobs)
+        else:
+            flags = [self._ai_ml_rule(job_matches) for job_matches in matches]
+        results = []
+        for (is_ai_ml, score), job_matches in zip(flags, matches):
+            categories = [name for name in TAXONOMY_MATCHER.select(job_matches) if name != AI_ML]
+            if is_ai_ml:
+                categories = sorted(categories + [AI_ML])
+            results.append((is_ai_ml, score, categories))
+        return results
+    
+    def keyword_hits(self, title: str, description: str) -> Dict[str, List[int]]:
+        """
+        Return the AI/ML keywords found in a job, each with its character offsets.
+        
+        Offsets are into f"{title} {description}"; keywords match whole words only
+        (see scraper.keywords).
+        """
+        return TAXONOMY_MATCHER.find_in(AI_ML, f"{title} {description}")
+    
     def get_posted_time(self, posted_str: str) -> datetime:
         """Parse posted time string to datetime."""
         # Default: current time
         return datetime.now()
     
     def close(self):
-        """Close the session."""
-        self.session.close()
+        """Close the session unless it is borrowed from a shared pool."""
+        if self._owns_session:
+            self.session.close()
+
+
+class CrawlFrontier:
+    """
+    Concurrent pagination frontier usable by any BaseScraper subclass.
+    
+    Starting from each seed URL, pages are fetched on a small thread pool.
+    While one page is in flight, the scraper's guess_next_page_url() lets the
+    frontier prefetch the following pages speculatively, up to `concurrency`
+    pages ahead. Pages are accepted strictly in order:
+    
+    - the chain stops on an empty page, a page whose body or job IDs were
+      already seen, or a page without a next-page link;
+    - with a watermark, the chain also stops at the first page made up only of
+      jobs known from earlier runs. Speculation then starts one page deep and
+      widens once a page turns out to be entirely new, so a steady-state run
+      costs about one page;
+    - if the next-page link (NEXT_LINK) differs from the guess, speculative pages
+      are discarded and the real link is followed instead;
+    - URLs and job IDs are deduplicated across all chains.
+    
+    Every page still waits on the scraper's per-host RateLimiter, so pages in
+    flight at once beyond the host's token bucket burst would only queue
+    behind it while spending tokens on guesses. The prefetch window is capped
+    at that burst. The default burst of 3 lets the default 3 pages overlap;
+    a larger `concurrency` needs a larger burst (RateLimiter host_limits),
+    and a robots.txt Crawl-delay sets the burst back to 1, i.e. one page at
+    a time.
+    """
+    
+    def __init__(self, scraper: BaseScraper, max_pages: int = 3, concurrency: int = 3):
+        self.scraper = scraper
+        self.max_pages = max_pages
+        self.concurrency = max(1, concurrency)
+        self._seen_urls = set()
+        self._seen_digests = set()
+        self._seen_job_ids = set()
+        self._known_job_ids = scraper.known_job_ids()
+        self._window = 1 if self._known_job_ids else self.concurrency
+        self._accepted_job_ids = []
+    
+    def crawl(self, seed_urls: List[str]) -> List[Dict]:
+        """Crawl every seed chain and return the deduplicated jobs."""
+        return list(self.stream(seed_urls))
+    
+    def stream(self, seed_urls: List[str]) -> Iterator[Dict]:
+        """
+        Crawl every seed chain, yielding deduplicated jobs page by page.
+        
+        The job IDs seen are only handed to the scraper for its watermark once
+        the whole crawl has been consumed.
+        """
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for seed_url in seed_urls:
+                if seed_url in self._seen_urls:
+                    continue
+                yield from self._crawl_chain(executor, seed_url)
+        self.scraper.add_seen_job_ids(self._accepted_job_ids)
+    
+    def _crawl_chain(self, executor: ThreadPoolExecutor, seed_url: str) -> Iterator[Dict]:
+        pending = deque()  # (page_number, url, future) in page order
+        
+        def submit(page: int, url: str):
+            self._seen_urls.add(url)
+            pending.append((page, url, executor.submit(self.scraper.fetch_listing_page, url)))
+        
+        def prefetch():
+            # Keep the window full with guessed URLs following the last scheduled page
+            window = min(self._window, self.scraper.rate_limiter.bucket(seed_url).burst)
+            while pending and len(pending) < window:
+                last_page, last_url, _ = pending[-1]
+                if last_page >= self.max_pages:
+                    break
+                guess = self.scraper.guess_next_page_url(last_url, last_page + 1)
+                if not guess or guess in self._seen_urls:
+                    break
+                submit(last_page + 1, guess)
+        
+        def discard_pending():
+            while pending:
+                _, url, future = pending.popleft()
+                future.cancel()
+                self._seen_urls.discard(url)
+        
+        submit(1, seed_url)
+        prefetch()
+        
+        while pending:
+            page, url, future = pending.popleft()
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.warning(f"Error scraping page {page} ({url}): {e}")
+                discard_pending()
+                break
+            
+            if not result.unchanged:
+                new_jobs = [job for job in result.jobs if job.get('job_id') not in self._seen_job_ids]
+                if not result.jobs:
+                    logger.info(f"Page {page} is empty, stopping pagination")
+                    discard_pending()
+                    break
+                if result.digest in self._seen_digests or not new_jobs:
+                    logger.info(f"Page {page} repeats an earlier page, stopping pagination")
+                    discard_pending()
+                    break
+                known = sum(1 for job in result.jobs if job.get('job_id') in self._known_job_ids)
+                if known == len(result.jobs):
+                    logger.info(f"Page {page} only has jobs seen by earlier runs, stopping pagination")
+                    self._accepted_job_ids.extend(job.get('job_id') for job in new_jobs)
+                    discard_pending()
+                    break
+                if not known:
+                    self._window = self.concurrency
+                
+                self._seen_digests.add(result.digest)
+                self._seen_job_ids.update(job.get('job_id') for job in new_jobs)
+                self._accepted_job_ids.extend(job.get('job_id') for job in new_jobs)
+                logger.info(f"Page {page}: Scraped {len(new_jobs)} new jobs from {url}")
+                yield from new_jobs
+                
+                if not result.next_url:
+                    logger.info(f"No next page after page {page}")
+                    discard_pending()
+                    break
+                
+                # Drop speculative pages if the real next link differs from the guess
+                if pending and pending[0][1] != result.next_url:
+                    discard_pending()
+                if not pending and page < self.max_pages:
+                    if result.next_url in self._seen_urls:
+                        logger.info(f"Next page {result.next_url} already crawled, stopping pagination")
+                        break
+                    submit(page + 1, result.next_url)
+            elif self._known_job_ids:
+                logger.info(f"Page {page} unchanged since the last run, stopping pagination")
+                discard_pending()
+                break
+            elif not pending and page < self.max_pages:
+                # Unchanged pages are not parsed, so only a guess can continue the chain
+                guess = self.scraper.guess_next_page_url(url, page + 1)
+                if guess and guess not in self._seen_urls:
+                    submit(page + 1, guess)
+            
+            prefetch()
 
 
 class GuruScraper(BaseScraper):
     """Scraper for Guru.com"""
     
+    PORTAL = "guru"
     BASE_URL = "https://www.guru.com"
     JOBS_ENDPOINT = "/api/jobs"
+    LISTING_PATH = "/jobs"
+    REQUEST_HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+        'Accept': 'application/json',
+    }
+    # Guru uses dynamic loading: listings embedded as JSON are read first (EMBEDDED_JSON), then the cards
+    JOB_CONTAINERS = [ContainerSpec('div', css_class='job-item')]
+    PREFIXED_JOB_IDS = False
+    FIELDS = FieldSet(
+        job_id=Field(attr='data-job-id'),
+        link=Field('a', attr='href'),
+        title=Field('h2.job-title', 'h3', 'a'),
+        description=Field('p.job-description', 'div.description', 'p', max_length=500),
+        url=Field('a.job-link', 'a', attr='href'),
+        company_name=Field('span.company-name', 'div.company', 'span'),
+        posted_at=Field('span.posted-time', 'span.time'),
+    )
     
     def scrape_jobs(self) -> List[Dict]:
         """
@@ -81,32 +1291,9 @@ class GuruScraper(BaseScraper):
         """
         try:
             logger.info("Starting Guru.com scraping...")
-            jobs = []
             
             # Attempt to fetch from jobs page
-            url = f"{self.BASE_URL}/jobs"
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                'Accept': 'application/json',
-            }
-            
-            response = self.session.get(url, headers=headers, timeout=self.timeout)
-            response.raise_for_status()
-            
-            # Parse response
-            soup = BeautifulSoup(response.content, 'lxml')
-            
-            # Guru uses dynamic loading, so we'll need to parse what's available
-            job_elements = soup.find_all('div', class_='job-item')
-            
-            for element in job_elements:
-                try:
-                    job = self._parse_guru_job(element)
-                    if job:
-                        jobs.append(job)
-                except Exception as e:
-                    logger.error(f"Error parsing Guru job: {e}")
-                    continue
+            jobs = list(self.stream_jobs())
             
             logger.info(f"Scraped {len(jobs)} jobs from Guru.com")
             return jobs
@@ -115,71 +1302,32 @@ class GuruScraper(BaseScraper):
             logger.error(f"Error scraping Guru.com: {e}")
             return []
     
+    def _parse_job(self, element) -> Optional[Dict]:
+        return self._parse_guru_job(element)
+    
     def _parse_guru_job(self, element) -> Dict:
         """Parse a single job element from Guru."""
         try:
-            # Try multiple ways to get job ID
-            job_id = element.get('data-job-id', '')
-            if not job_id:
-                url_elem = element.find('a')
-                if url_elem and 'href' in url_elem.attrs:
-                    job_id = url_elem['href'].split('/')[-1]
-            
-            # Try multiple selectors for title
-            title = element.find('h2', class_='job-title')
-            if not title:
-                title = element.find('h3')
-            if not title:
-                title = element.find('a')
+            fields = self.FIELDS.extract(element, self.backend)
             
-            if not title:
-                return None
-            
-            title_text = title.get_text(strip=True)
+            title_text = fields['title']
             if not title_text:
                 return None
             
-            # Find description - try multiple selectors
-            description = element.find('p', class_='job-description')
-            if not description:
-                description = element.find('div', class_='description')
-            if not description:
-                description = element.find('p')
-            
-            description_text = description.get_text(strip=True)[:500] if description else ''
-            
-            # Find URL
-            url = element.find('a', class_='job-link')
-            if not url:
-                url = element.find('a')
+            # Fall back to the last path segment of the first link for the job ID
+            job_id = fields['job_id'] or fields['link'].split('/')[-1]
             
-            url_text = url.get('href', '') if url else ''
+            url_text = fields['url']
             if url_text and not url_text.startswith('http'):
                 url_text = self.BASE_URL + url_text
             
-            # Find company name
-            company = element.find('span', class_='company-name')
-            if not company:
-                company = element.find('div', class_='company')
-            if not company:
-                company = element.find('span')
-            
-            company_text = company.get_text(strip=True) if company else 'Unknown'
-            
-            # Find posted time
-            posted_at = element.find('span', class_='posted-time')
-            if not posted_at:
-                posted_at = element.find('span', class_='time')
-            
-            posted_text = posted_at.get_text(strip=True) if posted_at else ''
-            
             return {
                 'job_id': job_id or f"guru_{title_text[:20]}",
                 'title': title_text,
-                'description': description_text,
+                'description': fields['description'],
                 'url': url_text,
-                'company_name': company_text or 'Unknown',
-                'posted_at': posted_text,
+                'company_name': fields['company_name'] or 'Unknown',
+                'posted_at': fields['posted_at'],
                 'source': 'guru'
             }
         except Exception as e:
@@ -190,29 +1338,27 @@ class GuruScraper(BaseScraper):
 class TruelancerScraper(BaseScraper):
     """Scraper for Truelancer.com"""
     
+    PORTAL = "truelancer"
     BASE_URL = "https://www.truelancer.com"
+    LISTING_PATH = "/projects"
+    JOB_CONTAINERS = [ContainerSpec('div', css_class='project-item')]
+    PREFIXED_JOB_IDS = False
+    FIELDS = FieldSet(
+        job_id=Field(attr='data-project-id'),
+        link=Field('a', attr='href'),
+        title=Field('h3.project-title', 'h3', 'h2', 'a'),
+        description=Field('p.project-desc', 'p.description', 'p', max_length=500),
+        url=Field('a.project-link', 'a', attr='href'),
+        company_name=Field('span.client-name', 'span.author', 'div.client'),
+        posted_at=Field('span.posted-time', 'span.time'),
+    )
     
     def scrape_jobs(self) -> List[Dict]:
         """Scrape jobs from Truelancer.com"""
         try:
             logger.info("Starting Truelancer.com scraping...")
-            jobs = []
             
-            url = f"{self.BASE_URL}/projects"
-            response = self.session.get(url, timeout=self.timeout)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'lxml')
-            project_elements = soup.find_all('div', class_='project-item')
-            
-            for element in project_elements:
-                try:
-                    job = self._parse_truelancer_job(element)
-                    if job:
-                        jobs.append(job)
-                except Exception as e:
-                    logger.error(f"Error parsing Truelancer job: {e}")
-                    continue
+            jobs = list(self.stream_jobs())
             
             logger.info(f"Scraped {len(jobs)} jobs from Truelancer.com")
             return jobs
@@ -221,73 +1367,32 @@ class TruelancerScraper(BaseScraper):
             logger.error(f"Error scraping Truelancer.com: {e}")
             return []
     
+    def _parse_job(self, element) -> Optional[Dict]:
+        return self._parse_truelancer_job(element)
+    
     def _parse_truelancer_job(self, element) -> Dict:
         """Parse a single job element from Truelancer."""
         try:
-            # Try multiple ways to get job ID
-            job_id = element.get('data-project-id', '')
-            if not job_id:
-                url_elem = element.find('a')
-                if url_elem and 'href' in url_elem.attrs:
-                    job_id = url_elem['href'].split('/')[-1]
-            
-            # Try multiple selectors for title
-            title = element.find('h3', class_='project-title')
-            if not title:
-                title = element.find('h3')
-            if not title:
-                title = element.find('h2')
-            if not title:
-                title = element.find('a')
+            fields = self.FIELDS.extract(element, self.backend)
             
-            if not title:
-                return None
-            
-            title_text = title.get_text(strip=True)
+            title_text = fields['title']
             if not title_text:
                 return None
             
-            # Find description
-            description = element.find('p', class_='project-desc')
-            if not description:
-                description = element.find('p', class_='description')
-            if not description:
-                description = element.find('p')
-            
-            description_text = description.get_text(strip=True)[:500] if description else ''
+            # Fall back to the last path segment of the first link for the job ID
+            job_id = fields['job_id'] or fields['link'].split('/')[-1]
             
-            # Find URL
-            url = element.find('a', class_='project-link')
-            if not url:
-                url = element.find('a')
-            
-            url_text = url.get('href', '') if url else ''
+            url_text = fields['url']
             if url_text and not url_text.startswith('http'):
                 url_text = self.BASE_URL + url_text
             
-            # Find company/client name
-            company = element.find('span', class_='client-name')
-            if not company:
-                company = element.find('span', class_='author')
-            if not company:
-                company = element.find('div', class_='client')
-            
-            company_text = company.get_text(strip=True) if company else 'Unknown'
-            
-            # Find posted time
-            posted_at = element.find('span', class_='posted-time')
-            if not posted_at:
-                posted_at = element.find('span', class_='time')
-            
-            posted_text = posted_at.get_text(strip=True) if posted_at else ''
-            
             return {
                 'job_id': job_id or f"truelancer_{title_text[:20]}",
                 'title': title_text,
-                'description': description_text,
+                'description': fields['description'],
                 'url': url_text,
-                'company_name': company_text or 'Unknown',
-                'posted_at': posted_text,
+                'company_name': fields['company_name'] or 'Unknown',
+                'posted_at': fields['posted_at'],
                 'source': 'truelancer'
             }
         except Exception as e:
@@ -298,29 +1403,26 @@ class TruelancerScraper(BaseScraper):
 class TwineScraper(BaseScraper):
     """Scraper for Twine.com"""
     
+    PORTAL = "twine"
     BASE_URL = "https://www.twine.com"
+    LISTING_PATH = "/jobs"
+    JOB_CONTAINERS = [ContainerSpec('div', css_class='job-card')]
+    PREFIXED_JOB_IDS = False
+    FIELDS = FieldSet(
+        job_id=Field(attr='data-job-id'),
+        title=Field('h4.job-title'),
+        description=Field('p.job-description'),
+        url=Field('a.job-url', attr='href'),
+        company_name=Field('span.company-name'),
+        posted_at=Field('span.post-date'),
+    )
     
     def scrape_jobs(self) -> List[Dict]:
         """Scrape jobs from Twine.com"""
         try:
             logger.info("Starting Twine.com scraping...")
-            jobs = []
-            
-            url = f"{self.BASE_URL}/jobs"
-            response = self.session.get(url, timeout=self.timeout)
-            response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'lxml')
-            job_elements = soup.find_all('div', class_='job-card')
-            
-            for element in job_elements:
-                try:
-                    job = self._parse_twine_job(element)
-                    if job:
-                        jobs.append(job)
-                except Exception as e:
-                    logger.error(f"Error parsing Twine job: {e}")
-                    continue
+            jobs = list(self.stream_jobs())
             
             logger.info(f"Scraped {len(jobs)} jobs from Twine.com")
             return jobs
@@ -329,28 +1431,18 @@ class TwineScraper(BaseScraper):
             logger.error(f"Error scraping Twine.com: {e}")
             return []
     
+    def _parse_job(self, element) -> Optional[Dict]:
+        return self._parse_twine_job(element)
+    
     def _parse_twine_job(self, element) -> Dict:
         """Parse a single job element from Twine."""
         try:
-            job_id = element.get('data-job-id', '')
-            title = element.find('h4', class_='job-title')
-            description = element.find('p', class_='job-description')
-            url = element.find('a', class_='job-url')
-            company = element.find('span', class_='company-name')
-            posted_at = element.find('span', class_='post-date')
-            
-            if not all([job_id, title, description]):
+            fields = self.FIELDS.extract(element, self.backend)
+            
+            if not all([fields['job_id'], fields['title'], fields['description']]):
                 return None
             
-            return {
-                'job_id': job_id,
-                'title': title.get_text(strip=True) if title else '',
-                'description': description.get_text(strip=True) if description else '',
-                'url': url.get('href', '') if url else '',
-                'company_name': company.get_text(strip=True) if company else '',
-                'posted_at': posted_at.get_text(strip=True) if posted_at else '',
-                'source': 'twine'
-            }
+            return dict(fields, source='twine')
         except Exception as e:
             logger.error(f"Error parsing Twine job element: {e}")
             return None
@@ -359,29 +1451,26 @@ class TwineScraper(BaseScraper):
 class RemoteWorkScraper(BaseScraper):
     """Scraper for RemoteWork.com"""
     
+    PORTAL = "remotework"
     BASE_URL = "https://www.remotework.com"
+    LISTING_PATH = "/remote-jobs"
+    JOB_CONTAINERS = [ContainerSpec('div', css_class='job-listing')]
+    PREFIXED_JOB_IDS = False
+    FIELDS = FieldSet(
+        job_id=Field(attr='data-job-id'),
+        title=Field('h3.job-name'),
+        description=Field('p.job-summary'),
+        url=Field('a.job-url', attr='href'),
+        company_name=Field('span.employer-name'),
+        posted_at=Field('span.posted-on'),
+    )
     
     def scrape_jobs(self) -> List[Dict]:
         """Scrape jobs from RemoteWork.com"""
         try:
             logger.info("Starting RemoteWork.com scraping...")
-            jobs = []
-            
-            url = f"{self.BASE_URL}/remote-jobs"
-            response = self.session.get(url, timeout=self.timeout)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'lxml')
-            job_elements = soup.find_all('div', class_='job-listing')
             
-            for element in job_elements:
-                try:
-                    job = self._parse_remotework_job(element)
-                    if job:
-                        jobs.append(job)
-                except Exception as e:
-                    logger.error(f"Error parsing RemoteWork job: {e}")
-                    continue
+            jobs = list(self.stream_jobs())
             
             logger.info(f"Scraped {len(jobs)} jobs from RemoteWork.com")
             return jobs
@@ -390,28 +1479,18 @@ class RemoteWorkScraper(BaseScraper):
             logger.error(f"Error scraping RemoteWork.com: {e}")
             return []
     
+    def _parse_job(self, element) -> Optional[Dict]:
+        return self._parse_remotework_job(element)
+    
     def _parse_remotework_job(self, element) -> Dict:
         """Parse a single job element from RemoteWork."""
         try:
-            job_id = element.get('data-job-id', '')
-            title = element.find('h3', class_='job-name')
-            description = element.find('p', class_='job-summary')
-            url = element.find('a', class_='job-url')
-            company = element.find('span', class_='employer-name')
-            posted_at = element.find('span', class_='posted-on')
-            
-            if not all([job_id, title, description]):
+            fields = self.FIELDS.extract(element, self.backend)
+            
+            if not all([fields['job_id'], fields['title'], fields['description']]):
                 return None
             
-            return {
-                'job_id': job_id,
-                'title': title.get_text(strip=True) if title else '',
-                'description': description.get_text(strip=True) if description else '',
-                'url': url.get('href', '') if url else '',
-                'company_name': company.get_text(strip=True) if company else '',
-                'posted_at': posted_at.get_text(strip=True) if posted_at else '',
-                'source': 'remotework'
-            }
+            return dict(fields, source='remotework')
         except Exception as e:
             logger.error(f"Error parsing RemoteWork job element: {e}")
             return None
@@ -420,7 +1499,63 @@ class RemoteWorkScraper(BaseScraper):
 class WeWorkRemotelyScraper(BaseScraper):
     """Scraper for WeWorkRemotely.com"""
     
+    PORTAL = "weworkremotely"
     BASE_URL = "https://weworkremotely.com"
+    LISTING_PATH = "/remote-jobs"
+    # WeWorkRemotely uses li.feature for job listings, with older layouts as fallbacks
+    JOB_CONTAINERS = [
+        ContainerSpec('li', css_class='feature'),
+        ContainerSpec('div', css_class='job'),
+        ContainerSpec('div', attr='data-job-id'),
+    ]
+    NEXT_LINK = ContainerSpec('a', attr='rel', attr_value='next')
+    FIELDS = FieldSet(
+        title=Field('h3.new-listing__header__title', 'h3', 'h2'),
+        url=Field('a.listing-link--unlocked', 'a[href*="/remote-jobs/"]', attr='href'),
+        meta_info=Field('p.new-listing__header__icons__date'),
+    )
+    DETAIL_DESCRIPTION = Field('div.lis-container__job__content__description', '[itemprop="description"]',
+                               'div.listing-container', separator=' ')
+    # Selectors used by _extract_company_name
+    COMPANY_LINK = compile_selector('a[href*="/company/"]')
+    LISTING_HEADER = compile_selector('div.new-listing__header')
+    LINK = compile_selector('a')
+    COMPANY_SECTION = compile_selector('div.new-listing__company')
+    # Every open job, with exact publish dates, in a fraction of the listing pages' bytes
+    FEED_PATHS = ['/remote-jobs.rss']
+    # Targeted crawls: the programming categories and board searches, instead of the whole board
+    CATEGORY_PATHS = ['/categories/remote-back-end-programming-jobs', '/categories/remote-full-stack-programming-jobs']
+    CATEGORY_FEED_PATHS = [f'{path}.rss' for path in CATEGORY_PATHS]
+    SEARCH_PATH = '/remote-jobs/search?term={query}'
+    
+    def _parse_feed_entry(self, entry: FeedEntry) -> Optional[Dict]:
+        """Feed titles read "Company: Job title"."""
+        job = super()._parse_feed_entry(entry)
+        if job and ': ' in job['title']:
+            company_name, title = job['title'].split(': ', 1)
+            job.update(title=title.strip(), company_name=company_name.strip())
+        return job
+    
+    def get_page_urls(self, max_pages: int = 1) -> List[str]:
+        """Return /remote-jobs followed by /remote-jobs?page=N for each further page."""
+        urls = [f"{self.BASE_URL}{self.LISTING_PATH}"]
+        for page in range(2, max_pages + 1):
+            urls.append(self.guess_next_page_url(urls[-1], page))
+        return urls
+    
+    def guess_next_page_url(self, url: str, page: int) -> Optional[str]:
+        """WeWorkRemotely listings, the board as well as categories and searches, page with ?page=N."""
+        parts = urlsplit(url)
+        query = [(key, value) for key, value in parse_qsl(parts.query) if key != 'page']
+        return urlunsplit(parts._replace(query=urlencode(query + [('page', page)])))
+    
+    def stream_jobs(self, max_pages: int = 3, seed_urls: List[str] = None) -> Iterator[Dict]:
+        """
+        Yield jobs page by page, following pagination through a CrawlFrontier.
+        
+        The frontier deduplicates job IDs across the seed URLs of a targeted crawl.
+        """
+        return self.stream_crawl(seed_urls or [f"{self.BASE_URL}{self.LISTING_PATH}"], max_pages=max_pages)
     
     def scrape_jobs(self, max_pages: int = 3) -> List[Dict]:
         """
@@ -431,60 +1566,8 @@ class WeWorkRemotelyScraper(BaseScraper):
         """
         try:
             logger.info(f"Starting WeWorkRemotely.com scraping (max {max_pages} pages)...")
-            jobs = []
             
-            for page in range(1, max_pages + 1):
-                try:
-                    # Pagination URL format
-                    if page == 1:
-                        url = f"{self.BASE_URL}/remote-jobs"
-                    else:
-                        url = f"{self.BASE_URL}/remote-jobs?page={page}"
-                    
-                    logger.info(f"Scraping page {page}: {url}")
-                    response = self.session.get(url, timeout=self.timeout)
-                    response.raise_for_status()
-                    
-                    soup = BeautifulSoup(response.content, 'lxml')
-                    
-                    # WeWorkRemotely uses li.feature for job listings
-                    job_elements = soup.find_all('li', class_='feature')
-                    
-                    if not job_elements:
-                        # Try alternative selectors
-                        job_elements = soup.find_all('div', class_='job')
-                    
-                    if not job_elements:
-                        # Try finding all list items and filter
-                        job_elements = soup.find_all('div', {'data-job-id': True})
-                    
-                    logger.info(f"Page {page}: Found {len(job_elements)} job elements to parse")
-                    
-                    page_jobs = 0
-                    for element in job_elements:
-                        try:
-                            job = self._parse_weworkremotely_job(element)
-                            if job and job.get('title') and 'View' not in job.get('title', ''):
-                                jobs.append(job)
-                                page_jobs += 1
-                        except Exception as e:
-                            logger.debug(f"Error parsing WeWorkRemotely job: {e}")
-                            continue
-                    
-                    logger.info(f"Page {page}: Scraped {page_jobs} valid jobs")
-                    
-                    # Check if there's a next page
-                    next_button = soup.find('a', {'rel': 'next'})
-                    if not next_button and page == 1:
-                        # Only 1 page available
-                        logger.info("Only 1 page of results available")
-                        break
-                    
-                    time.sleep(1)  # Be respectful to the server
-                    
-                except Exception as e:
-                    logger.warning(f"Error scraping page {page}: {e}")
-                    break
+            jobs = list(self.stream_jobs(max_pages=max_pages))
             
             logger.info(f"Scraped {len(jobs)} total valid jobs from WeWorkRemotely.com")
             return jobs
@@ -493,45 +1576,31 @@ class WeWorkRemotelyScraper(BaseScraper):
             logger.error(f"Error scraping WeWorkRemotely.com: {e}")
             return []
     
+    def _parse_job(self, element) -> Optional[Dict]:
+        job = self._parse_weworkremotely_job(element)
+        if job and job.get('title') and 'View' not in job.get('title', ''):
+            return job
+        return None
+    
     def _parse_weworkremotely_job(self, element) -> Dict:
         """Parse a single job element from WeWorkRemotely."""
         try:
             # WeWorkRemotely structure: h3.new-listing__header__title
-            title_elem = element.find('h3', class_='new-listing__header__title')
-            if not title_elem:
-                title_elem = element.find('h3')
-            if not title_elem:
-                title_elem = element.find('h2')
-            
-            if not title_elem:
-                return None
+            fields = self.FIELDS.extract(element, self.backend)
             
-            title = title_elem.get_text(strip=True)
+            title = fields['title']
             if not title:
                 return None
             
-            # Find the main job link
-            job_link = element.find('a', class_='listing-link--unlocked')
-            if not job_link:
-                job_link = element.find('a', {'href': lambda x: x and '/remote-jobs/' in x})
-            
-            url = job_link.get('href', '') if job_link else ''
+            url = fields['url']
             if url and not url.startswith('http'):
                 url = self.BASE_URL + url
             
             # Find company name - improved extraction
             company_name = self._extract_company_name(element, title)
             
-            # Get description from the listing text or meta info
-            description = ''
-            # Try to extract salary or job type as part of description
-            meta_info = element.find('p', class_='new-listing__header__icons__date')
-            if not meta_info:
-                # Get all text as description
-                all_text = element.get_text(separator=' ', strip=True)
-                description = all_text[:300]
-            else:
-                description = meta_info.get_text(strip=True)
+            # Get description from the meta info (salary, job type) or else the listing text
+            description = fields['meta_info'] or self.backend.text(element, separator=' ')[:300]
             
             # Create job ID
             job_id = f"weworkremotely_{url.split('/')[-1]}" if url else f"weworkremotely_{title[:20]}"
@@ -554,24 +1623,25 @@ class WeWorkRemotelyScraper(BaseScraper):
         Improved extraction to handle various formats.
         """
         company_name = 'Unknown'
+        backend = self.backend
         
         try:
             # Method 1: Find company link explicitly
-            company_link = element.find('a', {'href': lambda x: x and '/company/' in x})
-            if company_link:
-                text = company_link.get_text(strip=True)
+            company_link = backend.select_first(element, self.COMPANY_LINK)
+            if company_link is not None:
+                text = backend.text(company_link)
                 if text and 'View Company Profile' not in text:
                     return text
             
             # Method 2: Look for company name in structured format
             # WeWorkRemotely often has: Title | Company | Location
-            header = element.find('div', class_='new-listing__header')
-            if header:
+            header = backend.select_first(element, self.LISTING_HEADER)
+            if header is not None:
                 # Try to find company info in the header area
-                all_links = header.find_all('a')
+                all_links = backend.select(header, self.LINK)
                 for link in all_links:
-                    href = link.get('href', '')
-                    text = link.get_text(strip=True)
+                    href = backend.attr(link, 'href')
+                    text = backend.text(link)
                     
                     # Skip certain keywords
                     if any(skip in text.lower() for skip in ['view company', 'apply', 'save']):
@@ -583,7 +1653,7 @@ class WeWorkRemotelyScraper(BaseScraper):
                             return text
             
             # Method 3: Extract from full text pattern
-            full_text = element.get_text(separator=' ', strip=True)
+            full_text = backend.text(element, separator=' ')
             
             # Company is often between title and location/job type keywords
             if title in full_text:
@@ -604,9 +1674,9 @@ class WeWorkRemotelyScraper(BaseScraper):
                             return extracted
             
             # Method 4: Try to find company info container
-            company_section = element.find('div', class_='new-listing__company')
-            if company_section:
-                company_name_text = company_section.get_text(strip=True)
+            company_section = backend.select_first(element, self.COMPANY_SECTION)
+            if company_section is not None:
+                company_name_text = backend.text(company_section)
                 if company_name_text and 'View Company Profile' not in company_name_text:
                     return company_name_text
             
@@ -617,8 +1687,88 @@ class WeWorkRemotelyScraper(BaseScraper):
             return company_name
 
 
+class RemoteOKScraper(BaseScraper):
+    """Scraper for RemoteOK.com, via its public JSON API"""
+    
+    PORTAL = "remoteok"
+    BASE_URL = "https://remoteok.com"
+    LISTING_PATH = "/api"
+    REQUEST_HEADERS = {'Accept': 'application/json'}
+    # The API returns every open job as one JSON array of several megabytes
+    MAX_PAGE_BYTES = 32 * 1024 * 1024
+    # API records already carry the full description
+    DETAIL_DESCRIPTION = None
+    
+    def stream_jobs(self, max_pages: int = 1) -> Iterator[Dict]:
+        """
+        Yield jobs while the API response is still downloading.
+        
+        The array is parsed element by element as chunks arrive (see
+        scraper.parsing.iter_json_array), so the body is never held in memory
+        whole. With a response cache the body is buffered, see fetch_stream().
+        """
+        return self.stream_document(self.get_page_urls(max_pages)[0], self._iter_api_jobs)
+    
+    def scrape_jobs(self) -> List[Dict]:
+        """Scrape jobs from the RemoteOK API"""
+        try:
+            logger.info("Starting RemoteOK.com scraping...")
+            
+            jobs = list(self.stream_jobs())
+            
+            logger.info(f"Scraped {len(jobs)} jobs from RemoteOK.com")
+            return jobs
+            
+        except Exception as e:
+            logger.error(f"Error scraping RemoteOK.com: {e}")
+            return []
+    
+    def iter_jobs(self, content: bytes, next_links: Optional[List[str]] = None,
+                  encoding: Optional[str] = None) -> Iterator[Dict]:
+        """Yield jobs from an API response that was downloaded whole (async fetch mode, parse pool)."""
+        return self._iter_api_jobs([content], encoding)
+    
+    def _iter_api_jobs(self, chunks: Iterable[bytes], encoding: Optional[str] = None) -> Iterator[Dict]:
+        for record in iter_json_array(chunks, encoding):
+            job = self._parse_container(record)
+            if job:
+                yield job
+    
+    def _parse_job(self, element) -> Optional[Dict]:
+        return self._parse_remoteok_job(element)
+    
+    def _parse_remoteok_job(self, record) -> Optional[Dict]:
+        """Parse one API record; the array opens with a legal notice that is not a job."""
+        try:
+            if not isinstance(record, dict) or 'id' not in record:
+                return None
+            
+            title = (record.get('position') or '').strip()
+            company_name = (record.get('company') or '').strip()
+            if not title or not company_name:
+                return None
+            
+            slug = record.get('slug') or ''
+            url = record.get('url') or (f"{self.BASE_URL}/remote-jobs/{slug}" if slug else '')
+            
+            return {
+                'job_id': f"remoteok_{record['id']}",
+                'title': title,
+                'description': self.description_text(record.get('description') or ''),
+                'url': url,
+                'company_name': company_name,
+                'posted_at': record.get('date') or '',
+                'location': record.get('location') or '',
+                'tags': record.get('tags') or [],
+                'source': 'remoteok'
+            }
+        except Exception as e:
+            logger.error(f"Error parsing RemoteOK job record: {e}")
+            return None
+
+
 class JobScraperService:
-    """Main service for scraping jobs from all portals using thread pool."""
+    """Main service for scraping jobs from all portals using a thread pool or an asyncio event loop."""
     
     SCRAPER_CLASSES = {
         'guru': GuruScraper,
@@ -626,113 +1776,590 @@ class JobScraperService:
         'twine': TwineScraper,
         'remotework': RemoteWorkScraper,
         'weworkremotely': WeWorkRemotelyScraper,
+        'remoteok': RemoteOKScraper,
     }
     
-    def __init__(self, max_workers=4):
+    FETCH_MODES = ('threads', 'async')
+    
+    def __init__(self, max_workers=4, fetch_mode: str = 'threads', max_concurrency: int = 32,
+                 per_host_limit: int = 4, connection_pool: ConnectionPool = None,
+                 url_state: UrlStateStore = None, cache: ResponseCache = None,
+                 rate_limiter: RateLimiter = None, retry_policy: RetryPolicy = None,
+                 breaker_threshold: int = 3, breaker_cooldown: float = 900,
+                 health_registry: PortalHealthRegistry = None, parser_backend: str = None,
+                 parse_workers: int = None, watermarks: WatermarkStore = None,
+                 fetch_details: bool = False, detail_store: DetailStore = None, detail_budget: int = 200,
+                 detail_concurrency: int = 8, detail_per_host: int = 2, discovery: str = 'feed',
+                 search_terms: List[str] = None, robots: RobotsCache = None,
+                 classifier: LinearJobClassifier = None, classification_cache: ClassificationCache = None,
+                 timeout: int = 10):
+        """
+        Args:
+            max_workers: Thread pool size for fetch_mode='threads'
+            fetch_mode: Default fetch mode, 'threads' or 'async'
+            max_concurrency: Global limit on requests in flight for fetch_mode='async'
+            per_host_limit: Per-host limit on requests in flight for fetch_mode='async'
+            connection_pool: Pool lent to scrapers. Defaults to the process-wide pool,
+                so keep-alive connections survive across runs and service instances.
+            url_state: Crawl state store lent to scrapers for conditional GETs and
+                skipping unchanged listing pages. None disables both.
+            cache: On-disk response cache (record or replay). Defaults to
+                ResponseCache.from_env(), i.e. off unless SCRAPER_CACHE_MODE is set.
+            rate_limiter: Per-host token-bucket limiter for all requests. Defaults to
+                the process-wide limiter, so concurrent runs share each host's budget.
+            retry_policy: Backoff policy for transient fetch failures
+            breaker_threshold: Consecutive failures before a portal's circuit breaker opens
+            breaker_cooldown: Seconds an open breaker short-circuits a portal before a trial request
+            health_registry: Persistent portal health records. When set, unhealthy
+                portals are skipped and re-probed on a backoff schedule.
+            parser_backend: HTML parser for listing pages: 'lxml' (default), 'bs4' or 'selectolax'
+            parse_workers: Size of the process-wide parse pool. 0 parses in the fetch
+                threads; None reads SCRAPER_PARSE_WORKERS (default 0).
+            watermarks: Per-portal job ID watermarks for incremental crawls. None
+                crawls max_pages on every run.
+            fetch_details: Default for fetching full descriptions from job detail pages
+            detail_store: Knows which jobs already have a full description stored
+            detail_budget: Maximum detail page requests per run
+            detail_concurrency: Detail page requests in flight across all portals
+            detail_per_host: Detail page requests in flight per host
+            discovery: Default discovery mode: 'feed' reads portal feeds where they
+                exist and falls back to listing pages, 'html' always scrapes listing pages
+            search_terms: Keyword profile of targeted crawls, one portal search per
+                term. Defaults to AI_ML_SEARCH_TERMS.
+            robots: robots.txt cache whose rules and Crawl-delay every request obeys.
+                Defaults to the process-wide cache, refreshed daily.
+            classifier: Trained AI/ML model used to classify jobs in batches. Defaults
+                to the model file shipped with the scraper; without one, jobs are
+                classified by keywords.
+            classification_cache: Results by job content and classifier version,
+                consulted before classifying. Defaults to the process-wide in-memory cache.
+            timeout: Request timeout in seconds, in both fetch modes
+        """
         self.max_workers = max_workers
+        self.timeout = timeout
+        self.connection_pool = connection_pool or get_shared_pool(pool_maxsize=max(max_workers, 10))
+        self.url_state = url_state
+        self.cache = cache if cache is not None else ResponseCache.from_env()
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter()
+        self.robots = robots or get_shared_robots_cache()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self.health_registry = health_registry
+        self.parser_backend = parser_backend
+        if parse_workers is None:
+            parse_workers = int(os.environ.get('SCRAPER_PARSE_WORKERS', 0))
+        self.parse_pool = get_shared_parse_pool(parse_workers) if parse_workers > 0 else None
+        self.watermarks = watermarks
+        self.fetch_details = fetch_details
+        self.detail_store = detail_store
+        self.detail_budget = detail_budget
+        self.detail_concurrency = detail_concurrency
+        self.detail_per_host = detail_per_host
+        self.discovery = discovery
+        self.search_terms = list(search_terms or AI_ML_SEARCH_TERMS)
+        self.classifier = classifier if classifier is not None else get_shared_classifier()
+        self.classification_cache = classification_cache or get_shared_classification_cache()
+        self.fetch_mode = fetch_mode
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+    
+    def circuit_breaker(self, portal_name: str) -> CircuitBreaker:
+        """Return the process-wide circuit breaker for a portal."""
+        return get_circuit_breaker(portal_name, failure_threshold=self.breaker_threshold,
+                                   cooldown_seconds=self.breaker_cooldown)
+    
+    def _build_scraper(self, portal_name: str, backfill: bool = False, discovery: str = None,
+                       search_terms: List[str] = None, crawl_scope: str = '') -> BaseScraper:
+        """Instantiate a portal scraper wired to the service's shared fetch components."""
+        scraper_class = self.SCRAPER_CLASSES[portal_name]
+        return scraper_class(
+            timeout=self.timeout,
+            session=self.connection_pool.session,
+            url_state=self.url_state,
+            cache=self.cache,
+            rate_limiter=self.rate_limiter,
+            robots=self.robots,
+            retry_policy=self.retry_policy,
+            circuit_breaker=self.circuit_breaker(portal_name),
+            parser_backend=self.parser_backend,
+            parse_pool=self.parse_pool,
+            watermark=self.watermarks,
+            backfill=backfill,
+            discovery=discovery or self.discovery,
+            search_terms=search_terms,
+            crawl_scope=crawl_scope,
+        )
+    
+    def prewarm(self, include_portals=None) -> Dict[str, bool]:
+        """
+        Open pooled connections to the portals ahead of a scheduled run.
+        
+        Also starts the parse pool's worker processes, if there is a parse pool.
+        
+        Args:
+            include_portals: Portals to warm. If None, warms all healthy portals.
+        """
+        if self.parse_pool is not None:
+            self.parse_pool.prewarm()
+        portals = include_portals or [
+            p for p in self.SCRAPER_CLASSES
+            if self.health_registry is None or self.health_registry.is_healthy(p)
+        ]
+        urls = [self.SCRAPER_CLASSES[p].BASE_URL for p in portals if p in self.SCRAPER_CLASSES]
+        return self.connection_pool.prewarm(urls)
+    
+    def select_healthy_portals(self, portals: List[str]) -> Tuple[List[str], List[str]]:
+        """
+        Drop unhealthy portals, re-probing those whose backoff has elapsed.
+        
+        A probe is a single listing page fetch; it passes if the page loads and
+        yields at least one job.
+        
+        Returns:
+            Tuple of (portals_to_scrape, skipped_portals)
+        """
+        if self.health_registry is None:
+            return portals, []
+        
+        selected, skipped = [], []
+        for portal_name in portals:
+            if self.health_registry.is_healthy(portal_name):
+                selected.append(portal_name)
+                continue
+            if self.health_registry.probe_due(portal_name) and self._probe_portal(portal_name):
+                selected.append(portal_name)
+                continue
+            logger.info(f"Skipping unhealthy portal {portal_name}")
+            skipped.append(portal_name)
+        return selected, skipped
+    
+    def _probe_portal(self, portal_name: str) -> bool:
+        """Fetch one listing page of an unhealthy portal and record the outcome."""
+        scraper = self._build_scraper(portal_name)
+        try:
+            page = scraper.fetch_listing_page(scraper.get_page_urls(1)[0])
+            ok = page.unchanged or bool(page.jobs)
+        except Exception as e:
+            logger.info(f"Health probe failed for {portal_name}: {e}")
+            ok = False
+        finally:
+            scraper.close()
+        self.health_registry.record_probe(portal_name, ok)
+        return ok
+    
+    def _select_portals(self, include_portals, skip_unhealthy: bool) -> Tuple[List[str], List[str]]:
+        """Resolve include_portals to known portals, dropping unhealthy ones if asked."""
+        if include_portals is None:
+            portals = list(self.SCRAPER_CLASSES.keys())
+        else:
+            portals = [p for p in include_portals if p in self.SCRAPER_CLASSES]
+        if skip_unhealthy:
+            return self.select_healthy_portals(portals)
+        return portals, []
+    
+    def stream_portals(self, include_portals=None, max_pages: int = 3, filter_ai_ml: bool = True,
+                       fetch_mode: str = None, skip_unhealthy: bool = True, backfill: bool = False,
+                       fetch_details: bool = None, discovery: str = None, targeted: bool = None,
+                       queue_size: int = 256) -> 'JobStream':
+        """
+        Scrape portals as a stream of classified jobs.
+        
+        Args:
+            include_portals: List of specific portals to scrape. If None, scrapes all.
+            max_pages: Maximum pages to scrape (used for paginated portals)
+            filter_ai_ml: If True, only yield AI/ML jobs. If False, yield all jobs.
+            fetch_mode: 'threads' or 'async' for this run. Defaults to the service's fetch_mode.
+            skip_unhealthy: If True and a health registry is set, skip portals marked unhealthy.
+            backfill: Crawl max_pages even where the watermark says older pages are known
+            fetch_details: Replace listing snippets with full descriptions from detail
+                pages. Defaults to the service's fetch_details.
+            discovery: 'feed' or 'html' for this run. Defaults to the service's discovery.
+            targeted: Crawl only each portal's categories and searches for the search
+                terms (see BaseScraper.crawl_plan()) rather than the whole board.
+                Defaults to filter_ai_ml, as other jobs would be dropped anyway.
+            queue_size: Jobs buffered between the scrapers and the consumer
+            
+        Returns:
+            JobStream of (portal_name, job) pairs; its results summary is complete
+            once the stream is exhausted
+        """
+        fetch_mode = fetch_mode or self.fetch_mode
+        if fetch_mode not in self.FETCH_MODES:
+            raise ValueError(f"Unknown fetch_mode: {fetch_mode}")
+        discovery = discovery or self.discovery
+        if discovery not in BaseScraper.DISCOVERY_MODES:
+            raise ValueError(f"Unknown discovery mode: {discovery}")
+        if targeted is None:
+            targeted = filter_ai_ml
+        
+        logger.info(f"Starting bulk scraping from all portals (max_pages={max_pages}, filter_ai_ml={filter_ai_ml}, "
+                    f"fetch_mode={fetch_mode}, targeted={targeted})...")
+        portals, skipped_portals = self._select_portals(include_portals, skip_unhealthy)
+        if fetch_details is None:
+            fetch_details = self.fetch_details
+        details = None
+        if fetch_details:
+            details = DetailFetcher(self.title_prefilter, store=self.detail_store, max_requests=self.detail_budget,
+                                    max_concurrency=self.detail_concurrency, per_host_limit=self.detail_per_host)
+        return JobStream(self, portals, skipped_portals, max_pages=max_pages, filter_ai_ml=filter_ai_ml,
+                         fetch_mode=fetch_mode, backfill=backfill, details=details, discovery=discovery,
+                         search_terms=self.search_terms if targeted else None, queue_size=queue_size)
     
-    def scrape_all_portals(self, max_age_hours=48, include_portals=None, max_pages: int = 3, filter_ai_ml: bool = True) -> Dict:
+    def scrape_all_portals(self, max_age_hours=48, include_portals=None, max_pages: int = 3, filter_ai_ml: bool = True,
+                           fetch_mode: str = None, skip_unhealthy: bool = True, backfill: bool = False,
+                           fetch_details: bool = None, discovery: str = None, targeted: bool = None) -> Dict:
         """
-        Scrape jobs from all portals using thread pool.
+        Scrape jobs from all portals using thread pool or a single asyncio event loop.
+        
+        Collects stream_portals() into lists; use stream_portals() directly to
+        process jobs while the crawl is still running. The jobs are returned,
+        not stored, so neither the crawl state of the pages nor the watermarks
+        are recorded; callers that store the jobs should use the stream, then
+        JobStream.commit_crawl_state() and commit_watermarks().
         
         Args:
             max_age_hours: Only include jobs posted within last N hours
             include_portals: List of specific portals to scrape. If None, scrapes all.
             max_pages: Maximum pages to scrape (used for paginated portals)
             filter_ai_ml: If True, only return AI/ML jobs. If False, return all jobs.
+            fetch_mode: 'threads' or 'async' for this run. Defaults to the service's fetch_mode.
+            skip_unhealthy: If True and a health registry is set, skip portals marked unhealthy.
+            backfill: Crawl max_pages even where the watermark says older pages are known
+            fetch_details: Fetch full descriptions from detail pages. Defaults to the service's fetch_details.
+            discovery: 'feed' or 'html' for this run. Defaults to the service's discovery.
+            targeted: Crawl only the portals' AI/ML-relevant categories and searches.
+                Defaults to filter_ai_ml.
             
         Returns:
             Dictionary with scraped data and statistics
         """
-        logger.info(f"Starting bulk scraping from all portals (max_pages={max_pages}, filter_ai_ml={filter_ai_ml})...")
-        start_time = time.time()
+        stream = self.stream_portals(include_portals=include_portals, max_pages=max_pages,
+                                     filter_ai_ml=filter_ai_ml, fetch_mode=fetch_mode,
+                                     skip_unhealthy=skip_unhealthy, backfill=backfill,
+                                     fetch_details=fetch_details, discovery=discovery, targeted=targeted)
+        jobs_by_portal = {}
+        for portal_name, job in stream:
+            jobs_by_portal.setdefault(portal_name, []).append(job)
         
-        # Determine which portals to scrape
-        if include_portals is None:
-            portals_to_scrape = list(self.SCRAPER_CLASSES.keys())
-        else:
-            portals_to_scrape = [p for p in include_portals if p in self.SCRAPER_CLASSES]
+        results = stream.results
+        for portal_name, portal_results in results['by_portal'].items():
+            portal_results['jobs'] = jobs_by_portal.get(portal_name, [])
+        return results
+    
+    @staticmethod
+    def _transfer_summary(stats: Dict) -> Dict:
+        """Bytes per page and compression ratio for one portal's run."""
+        pages = max(stats['pages'], 1)
+        return {
+            'bytes_downloaded': stats['bytes_wire'],
+            'bytes_per_page': stats['bytes_wire'] // pages,
+            'compression_ratio': round(stats['bytes_decoded'] / stats['bytes_wire'], 2) if stats['bytes_wire'] else None,
+            'truncated_pages': stats['truncated'],
+        }
+    
+    def title_prefilter(self, job: Dict) -> bool:
+        """Cheap check on a listing title: is the job worth a detail page request?"""
+        return AI_ML in TAXONOMY_MATCHER.category_matches(job.get('title', ''))
+    
+    def classify_job(self, scraper: BaseScraper, job: Dict) -> bool:
+        """Attach the AI/ML flag, confidence score and categories to a job and return the flag."""
+        return self.classify_jobs(scraper, [job])[0]
+    
+    def classify_jobs(self, scraper: BaseScraper, jobs: List[Dict]) -> List[bool]:
+        """
+        Attach the AI/ML flag, confidence score and categories to each job, classifying them as one batch.
         
-        results = {
+        Jobs whose content was already classified by the same classifier and
+        taxonomy version take their result from the classification cache.
+        """
+        pairs = [(job.get('title') or '', job.get('description') or '') for job in jobs]
+        version = classification_version(self.classifier)
+        if not version:
+            # A model trained in-process and never saved has no version to cache under
+            results = scraper.classify_batch(pairs, self.classifier)
+        else:
+            keys = [classification_key(title, description, version) for title, description in pairs]
+            cached = self.classification_cache.get_many(keys)
+            missing = [index for index, key in enumerate(keys) if key not in cached]
+            if missing:
+                classified = scraper.classify_batch([pairs[index] for index in missing], self.classifier)
+                fresh = {keys[index]: result for index, result in zip(missing, classified)}
+                self.classification_cache.save_many(fresh)
+                cached.update(fresh)
+            self.classification_cache.record(len(jobs) - len(missing), len(missing))
+            results = [cached[key] for key in keys]
+        for job, (is_ai_ml, score, categories) in zip(jobs, results):
+            job['ai_ml_score'] = score
+            job['is_ai_ml'] = is_ai_ml
+            job['categories'] = list(categories)
+        return [is_ai_ml for is_ai_ml, _, _ in results]
+
+
+class JobStream:
+    """
+    One streaming scrape run; iterate it for (portal_name, job) pairs.
+    
+    Producers scrape the portals concurrently (a thread per portal, or one
+    event loop thread for fetch_mode='async'), classify jobs in small batches
+    and put them on a bounded queue. The consumer stores or forwards jobs while later
+    pages are still being fetched and parsed; producers block when it falls
+    behind, so memory is bounded by the queue rather than the crawl size.
+    Closing the iterator early stops the producers. With a DetailFetcher,
+    jobs pass through its enrich() stage before classification.
+    
+    The crawl state of the pages fetched is held back until the consumer
+    calls commit_crawl_state() after storing the jobs, so pages whose jobs
+    were never stored are not skipped as unchanged by later runs. Likewise
+    the watermarks only advance with commit_watermarks().
+    
+    After iteration, `results` holds the scrape_all_portals() summary without
+    the per-portal job lists.
+    """
+    
+    _PORTAL_DONE = object()
+    # Jobs classified together; a batch is queued once its last job has been parsed
+    CLASSIFY_BATCH = 32
+    
+    def __init__(self, service: JobScraperService, portals: List[str], skipped_portals: List[str],
+                 max_pages: int = 3, filter_ai_ml: bool = True, fetch_mode: str = 'threads',
+                 backfill: bool = False, details: DetailFetcher = None, discovery: str = 'feed',
+                 search_terms: List[str] = None, queue_size: int = 256):
+        self.service = service
+        self.portals = portals
+        self.max_pages = max_pages
+        self.filter_ai_ml = filter_ai_ml
+        self.fetch_mode = fetch_mode
+        self.backfill = backfill
+        self.details = details
+        self.discovery = discovery
+        self.search_terms = search_terms
+        self.results = {
             'total_jobs': 0,
             'ai_ml_jobs': 0,
             'by_portal': {},
-            'errors': []
+            'errors': [],
+            'fetch_mode': fetch_mode,
+            'circuit_breakers': {},
+            'skipped_portals': skipped_portals,
+            'health': {},
         }
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._cancelled = threading.Event()
+        self._finished = set()
+        self._counts = {}  # portal -> [total_jobs, ai_ml_jobs]
+        self._crawl_states = {}  # portal -> {url: crawl state} of portals scraped without errors
+        self._seen_job_ids = {}  # portal -> job IDs seen, newest first, of portals scraped without errors
+        # Pages recorded by a filtered run are only unchanged for runs filtering with the same classifier;
+        # an unsaved in-process model has no version to record them under
+        self.crawl_scope = classification_version(service.classifier) if filter_ai_ml else ''
+        self._record_crawl_state = bool(self.crawl_scope) or not filter_ai_ml
+    
+    def __iter__(self) -> Iterator[Tuple[str, Dict]]:
+        start_time = time.time()
+        if self.fetch_mode == 'async':
+            producers = ThreadPoolExecutor(max_workers=1)
+            producers.submit(self._run_async)
+        else:
+            producers = ThreadPoolExecutor(max_workers=self.service.max_workers)
+            for portal_name in self.portals:
+                producers.submit(self._produce, portal_name)
         
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Submit scraping tasks
-            future_to_portal = {
-                executor.submit(self._scrape_portal, portal_name, max_pages): portal_name
-                for portal_name in portals_to_scrape
-            }
-            
-            # Collect results
-            for future in as_completed(future_to_portal):
-                portal_name = future_to_portal[future]
-                try:
-                    jobs, ai_ml_count, error = future.result()
-                    results['total_jobs'] += len(jobs)
-                    results['ai_ml_jobs'] += ai_ml_count
-                    results['by_portal'][portal_name] = {
-                        'total_jobs': len(jobs),
-                        'ai_ml_jobs': ai_ml_count,
-                        'jobs': jobs
-                    }
-                    if error:
-                        results['errors'].append(f"{portal_name}: {error}")
-                except Exception as e:
-                    logger.error(f"Error scraping {portal_name}: {e}")
-                    results['errors'].append(f"{portal_name}: {str(e)}")
-        
-        duration = time.time() - start_time
-        results['duration_seconds'] = duration
+        remaining = len(self.portals)
+        try:
+            while remaining:
+                item = self._queue.get()
+                if item[0] is self._PORTAL_DONE:
+                    self._finish_portal(*item[1:])
+                    remaining -= 1
+                    continue
+                
+                portal_name, job = item
+                counts = self._counts.setdefault(portal_name, [0, 0])
+                counts[0] += 1
+                self.results['total_jobs'] += 1
+                if job.get('is_ai_ml'):
+                    counts[1] += 1
+                    self.results['ai_ml_jobs'] += 1
+                yield portal_name, job
+        finally:
+            self._cancelled.set()
+            producers.shutdown(wait=False)
+            if self.details is not None:
+                self.details.close()
         
-        logger.info(f"Scraping completed in {duration:.2f}s. "
-                   f"Total jobs: {results['total_jobs']}, AI/ML jobs: {results['ai_ml_jobs']}")
+        self._finish_run(start_time)
+    
+    def _put(self, item) -> bool:
+        """Queue an item, waiting for space; False once the consumer has gone away."""
+        while not self._cancelled.is_set():
+            try:
+                self._queue.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def _enrich(self, scraper: BaseScraper, jobs: Iterable[Dict]) -> Iterator[Dict]:
+        return self.details.enrich(scraper, jobs) if self.details is not None else jobs
+    
+    def _emit_all(self, portal_name: str, scraper: BaseScraper, jobs: Iterable[Dict]):
+        """Enrich and classify jobs in batches of CLASSIFY_BATCH and queue the ones to keep."""
+        jobs = iter(self._enrich(scraper, jobs))
+        while True:
+            batch = list(islice(jobs, self.CLASSIFY_BATCH))
+            if not batch:
+                return
+            for job, is_ai_ml in zip(batch, self.service.classify_jobs(scraper, batch)):
+                if (is_ai_ml or not self.filter_ai_ml) and not self._put((portal_name, job)):
+                    return
+    
+    def _portal_done(self, portal_name: str, error: Optional[str], stats: Optional[Dict],
+                     scraper: Optional[BaseScraper] = None):
+        self._finished.add(portal_name)
+        self._put((self._PORTAL_DONE, portal_name, error, stats, scraper))
+    
+    def _circuit_open(self, portal_name: str) -> bool:
+        if self.service.circuit_breaker(portal_name).state == CircuitBreaker.OPEN:
+            logger.info(f"Skipping {portal_name}: circuit breaker open")
+            return True
+        return False
+    
+    def _produce(self, portal_name: str):
+        """Scrape one portal on a producer thread."""
+        error, stats, scraper = None, None, None
+        try:
+            if self._circuit_open(portal_name):
+                error = "circuit breaker open"
+            else:
+                scraper = self.service._build_scraper(portal_name, self.backfill, self.discovery, self.search_terms,
+                                                      self.crawl_scope)
+                try:
+                    self._emit_all(portal_name, scraper, scraper.discover(max_pages=self.max_pages))
+                finally:
+                    scraper.close()
+                    stats = scraper.stats
+        except Exception as e:
+            logger.error(f"Error scraping {portal_name}: {e}")
+            error = str(e)
+        self._portal_done(portal_name, error, stats, scraper)
+    
+    def _run_async(self):
+        """Scrape all portals as coroutines on this producer thread's event loop."""
+        try:
+            asyncio.run(self._produce_async())
+        except Exception as e:
+            logger.error(f"Error in async scrape: {e}")
+            for portal_name in self.portals:
+                if portal_name not in self._finished:
+                    self._portal_done(portal_name, str(e), None)
+    
+    async def _produce_async(self):
+        service = self.service
+        async with AsyncFetcher(max_concurrency=service.max_concurrency, per_host_limit=service.per_host_limit,
+                                timeout=service.timeout, cache=service.cache, rate_limiter=service.rate_limiter,
+                                retry_policy=service.retry_policy) as fetcher:
+            await asyncio.gather(*(self._produce_portal_async(fetcher, p) for p in self.portals))
+    
+    async def _produce_portal_async(self, fetcher: AsyncFetcher, portal_name: str):
+        error, stats, scraper = None, None, None
+        try:
+            if self._circuit_open(portal_name):
+                error = "circuit breaker open"
+            else:
+                scraper = self.service._build_scraper(portal_name, self.backfill, self.discovery, self.search_terms,
+                                                      self.crawl_scope)
+                try:
+                    jobs = await scraper.scrape_jobs_async(fetcher, max_pages=self.max_pages)
+                    # Queue puts and detail page requests block; keep them off the event loop
+                    await asyncio.to_thread(self._emit_all, portal_name, scraper, jobs)
+                finally:
+                    scraper.close()
+                    stats = scraper.stats
+        except Exception as e:
+            logger.error(f"Error scraping {portal_name}: {e}")
+            error = str(e)
+        await asyncio.to_thread(self._portal_done, portal_name, error, stats, scraper)
+    
+    def _finish_portal(self, portal_name: str, error: Optional[str], stats: Optional[Dict],
+                       scraper: Optional[BaseScraper]):
+        """Fold a finished portal's counts, transfer stats and health into the results."""
+        results = self.results
+        if scraper is not None and not error:
+            # Held until the consumer has stored the portal's jobs, see commit_crawl_state()
+            crawl_state = scraper.take_crawl_state()
+            if crawl_state and self._record_crawl_state:
+                self._crawl_states[portal_name] = crawl_state
+            seen_job_ids = scraper.take_seen_job_ids()
+            if seen_job_ids:
+                self._seen_job_ids[portal_name] = seen_job_ids
+        health_registry = self.service.health_registry
+        if health_registry is not None and stats is not None:
+            results['health'][portal_name] = health_registry.record_run(portal_name, stats)
         
-        return results
+        total_jobs, ai_ml_jobs = self._counts.get(portal_name, [0, 0])
+        results['by_portal'][portal_name] = {
+            'total_jobs': total_jobs,
+            'ai_ml_jobs': ai_ml_jobs,
+        }
+        if stats is not None:
+            results['by_portal'][portal_name].update(self.service._transfer_summary(stats))
+        if error:
+            results['errors'].append(f"{portal_name}: {error}")
     
-    def _scrape_portal(self, portal_name: str, max_pages: int = 3) -> Tuple[List, int, str]:
+    def commit_crawl_state(self, skip_portals: Iterable[str] = ()) -> int:
         """
-        Scrape a single portal.
+        Save the crawl state of the pages of every finished portal; returns the number of pages.
         
-        Args:
-            portal_name: Name of the portal to scrape
-            max_pages: Maximum pages to scrape (used for paginated portals like WeWorkRemotely)
+        Call once the jobs consumed so far are stored. Portals that failed,
+        and those in skip_portals (e.g. with jobs that could not be stored),
+        are left out, so their pages are fetched and parsed again next run.
+        """
+        url_state = self.service.url_state
+        skip_portals = set(skip_portals)
+        saved = 0
+        for portal_name in list(self._crawl_states):
+            states = self._crawl_states.pop(portal_name)
+            if url_state is None or portal_name in skip_portals:
+                continue
+            for url, state in states.items():
+                url_state.save(url, state)
+            saved += len(states)
+        logger.info(f"Recorded the crawl state of {saved} pages")
+        return saved
+    
+    def commit_watermarks(self, skip_portals: Iterable[str] = ()) -> int:
+        """
+        Advance the watermark of every finished portal with the job IDs its crawl saw; returns the number of portals.
         
-        Returns:
-            Tuple of (jobs_list, ai_ml_count, error_message)
+        Call once the jobs consumed so far are stored. Portals that failed,
+        and those in skip_portals, keep their watermark, so the next run
+        paginates past the jobs that were not stored.
         """
-        error = None
-        ai_ml_count = 0
+        watermarks = self.service.watermarks
+        skip_portals = set(skip_portals)
+        advanced = 0
+        for portal_name in list(self._seen_job_ids):
+            job_ids = self._seen_job_ids.pop(portal_name)
+            if watermarks is None or portal_name in skip_portals:
+                continue
+            watermarks.advance(portal_name, job_ids)
+            advanced += 1
+        return advanced
+    
+    def _finish_run(self, start_time: float):
+        results = self.results
+        for portal_name in self.portals:
+            breaker = self.service.circuit_breaker(portal_name).snapshot()
+            results['circuit_breakers'][portal_name] = breaker
+            if portal_name in results['by_portal']:
+                results['by_portal'][portal_name]['circuit'] = breaker['state']
         
-        try:
-            scraper_class = self.SCRAPER_CLASSES.get(portal_name)
-            if not scraper_class:
-                return [], 0, f"Unknown portal: {portal_name}"
-            
-            scraper = scraper_class()
-            
-            # Special handling for WeWorkRemotely with pagination
-            if portal_name == 'weworkremotely':
-                jobs = scraper.scrape_jobs(max_pages=max_pages)
-            else:
-                jobs = scraper.scrape_jobs()
-            
-            # Filter for AI/ML jobs
-            filtered_jobs = []
-            for job in jobs:
-                is_ai_ml, score = scraper.is_ai_ml_job(job.get('title', ''), job.get('description', ''))
-                if is_ai_ml:
-                    job['ai_ml_score'] = score
-                    filtered_jobs.append(job)
-                    ai_ml_count += 1
-            
-            scraper.close()
-            return filtered_jobs, ai_ml_count, None
-            
-        except Exception as e:
-            error = str(e)
-            logger.error(f"Error in _scrape_portal for {portal_name}: {e}")
-            return [], 0, error
+        if self.details is not None:
+            results['details'] = dict(self.details.stats)
+        
+        duration = time.time() - start_time
+        results['duration_seconds'] = duration
+        
+        logger.info(f"Scraping completed in {duration:.2f}s. "
+                   f"Total jobs: {results['total_jobs']}, AI/ML jobs: {results['ai_ml_jobs']}")
@@ -0,0 +1,209 @@
+"""
+Per-URL crawl state used for conditional GETs and unchanged-page detection,
+and per-portal watermarks used to stop paginating at already-seen jobs.
+"""
+import hashlib
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger('scraper')
+
+
+def content_digest(content: bytes) -> str:
+    """Return the SHA-256 hex digest of a response body."""
+    return hashlib.sha256(content or b'').hexdigest()
+
+
+def scoped_digest(digest: str, scope: str) -> str:
+    """Digest recorded for a page whose jobs were kept or dropped by scope, e.g. a classifier version."""
+    return content_digest(f'{scope}:{digest}'.encode('utf-8')) if scope else digest
+
+
+class UrlStateStore:
+    """
+    In-memory store of the last fetch of each URL.
+
+    Each state is a dict with the keys etag, last_modified, status_code,
+    content_digest and fetched_at. Subclasses persist the same dicts.
+    """
+
+    def __init__(self):
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[Dict]:
+        with self._lock:
+            return self._states.get(url)
+
+    def get_many(self, urls: Iterable[str]) -> Dict[str, Dict]:
+        with self._lock:
+            return {url: self._states[url] for url in urls if url in self._states}
+
+    def save(self, url: str, state: Dict):
+        with self._lock:
+            self._states[url] = state
+
+    def conditional_headers(self, url: str, state: Optional[Dict] = None) -> Dict[str, str]:
+        """Build If-None-Match/If-Modified-Since headers from the stored state."""
+        if state is None:
+            state = self.get(url)
+        headers = {}
+        if state:
+            if state.get('etag'):
+                headers['If-None-Match'] = state['etag']
+            if state.get('last_modified'):
+                headers['If-Modified-Since'] = state['last_modified']
+        return headers
+
+    def check(self, url: str, status_code: int, headers, content: Optional[bytes],
+              state: Optional[Dict] = None, digest: Optional[str] = None,
+              scope: str = '') -> Tuple[bool, Optional[Dict]]:
+        """
+        Compare a fetch with the stored state, without recording it.
+
+        A page is recorded once its jobs are stored; a run that drops jobs,
+        e.g. filtering them by a classifier, records the page under that
+        scope. Such a state only makes the page unchanged for runs with the
+        same scope, and keeps no ETag or Last-Modified, since a 304 cannot
+        tell scopes apart. States recorded without a scope hold for any run.
+
+        Args:
+            url: Requested URL
+            status_code: Response status
+            headers: Response headers
+            content: Response body
+            state: Previously loaded state for url, to avoid a second lookup
+            digest: Body digest computed while streaming, used instead of content
+            scope: What decided which of the page's jobs are kept; '' if all are
+
+        Returns:
+            (unchanged, state to save once the page's jobs are stored or None).
+            The page is unchanged if the server answered 304 or the body digest
+            matches the last recorded fetch.
+        """
+        if state is None:
+            state = self.get(url)
+
+        if status_code == 304:
+            if state:
+                return True, dict(state, status_code=304, fetched_at=datetime.now(timezone.utc))
+            return True, None
+
+        if status_code >= 400:
+            return False, None
+
+        if digest is None:
+            digest = content_digest(content)
+        if state and state.get('content_digest') in (digest, scoped_digest(digest, scope)):
+            return True, dict(state, status_code=status_code, fetched_at=datetime.now(timezone.utc))
+        return False, {
+            'etag': '' if scope else headers.get('ETag', '') or '',
+            'last_modified': '' if scope else headers.get('Last-Modified', '') or '',
+            'status_code': status_code,
+            'content_digest': scoped_digest(digest, scope),
+            'fetched_at': datetime.now(timezone.utc),
+        }
+
+
+class DjangoUrlStateStore(UrlStateStore):
+    """UrlStateStore persisted in the crawl_state table (jobs.CrawlState)."""
+
+    FIELDS = ('etag', 'last_modified', 'status_code', 'content_digest', 'fetched_at')
+
+    def get(self, url: str) -> Optional[Dict]:
+        from jobs.models import CrawlState
+
+        row = CrawlState.objects.filter(url=url).values(*self.FIELDS).first()
+        return row
+
+    def get_many(self, urls: Iterable[str]) -> Dict[str, Dict]:
+        from jobs.models import CrawlState
+
+        rows = CrawlState.objects.filter(url__in=list(urls)).values('url', *self.FIELDS)
+        return {row.pop('url'): row for row in rows}
+
+    def save(self, url: str, state: Dict):
+        from jobs.models import CrawlState
+
+        try:
+            CrawlState.objects.update_or_create(
+                url=url,
+                defaults={field: state.get(field) for field in self.FIELDS if field in state}
+            )
+        except Exception as e:
+            logger.error(f"Error saving crawl state for {url}: {e}")
+
+
+class WatermarkStore:
+    """
+    In-memory per-portal crawl watermark.
+
+    A watermark is a dict with recent_job_ids (newest first, at most
+    MAX_JOB_IDS), newest_job_id and advanced_at, the last time a run found
+    new jobs. Subclasses persist the same dicts.
+    """
+
+    MAX_JOB_IDS = 1000
+
+    def __init__(self):
+        self._watermarks = {}
+        self._lock = threading.Lock()
+
+    def get(self, portal: str) -> Optional[Dict]:
+        with self._lock:
+            return self._watermarks.get(portal)
+
+    def save(self, portal: str, watermark: Dict):
+        with self._lock:
+            self._watermarks[portal] = watermark
+
+    def known_job_ids(self, portal: str) -> Set[str]:
+        """Job IDs seen by earlier runs of a portal."""
+        watermark = self.get(portal)
+        return set(watermark['recent_job_ids']) if watermark else set()
+
+    def advance(self, portal: str, job_ids: List[str]):
+        """
+        Record the job IDs a completed crawl saw.
+
+        Args:
+            portal: Portal name
+            job_ids: Job IDs in listing order, i.e. newest first
+        """
+        if not job_ids:
+            return
+        watermark = self.get(portal) or {}
+        previous = watermark.get('recent_job_ids', [])
+        known = set(previous)
+        seen = dict.fromkeys(job_ids)
+        recent_job_ids = list(seen) + [job_id for job_id in previous if job_id not in seen]
+        found_new = any(job_id not in known for job_id in seen)
+        self.save(portal, {
+            'recent_job_ids': recent_job_ids[:self.MAX_JOB_IDS],
+            'newest_job_id': recent_job_ids[0],
+            'advanced_at': datetime.now(timezone.utc) if found_new else watermark.get('advanced_at'),
+        })
+
+
+class DjangoWatermarkStore(WatermarkStore):
+    """WatermarkStore persisted in the crawl_watermark table (jobs.CrawlWatermark)."""
+
+    FIELDS = ('recent_job_ids', 'newest_job_id', 'advanced_at')
+
+    def get(self, portal: str) -> Optional[Dict]:
+        from jobs.models import CrawlWatermark
+
+        return CrawlWatermark.objects.filter(portal=portal).values(*self.FIELDS).first()
+
+    def save(self, portal: str, watermark: Dict):
+        from jobs.models import CrawlWatermark
+
+        try:
+            CrawlWatermark.objects.update_or_create(
+                portal=portal,
+                defaults={field: watermark.get(field) for field in self.FIELDS}
+            )
+        except Exception as e:
+            logger.error(f"Error saving crawl watermark for {portal}: {e}")
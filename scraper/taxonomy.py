@@ -0,0 +1,129 @@
+"""
+Job categories tagged in one pass over a job's text.
+
+A taxonomy is a list of Categories, each a keyword list plus the number of
+distinct keywords a job must mention to be tagged with it. TaxonomyMatcher
+compiles the keywords of every category into a single KeywordMatcher trie
+that maps each keyword back to its categories, so a job is tagged with all
+its categories by one walk over its words. Adding a category adds trie
+paths, not another scan of the text, and tags are stored as rows of the
+job_categories table (jobs.JobCategory) rather than one column per category.
+
+The AI/ML category ('ai_ml') also drives BaseScraper.is_ai_ml_job. The
+default taxonomy can be replaced by a JSON file at SCRAPER_TAXONOMY_PATH:
+
+    {"ai_ml": {"keywords": ["machine learning", ...], "min_matches": 2},
+     "mlops": {"keywords": ["mlops", "mlflow", ...]}}
+"""
+import hashlib
+import json
+import os
+from typing import Dict, Iterable, List, NamedTuple, Set
+
+from scraper.keywords import KeywordMatcher
+
+# Category whose keywords drive the AI/ML flag
+AI_ML = 'ai_ml'
+
+
+class Category(NamedTuple):
+    name: str
+    keywords: List[str]
+    # Distinct keywords a job must mention to be tagged
+    min_matches: int = 1
+
+
+DEFAULT_TAXONOMY = [
+    Category(AI_ML, [
+        'machine learning', 'deep learning', 'neural network', 'nlp', 'natural language',
+        'computer vision', 'ai', 'artificial intelligence', 'tensorflow', 'pytorch',
+        'scikit-learn', 'data science', 'data scientist', 'ml engineer', 'ai engineer',
+        'predictive modeling', 'classification', 'regression', 'clustering',
+        'llm', 'gpt', 'generative', 'transformer', 'bert', 'model training',
+        'data analysis', 'analytics', 'algorithm', 'optimization', 'reinforcement learning'
+    ], min_matches=2),
+    Category('data_engineering', [
+        'data engineer', 'data engineering', 'data pipeline', 'etl', 'elt', 'airflow', 'spark',
+        'kafka', 'dbt', 'data warehouse', 'data lake', 'snowflake', 'bigquery', 'databricks'
+    ], min_matches=2),
+    Category('mlops', [
+        'mlops', 'mlflow', 'kubeflow', 'model deployment', 'model serving', 'model monitoring',
+        'feature store', 'sagemaker', 'vertex ai', 'ml platform', 'ml infrastructure'
+    ]),
+    Category('llm_apps', [
+        'llm', 'large language model', 'rag', 'retrieval augmented generation', 'langchain',
+        'llamaindex', 'prompt engineering', 'vector database', 'embedding', 'openai', 'chatbot'
+    ]),
+    Category('computer_vision', [
+        'computer vision', 'image recognition', 'object detection', 'image segmentation',
+        'opencv', 'yolo'
+    ]),
+]
+
+
+def load_taxonomy(path: str = None) -> List[Category]:
+    """
+    Read a taxonomy from a JSON file, by default SCRAPER_TAXONOMY_PATH.
+
+    Returns DEFAULT_TAXONOMY when no file is configured.
+
+    Raises:
+        ValueError: If the file is malformed or has no 'ai_ml' category
+    """
+    path = path or os.environ.get('SCRAPER_TAXONOMY_PATH')
+    if not path:
+        return DEFAULT_TAXONOMY
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    try:
+        taxonomy = [
+            Category(name, list(spec['keywords']), int(spec.get('min_matches', 1)))
+            for name, spec in data.items()
+        ]
+    except (AttributeError, KeyError, TypeError) as e:
+        raise ValueError(f"Malformed taxonomy in {path}: {e}") from e
+    if not any(category.name == AI_ML for category in taxonomy):
+        raise ValueError(f"Taxonomy in {path} has no '{AI_ML}' category")
+    return taxonomy
+
+
+class TaxonomyMatcher(KeywordMatcher):
+    """KeywordMatcher over all categories' keywords, with each keyword mapped back to its categories."""
+
+    def __init__(self, categories: Iterable[Category]):
+        self.categories = {category.name: category for category in categories}
+        self._keyword_categories = {}
+        for category in self.categories.values():
+            for keyword in category.keywords:
+                self._keyword_categories.setdefault(keyword, []).append(category.name)
+        super().__init__(self._keyword_categories)
+
+        # Identifies the taxonomy, e.g. for caching tags
+        spec = [[category.name, category.keywords, category.min_matches] for category in self.categories.values()]
+        self.version = hashlib.sha256(json.dumps(spec).encode('utf-8')).hexdigest()[:12]
+
+    def category_matches(self, text: str) -> Dict[str, Set[str]]:
+        """Map each category with at least one keyword in the text to its matched keywords."""
+        matches = {}
+        for keyword in self.matched(text):
+            for name in self._keyword_categories[keyword]:
+                matches.setdefault(name, set()).add(keyword)
+        return matches
+
+    def select(self, category_matches: Dict[str, Set[str]]) -> List[str]:
+        """Names of the categories with at least min_matches matched keywords, sorted."""
+        return sorted(
+            name for name, keywords in category_matches.items()
+            if len(keywords) >= self.categories[name].min_matches
+        )
+
+    def tag(self, text: str) -> List[str]:
+        """Names of the categories the text mentions at least min_matches keywords of, sorted."""
+        return self.select(self.category_matches(text))
+
+    def find_in(self, category: str, text: str) -> Dict[str, List[int]]:
+        """Like find(), restricted to one category's keywords."""
+        return {
+            keyword: starts for keyword, starts in self.find(text).items()
+            if category in self._keyword_categories[keyword]
+        }
@@ -0,0 +1,82 @@
+import json
+
+from scraper.embedded import (
+    LD_JSON, NEXT_DATA, find_job_records, iter_job_postings, iter_script_payloads, job_fields_from_posting,
+    job_fields_from_record,
+)
+
+POSTING = {
+    '@context': 'https://schema.org',
+    '@type': 'JobPosting',
+    'title': 'ML Engineer',
+    'description': '<p>Train models</p>',
+    'url': 'https://example.com/jobs/ml-engineer-42',
+    'identifier': {'@type': 'PropertyValue', 'name': 'Acme', 'value': 'A-42'},
+    'hiringOrganization': {'@type': 'Organization', 'name': 'Acme'},
+    'datePosted': '2023-10-02',
+    'employmentType': ['FULL_TIME', 'CONTRACTOR'],
+    'baseSalary': {'@type': 'MonetaryAmount', 'currency': 'USD',
+                   'value': {'@type': 'QuantitativeValue', 'minValue': 100, 'maxValue': 150, 'unitText': 'YEAR'}},
+    'jobLocation': {'@type': 'Place', 'address': {'addressLocality': 'Berlin', 'addressCountry': 'DE'}},
+}
+
+NEXT = {'props': {'pageProps': {
+    'menu': [{'title': 'Home', 'url': '/'}],
+    'jobs': [
+        {'id': 1, 'title': 'Data Scientist', 'companyName': 'Beta', 'url': '/jobs/1', 'postedAt': 1696240800000},
+        {'id': 2, 'title': 'NLP Engineer', 'company': {'name': 'Gamma'}, 'slug': 'nlp-2'},
+    ],
+}}}
+
+
+def page(*scripts):
+    return ''.join(f'<script {attrs}>{body}</script>' for attrs, body in scripts).encode()
+
+
+def test_iter_script_payloads():
+    content = page(
+        ('id="__NEXT_DATA__" type="application/json"', json.dumps(NEXT)),
+        ('type="application/ld+json"', json.dumps(POSTING)),
+        ('type="application/ld+json"', '{not json'),
+        ('src="/app.js"', ''),
+    )
+    assert [kind for kind, _ in iter_script_payloads(content)] == [NEXT_DATA, LD_JSON]
+    assert list(iter_script_payloads(b'<p>no scripts</p>')) == []
+
+
+def test_iter_job_postings_in_graph_and_item_list():
+    data = {'@graph': [
+        {'@type': 'WebPage'},
+        {'@type': 'ItemList', 'itemListElement': [{'@type': 'ListItem', 'item': POSTING}]},
+    ]}
+    assert list(iter_job_postings(data)) == [POSTING]
+
+
+def test_job_fields_from_posting():
+    fields = job_fields_from_posting(POSTING)
+    # A PropertyValue's name is the issuer; only its value is the ID
+    assert fields['key'] == 'A-42'
+    assert fields['company_name'] == 'Acme'
+    assert fields['posted_at'] == '2023-10-02T00:00:00+00:00'
+    assert fields['employment_type'] == 'FULL_TIME, CONTRACTOR'
+    assert fields['salary'] == {'currency': 'USD', 'min': 100, 'max': 150, 'unit': 'YEAR'}
+    assert fields['location'] == 'Berlin'
+
+
+def test_posting_key_falls_back_to_url_slug():
+    posting = dict(POSTING, identifier={'@type': 'PropertyValue', 'name': 'Acme'})
+    assert job_fields_from_posting(posting)['key'] == 'ml-engineer-42'
+
+
+def test_find_job_records():
+    records = find_job_records(NEXT)
+    assert [record['id'] for record in records] == [1, 2]
+    assert find_job_records(NEXT, path=('props', 'pageProps', 'jobs')) == records
+    assert find_job_records(NEXT, path=('props', 'missing')) == []
+
+
+def test_job_fields_from_record():
+    first, second = (job_fields_from_record(record) for record in find_job_records(NEXT))
+    assert first['key'] == '1' and first['company_name'] == 'Beta'
+    assert first['posted_at'] == '2023-10-02T10:00:00+00:00'
+    assert second['key'] == '2' and second['company_name'] == 'Gamma' and second['url'] == ''
@@ -0,0 +1,85 @@
+from datetime import datetime, timezone
+
+from scraper.feeds import iter_feed_entries, parse_feed_date, title_from_url
+
+RSS = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/">
+<channel>
+  <title>Jobs</title>
+  <item>
+    <title>ML Engineer</title>
+    <link>https://example.com/jobs/ml-engineer-1</link>
+    <guid>job-1</guid>
+    <pubDate>Mon, 02 Oct 2023 10:00:00 +0000</pubDate>
+    <description>&lt;p&gt;Train models&lt;/p&gt;</description>
+    <dc:creator>Acme</dc:creator>
+    <category>AI</category>
+    <category>Remote</category>
+  </item>
+  <item>
+    <title>Data Scientist</title>
+    <link>https://example.com/jobs/data-scientist-2</link>
+  </item>
+</channel>
+</rss>"""
+
+ATOM = b"""<feed xmlns="http://www.w3.org/2005/Atom">
+  <entry>
+    <id>urn:job:7</id>
+    <title>NLP Researcher</title>
+    <link rel="self" href="https://example.com/api/7"/>
+    <link href="https://example.com/jobs/7"/>
+    <updated>2023-10-02T10:00:00Z</updated>
+    <author><name>Beta</name></author>
+    <category term="nlp"/>
+  </entry>
+</feed>"""
+
+SITEMAP = b"""<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>https://example.com/remote-jobs/senior-ml-engineer-1234</loc><lastmod>2023-10-02</lastmod></url>
+</urlset>"""
+
+
+def chunked(data, size=16):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def test_rss_entries():
+    first, second = iter_feed_entries(chunked(RSS))
+    assert first.guid == 'job-1' and first.title == 'ML Engineer'
+    assert first.link == 'https://example.com/jobs/ml-engineer-1'
+    assert first.published == datetime(2023, 10, 2, 10, tzinfo=timezone.utc)
+    assert first.summary == '<p>Train models</p>'
+    assert first.author == 'Acme' and first.categories == ('AI', 'Remote')
+    # Without a guid the link identifies the entry
+    assert second.guid == second.link and second.published is None
+
+
+def test_atom_entries():
+    (entry,) = iter_feed_entries(chunked(ATOM))
+    assert entry.guid == 'urn:job:7' and entry.link == 'https://example.com/jobs/7'
+    assert entry.author == 'Beta' and entry.categories == ('nlp',)
+    assert entry.published == datetime(2023, 10, 2, 10, tzinfo=timezone.utc)
+
+
+def test_sitemap_entries():
+    (entry,) = iter_feed_entries([SITEMAP])
+    assert entry.link == entry.guid == 'https://example.com/remote-jobs/senior-ml-engineer-1234'
+    assert entry.title == 'Senior Ml Engineer'
+    assert entry.published == datetime(2023, 10, 2, tzinfo=timezone.utc)
+
+
+def test_entries_stream_before_the_document_ends():
+    entries = iter_feed_entries(iter([RSS[:RSS.index(b'</item>') + 7], RSS[RSS.index(b'</item>') + 7:]]))
+    assert next(entries).guid == 'job-1'
+
+
+def test_parse_feed_date():
+    assert parse_feed_date('2023-10-02T10:00:00+02:00').utcoffset().total_seconds() == 7200
+    assert parse_feed_date('') is None
+    assert parse_feed_date('not a date') is None
+
+
+def test_title_from_url():
+    assert title_from_url('/remote-jobs/senior-ml-engineer-1234') == 'Senior Ml Engineer'
+    assert title_from_url('https://example.com/jobs/data_scientist.html') == 'Data Scientist'
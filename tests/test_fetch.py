@@ -0,0 +1,99 @@
+import pytest
+
+from scraper import fetch
+from scraper.fetch import CircuitBreaker, FetchError, FetchResult, RateLimiter, TokenBucket
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(fetch.time, 'monotonic', clock)
+    return clock
+
+
+def test_token_bucket_burst_then_rate(clock):
+    bucket = TokenBucket(rate=2.0, burst=3)
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    # Reservations beyond the burst queue up at 1 / rate each
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+    clock.now += 10
+    # Idle time refills no more than the burst
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(0.5)
+
+
+def test_token_bucket_block_for(clock):
+    bucket = TokenBucket(rate=1.0, burst=5)
+    bucket.block_for(30)
+    assert bucket.reserve() == pytest.approx(30)
+    clock.now += 30
+    assert bucket.reserve() == 0.0
+
+
+def test_token_bucket_set_rate_keeps_earned_tokens_up_to_the_new_size(clock):
+    bucket = TokenBucket(rate=1.0, burst=3)
+    bucket.set_rate(0.1, 1)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(10)
+
+
+def test_rate_limiter_crawl_delay(clock):
+    limiter = RateLimiter(default_rate=1.0, default_burst=3, host_limits={'fast.example': (5.0, 10)})
+    url = 'https://slow.example/jobs'
+    limiter.apply_crawl_delay(url, 4)
+    assert (limiter.bucket(url).rate, limiter.bucket(url).burst) == (0.25, 1)
+    limiter.apply_crawl_delay(url, None)
+    assert (limiter.bucket(url).rate, limiter.bucket(url).burst) == (1.0, 3)
+    # A delay shorter than the configured spacing changes nothing
+    limiter.apply_crawl_delay('https://fast.example/', 0.1)
+    assert limiter.bucket('https://fast.example/').rate == 5.0
+
+
+def test_rate_limiter_honours_retry_after(clock):
+    limiter = RateLimiter(default_rate=10.0, default_burst=10)
+    limiter.observe('https://example.com/a', 429, {'Retry-After': '20'})
+    assert limiter.bucket('https://example.com/b').reserve() == pytest.approx(20)
+    assert limiter.bucket('https://other.example/').reserve() == 0.0
+
+
+def test_circuit_breaker_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker('portal', failure_threshold=3, cooldown_seconds=60)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.allow()
+    assert breaker.snapshot() == {'state': 'open', 'consecutive_failures': 3, 'retry_in_seconds': 60.0}
+
+
+def test_circuit_breaker_half_open_trial(clock):
+    breaker = CircuitBreaker('portal', failure_threshold=1, cooldown_seconds=60)
+    breaker.record_failure()
+    clock.now += 60
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # One trial request at a time
+    assert breaker.allow() and not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now += 60
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.allow()
+
+
+def test_raise_for_status():
+    FetchResult('https://example.com/', 200, {}, b'').raise_for_status()
+    with pytest.raises(FetchError):
+        FetchResult('https://example.com/', 503, {}, b'').raise_for_status()
@@ -0,0 +1,175 @@
+import threading
+import time
+
+from scraper.fetch import RateLimiter
+from scraper.scraper import BaseScraper, CrawlFrontier, ListingPage
+from scraper.state import WatermarkStore
+
+BASE_URL = 'https://jobs.example'
+
+
+def page_url(page):
+    return f'{BASE_URL}/jobs' if page == 1 else f'{BASE_URL}/jobs?page={page}'
+
+
+class FakeScraper(BaseScraper):
+    """Serves listing pages from a dict and records what was fetched and how many fetches overlapped."""
+
+    PORTAL = 'fake'
+    BASE_URL = BASE_URL
+
+    def __init__(self, pages, latency=0.0, **kwargs):
+        kwargs.setdefault('rate_limiter', RateLimiter(default_rate=1000, default_burst=10))
+        super().__init__(cache=None, **kwargs)
+        # URL -> (job IDs, next URL)
+        self.pages = pages
+        self.latency = latency
+        self.fetched = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+
+    def guess_next_page_url(self, url, page):
+        return page_url(page)
+
+    def fetch_listing_page(self, url):
+        self.rate_limiter.wait(url)
+        with self._lock:
+            self.fetched.append(url)
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        time.sleep(self.latency)
+        with self._lock:
+            self.in_flight -= 1
+        job_ids, next_url = self.pages.get(url, ([], None))
+        return ListingPage(url, [{'job_id': job_id} for job_id in job_ids], next_url, '|'.join(job_ids))
+
+
+def chain(count, per_page=3, first_id=100):
+    """Pages 1..count, newest jobs first, each linking to the next."""
+    pages = {}
+    for page in range(1, count + 1):
+        top = first_id - (page - 1) * per_page
+        next_url = page_url(page + 1) if page < count else None
+        pages[page_url(page)] = ([f'j{top - i}' for i in range(per_page)], next_url)
+    return pages
+
+
+def job_ids(jobs):
+    return [job['job_id'] for job in jobs]
+
+
+def test_follows_the_chain_to_the_last_page():
+    scraper = FakeScraper(chain(3))
+    jobs = CrawlFrontier(scraper, max_pages=5).crawl([page_url(1)])
+    assert job_ids(jobs) == ['j100', 'j99', 'j98', 'j97', 'j96', 'j95', 'j94', 'j93', 'j92']
+    # Guessed pages past the last one may be fetched, but are never accepted
+    assert set(scraper.fetched) <= {page_url(page) for page in range(1, 6)}
+
+
+def test_stops_at_max_pages():
+    scraper = FakeScraper(chain(6))
+    jobs = CrawlFrontier(scraper, max_pages=2).crawl([page_url(1)])
+    assert len(jobs) == 6
+    assert sorted(scraper.fetched) == [page_url(1), page_url(2)]
+
+
+def test_stops_on_an_empty_page():
+    pages = chain(3)
+    pages[page_url(2)] = ([], page_url(3))
+    jobs = CrawlFrontier(FakeScraper(pages), max_pages=5).crawl([page_url(1)])
+    assert job_ids(jobs) == ['j100', 'j99', 'j98']
+
+
+def test_stops_on_a_repeated_page():
+    # Boards that clamp the page number serve the last page again
+    pages = chain(2)
+    pages[page_url(2)] = (pages[page_url(2)][0], page_url(3))
+    pages[page_url(3)] = pages[page_url(2)]
+    jobs = CrawlFrontier(FakeScraper(pages), max_pages=5).crawl([page_url(1)])
+    assert len(jobs) == 6
+
+
+def test_follows_the_real_next_link_when_the_guess_is_wrong():
+    pages = chain(1)
+    pages[page_url(1)] = (pages[page_url(1)][0], f'{BASE_URL}/jobs?cursor=abc')
+    pages[f'{BASE_URL}/jobs?cursor=abc'] = (['j1'], None)
+    pages[page_url(2)] = (['wrong'], None)
+    jobs = CrawlFrontier(FakeScraper(pages), max_pages=3).crawl([page_url(1)])
+    assert job_ids(jobs) == ['j100', 'j99', 'j98', 'j1']
+
+
+def test_deduplicates_across_seeds():
+    pages = chain(1)
+    pages[f'{BASE_URL}/search'] = (['j99', 'j50'], None)
+    jobs = CrawlFrontier(FakeScraper(pages), max_pages=1).crawl([page_url(1), f'{BASE_URL}/search', page_url(1)])
+    assert job_ids(jobs) == ['j100', 'j99', 'j98', 'j50']
+
+
+def test_prefetches_up_to_concurrency():
+    scraper = FakeScraper(chain(6), latency=0.05)
+    CrawlFrontier(scraper, max_pages=6, concurrency=3).crawl([page_url(1)])
+    assert scraper.peak_in_flight == 3
+
+
+def test_watermark_stops_at_the_first_known_page():
+    watermark = WatermarkStore()
+    watermark.advance('fake', ['j98', 'j97', 'j96', 'j95', 'j94', 'j93', 'j92'])
+    scraper = FakeScraper(chain(4), watermark=watermark)
+    jobs = CrawlFrontier(scraper, max_pages=4).crawl([page_url(1)])
+    assert job_ids(jobs) == ['j100', 'j99', 'j98']
+    # Page 1 has known jobs, so pages are not prefetched
+    assert scraper.fetched == [page_url(1), page_url(2)]
+
+
+def test_watermark_widens_the_window_after_an_entirely_new_page():
+    watermark = WatermarkStore()
+    watermark.advance('fake', ['j94', 'j93', 'j92'])
+    scraper = FakeScraper(chain(4), watermark=watermark, latency=0.05)
+    jobs = CrawlFrontier(scraper, max_pages=4).crawl([page_url(1)])
+    assert len(jobs) == 6
+    assert scraper.fetched[0] == page_url(1)
+    assert scraper.peak_in_flight > 1
+
+
+def test_steady_state_costs_one_page():
+    watermark = WatermarkStore()
+    watermark.advance('fake', [f'j{i}' for i in range(100, 88, -1)])
+    scraper = FakeScraper(chain(4), watermark=watermark)
+    assert CrawlFrontier(scraper, max_pages=4).crawl([page_url(1)]) == []
+    assert scraper.fetched == [page_url(1)]
+
+
+def test_seen_job_ids_are_handed_over_once_the_crawl_is_consumed():
+    scraper = FakeScraper(chain(2), watermark=WatermarkStore())
+    stream = CrawlFrontier(scraper, max_pages=2).stream([page_url(1)])
+    next(stream)
+    assert scraper.take_seen_job_ids() == []
+    list(stream)
+    assert scraper.take_seen_job_ids() == ['j100', 'j99', 'j98', 'j97', 'j96', 'j95']
+    assert scraper.watermark.get('fake') is None
+
+
+def test_backfill_ignores_the_watermark():
+    watermark = WatermarkStore()
+    watermark.advance('fake', [f'j{i}' for i in range(100, 88, -1)])
+    scraper = FakeScraper(chain(4), watermark=watermark, backfill=True)
+    assert len(CrawlFrontier(scraper, max_pages=4).crawl([page_url(1)])) == 12
+
+
+def test_pages_overlap_with_the_default_rate_limit():
+    scraper = FakeScraper(chain(3), latency=0.2, rate_limiter=RateLimiter())
+    started = time.monotonic()
+    jobs = CrawlFrontier(scraper, max_pages=3).crawl([page_url(1)])
+    assert len(jobs) == 9
+    assert scraper.peak_in_flight == 3
+    # One page at a time would take 0.2s + 1s + 1s at 1 request/s
+    assert time.monotonic() - started < 1
+
+
+def test_crawl_delay_fetches_one_page_at_a_time():
+    rate_limiter = RateLimiter(default_rate=100)
+    rate_limiter.apply_crawl_delay(page_url(1), 0.05)
+    scraper = FakeScraper(chain(3), latency=0.05, rate_limiter=rate_limiter)
+    CrawlFrontier(scraper, max_pages=3).crawl([page_url(1)])
+    assert scraper.peak_in_flight == 1
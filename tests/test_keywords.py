@@ -0,0 +1,51 @@
+from scraper.keywords import KeywordMatcher, split_words
+
+
+def test_split_words():
+    assert split_words('Scikit-Learn, LLMs') == ['scikit', 'learn', 'llms']
+
+
+def test_whole_words_only():
+    matcher = KeywordMatcher(['ai', 'ml'])
+    assert not matcher.search('She said the email was html')
+    assert matcher.matched('AI/ML engineer') == {'ai', 'ml'}
+
+
+def test_phrases_and_offsets():
+    matcher = KeywordMatcher(['machine learning', 'learning'])
+    text = 'Machine  learning and deep learning'
+    assert matcher.find(text) == {'machine learning': [0], 'learning': [9, 27]}
+
+
+def test_plural_of_last_word():
+    matcher = KeywordMatcher(['neural network', 'llm'])
+    assert matcher.matched('Neural networks and LLMs') == {'neural network', 'llm'}
+    # Short words and words already ending in 's' get no plural
+    assert not KeywordMatcher(['ai']).search('ais')
+    assert KeywordMatcher(['nlp']).search('NLPs')
+    assert not KeywordMatcher(['pandas']).search('pandass')
+
+
+def test_hyphenated_keywords_match_either_form():
+    matcher = KeywordMatcher(['scikit-learn'])
+    assert matcher.search('scikit-learn') and matcher.search('Scikit learn')
+    assert not matcher.search('scikit')
+
+
+def test_duplicate_token_keywords():
+    # 'scikit-learn' and 'scikit learn' have the same tokens; the first one is reported
+    matcher = KeywordMatcher(['scikit-learn', 'scikit learn', 'scikit-learn'])
+    assert len(matcher) == 2
+    assert matcher.find('using scikit learn') == {'scikit-learn': [6]}
+
+
+def test_overlapping_phrases():
+    matcher = KeywordMatcher(['deep learning', 'learning', 'deep'])
+    assert matcher.matched('deep learning') == {'deep learning', 'learning', 'deep'}
+    assert list(matcher.iter_hits('deep learning')) == [('deep', 0), ('deep learning', 0), ('learning', 5)]
+
+
+def test_empty_keywords_are_ignored():
+    matcher = KeywordMatcher(['', '--', 'ai'])
+    assert len(matcher) == 1
+    assert matcher.find('nothing here') == {}
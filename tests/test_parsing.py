@@ -0,0 +1,46 @@
+import pytest
+
+from scraper.parsing import iter_json_array
+
+
+def chunked(text, size):
+    data = text.encode('utf-8')
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize('size', [1, 3, 7, 1000])
+def test_iter_json_array_across_chunk_boundaries(size):
+    text = ' [ {"id": 1, "title": "ML Engineer"}, 12.5, "café", [1, 2], null, true ] '
+    assert list(iter_json_array(chunked(text, size))) == [
+        {'id': 1, 'title': 'ML Engineer'}, 12.5, 'café', [1, 2], None, True,
+    ]
+
+
+def test_iter_json_array_yields_before_the_body_ends():
+    items = iter_json_array(iter([b'[{"id": 1}, {"id"', b': 2}]']))
+    assert next(items) == {'id': 1}
+    assert next(items) == {'id': 2}
+    assert next(items, None) is None
+
+
+def test_iter_json_array_number_split_by_chunk():
+    assert list(iter_json_array([b'[12', b'.5, 3', b']'])) == [12.5, 3]
+
+
+def test_iter_json_array_empty():
+    assert list(iter_json_array([b'[', b']'])) == []
+
+
+def test_iter_json_array_encoding():
+    assert list(iter_json_array(['["café"]'.encode('latin-1')], encoding='latin-1')) == ['café']
+
+
+def test_iter_json_array_rejects_objects():
+    with pytest.raises(ValueError):
+        list(iter_json_array([b'{"jobs": []}']))
+
+
+@pytest.mark.parametrize('body', [b'[{"id": 1}, {"id"', b'[1, 2', b'[12'])
+def test_iter_json_array_rejects_truncated_bodies(body):
+    with pytest.raises(ValueError):
+        list(iter_json_array([body]))
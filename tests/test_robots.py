@@ -0,0 +1,51 @@
+import time
+
+from scraper.robots import RobotsPolicy, parse_crawl_delays
+
+ROBOTS = """
+User-agent: *
+Crawl-delay: 0.5
+Disallow: /private
+
+# Two agents sharing one group
+User-agent: slowbot
+User-agent: otherbot
+Crawl-delay: 10
+
+User-agent: fastbot
+Disallow: /admin
+"""
+
+
+def test_parse_crawl_delays():
+    assert parse_crawl_delays(ROBOTS.splitlines()) == {
+        '*': 0.5, 'slowbot': 10.0, 'otherbot': 10.0, 'fastbot': None,
+    }
+
+
+def test_parse_crawl_delays_ignores_bad_values_and_comments():
+    lines = ['User-agent: bot  # ours', 'Crawl-delay: soon', 'Crawl-delay: 2 # seconds']
+    assert parse_crawl_delays(lines) == {'bot': 2.0}
+
+
+def policy(user_agent, text=ROBOTS):
+    return RobotsPolicy.parse(text, user_agent, time.monotonic() + 60)
+
+
+def test_crawl_delay_of_the_matching_group():
+    assert policy('SlowBot/1.0').crawl_delay == 10.0
+    assert policy('Mozilla/5.0').crawl_delay == 0.5
+
+
+def test_matching_group_without_delay_does_not_inherit_the_default():
+    assert policy('FastBot/2.0').crawl_delay is None
+
+
+def test_request_rate_fallback():
+    text = 'User-agent: *\nRequest-rate: 2/10\n'
+    assert policy('Mozilla/5.0', text).crawl_delay == 5.0
+
+
+def test_allowed():
+    assert not policy('Mozilla/5.0').allowed('https://example.com/private/1')
+    assert policy('Mozilla/5.0').allowed('https://example.com/jobs')
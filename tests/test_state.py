@@ -0,0 +1,84 @@
+from scraper.state import UrlStateStore, WatermarkStore, content_digest, scoped_digest
+
+URL = 'https://example.com/jobs'
+
+
+def record(store, content, headers=None, scope=''):
+    unchanged, state = store.check(URL, 200, headers or {}, content, scope=scope)
+    assert not unchanged
+    store.save(URL, state)
+    return state
+
+
+def test_check_does_not_record():
+    store = UrlStateStore()
+    unchanged, state = store.check(URL, 200, {'ETag': '"v1"'}, b'page')
+    assert not unchanged
+    assert state['etag'] == '"v1"' and state['content_digest'] == content_digest(b'page')
+    assert store.get(URL) is None
+
+
+def test_unchanged_body_and_304():
+    store = UrlStateStore()
+    record(store, b'page', {'ETag': '"v1"'})
+    assert store.conditional_headers(URL) == {'If-None-Match': '"v1"'}
+    assert store.check(URL, 200, {}, b'page')[0]
+    assert not store.check(URL, 200, {}, b'page 2')[0]
+    unchanged, state = store.check(URL, 304, {}, b'')
+    assert unchanged and state['status_code'] == 304
+
+
+def test_errors_are_never_unchanged():
+    store = UrlStateStore()
+    record(store, b'page')
+    assert store.check(URL, 500, {}, b'page') == (False, None)
+
+
+def test_scoped_state_only_holds_for_the_same_scope():
+    store = UrlStateStore()
+    state = record(store, b'page', {'ETag': '"v1"', 'Last-Modified': 'x'}, scope='classifier-1')
+    # A filtered run keeps no validators: a 304 could not tell the scopes apart
+    assert state['etag'] == '' and state['last_modified'] == ''
+    assert state['content_digest'] == scoped_digest(content_digest(b'page'), 'classifier-1')
+    assert store.check(URL, 200, {}, b'page', scope='classifier-1')[0]
+    assert not store.check(URL, 200, {}, b'page', scope='classifier-2')[0]
+    assert not store.check(URL, 200, {}, b'page')[0]
+
+
+def test_unscoped_state_holds_for_any_scope():
+    store = UrlStateStore()
+    record(store, b'page')
+    assert store.check(URL, 200, {}, b'page', scope='classifier-1')[0]
+
+
+def test_precomputed_digest():
+    store = UrlStateStore()
+    record(store, b'page')
+    assert store.check(URL, 200, {}, None, digest=content_digest(b'page'))[0]
+
+
+def test_watermark_advance_merges_newest_first():
+    store = WatermarkStore()
+    store.advance('portal', ['j3', 'j2', 'j1'])
+    first = store.get('portal')
+    assert first['newest_job_id'] == 'j3' and first['advanced_at'] is not None
+    store.advance('portal', ['j5', 'j4', 'j3'])
+    assert store.get('portal')['recent_job_ids'] == ['j5', 'j4', 'j3', 'j2', 'j1']
+    assert store.known_job_ids('portal') == {'j1', 'j2', 'j3', 'j4', 'j5'}
+    assert store.known_job_ids('other') == set()
+
+
+def test_watermark_keeps_advanced_at_without_new_jobs():
+    store = WatermarkStore()
+    store.advance('portal', ['j2', 'j1'])
+    advanced_at = store.get('portal')['advanced_at']
+    store.advance('portal', ['j1'])
+    assert store.get('portal')['advanced_at'] == advanced_at
+    store.advance('portal', [])
+    assert store.get('portal')['recent_job_ids'] == ['j1', 'j2']
+
+
+def test_watermark_is_bounded():
+    store = WatermarkStore()
+    store.advance('portal', [f'j{i}' for i in range(store.MAX_JOB_IDS + 10)])
+    assert len(store.get('portal')['recent_job_ids']) == store.MAX_JOB_IDS